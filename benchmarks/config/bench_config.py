@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : bench_config
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Startup and ConfigBase lookup cost of a large YAML config, eager instantiation vs lazy
+"""
+
+import time
+from dataclasses import dataclass
+
+from hydra.utils import instantiate
+
+import aitbox.config.config as config_module
+from aitbox.config.base import ConfigBase
+from aitbox.config.config import LazyConfig
+
+
+@dataclass(init=False)
+class GPUInfo(ConfigBase):
+    """ """
+
+    name: str
+    cuda: bool = True
+
+
+@dataclass(init=False)
+class CPUInfo(ConfigBase):
+    """ """
+
+    name: str = "intel"
+    num: int = 1
+
+
+@dataclass(init=False)
+class Machine(ConfigBase):
+    """ """
+
+    gpu: GPUInfo
+    cpu: list
+    name: str = "HP"
+
+
+@dataclass(init=False)
+class Disk(ConfigBase):
+    """Not in the YAML: every lookup misses and falls back to the class default"""
+
+    size: int = 512
+
+
+def eager(raw):
+    """Previous behaviour: every ``_target_`` node instantiated up front"""
+    if isinstance(raw, dict):
+        if "_target_" in raw:
+            return instantiate(raw, _convert_="object")
+        return {k: eager(v) for k, v in raw.items()}
+    if isinstance(raw, list):
+        return [eager(v) for v in raw]
+    return raw
+
+
+def target(cls: type) -> str:
+    """Import path of a class of this module, also when it runs as a script"""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def main(num_nodes: int = 2000, num_objects: int = 2000):
+    raw = {
+        "_target_": target(Machine),
+        "cpu": [{"_target_": target(CPUInfo), "name": f"cpu{i}", "num": i} for i in range(num_nodes)],
+        "gpu": {"_target_": target(GPUInfo), "name": "kunlun"},
+    }
+    for name, load in (("eager", eager), ("lazy", LazyConfig)):
+        start = time.perf_counter()
+        config = load(raw)
+        loaded = time.perf_counter() - start
+        config_module.GLOBAL_CONFIG = config
+        start = time.perf_counter()
+        for _ in range(num_objects):
+            assert GPUInfo().name == "kunlun" and Disk().size == 512
+        created = time.perf_counter() - start
+        config_module.GLOBAL_CONFIG = None
+        print(f"{name:>6}: load {loaded * 1e3:8.1f} ms, {num_objects} ConfigBase objects {created * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : bench_controller.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 感应控制回放一天检测器数据的耗时
+import time
+
+import numpy as np
+
+from aitbox.models.signal.isolated.actuated.controller import ActuatedController
+from aitbox.schemas.singal import ActuatedPhase, ActuatedSignalSchema, PhaseType, Ring, SignalSchemaType
+from aitbox.testing.synthetic import make_cross
+
+
+def main(num_crosses: int = 300, horizon: float = 86400.0, rate: float = 400.0):
+    rng = np.random.default_rng(0)
+    crosses = [make_cross(f"c{i}") for i in range(num_crosses)]
+    phases = [ActuatedPhase(i, PhaseType.NORMAL, 10, 3, 45) for i in range(4)]
+    schema = ActuatedSignalSchema(SignalSchemaType.ACTUATED, [Ring(phases)], [0], [0], 3.0, 10)
+    schemas = [schema] * num_crosses
+
+    actuations = []
+    for cross in crosses:
+        lanes = {}
+        for branch in cross.branch:
+            for lane in branch.lane:
+                n = rng.poisson(rate * horizon / 3600)
+                lanes[lane.id] = np.sort(rng.uniform(0, horizon, n))
+        actuations.append(lanes)
+    num_events = sum(len(t) for lanes in actuations for t in lanes.values())
+
+    controller = ActuatedController()
+    start = time.perf_counter()
+    timelines = controller.run_crosses(crosses, schemas, actuations, horizon)
+    elapsed = time.perf_counter() - start
+    num_greens = sum(len(t.phase) for t in timelines)
+    print(f"{num_crosses} crosses, {num_events} actuations, {num_greens} greens: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : bench_buffer.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: Buffer (deque) 与 RingBuffer (预分配数组) 的写入/采样耗时对比
+import time
+
+import numpy as np
+
+from aitbox.models.signal.isolated.adaptive.buffer import Buffer, RingBuffer
+
+
+def bench(buffer, capacity: int, state_dim: int = 32, chunk: int = 1000, batch_size: int = 256,
+          num_samples: int = 200) -> tuple[float, float]:
+    rng = np.random.default_rng(0)
+    states = rng.random((chunk, state_dim), dtype=np.float32)
+    actions = rng.integers(0, 8, chunk)
+    rewards = rng.random(chunk, dtype=np.float32)
+    dones = np.zeros(chunk, dtype=bool)
+
+    start = time.perf_counter()
+    for _ in range(capacity // chunk):
+        buffer.add_batch(states, actions, rewards, states, dones)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(num_samples):
+        buffer.sample(batch_size)
+    sample_time = (time.perf_counter() - start) / num_samples
+    return add_time, sample_time
+
+
+def main():
+    print(f"{'capacity':>10} {'impl':>10} {'add_batch (s)':>14} {'sample (ms)':>12}")
+    for capacity in (10_000, 100_000, 1_000_000):
+        for name, buffer in (("Buffer", Buffer(capacity)), ("RingBuffer", RingBuffer(capacity, seed=0))):
+            add_time, sample_time = bench(buffer, capacity)
+            print(f"{capacity:>10} {name:>10} {add_time:>14.3f} {sample_time * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
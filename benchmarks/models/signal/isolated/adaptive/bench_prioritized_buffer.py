@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : bench_prioritized_buffer.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: PrioritizedBuffer 采样与优先级更新耗时随容量的变化（应基本保持不变）
+import time
+
+import numpy as np
+
+from aitbox.models.signal.isolated.adaptive.prioritized_buffer import PrioritizedBuffer
+
+
+def bench(capacity: int, state_dim: int = 16, chunk: int = 100_000, batch_size: int = 256,
+          num_samples: int = 500) -> tuple[float, float]:
+    rng = np.random.default_rng(0)
+    buffer = PrioritizedBuffer(capacity, seed=0)
+    states = rng.random((chunk, state_dim), dtype=np.float32)
+    actions = rng.integers(0, 8, chunk)
+    rewards = rng.random(chunk, dtype=np.float32)
+    dones = np.zeros(chunk, dtype=bool)
+    for _ in range(max(capacity // chunk, 1)):
+        buffer.add_batch(states, actions, rewards, states, dones)
+
+    sample_time = update_time = 0.0
+    for _ in range(num_samples):
+        start = time.perf_counter()
+        *_, indices = buffer.sample(batch_size)
+        sample_time += time.perf_counter() - start
+        start = time.perf_counter()
+        buffer.update_priorities(indices, rng.random(batch_size))
+        update_time += time.perf_counter() - start
+    return sample_time / num_samples, update_time / num_samples
+
+
+def main():
+    print(f"{'capacity':>10} {'sample (ms)':>12} {'update (ms)':>12}")
+    for capacity in (100_000, 1_000_000, 4_000_000):
+        sample_time, update_time = bench(capacity)
+        print(f"{capacity:>10} {sample_time * 1000:>12.3f} {update_time * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : bench_timeline.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 车道灯色时间线一次评价大量车辆到达的耗时，与逐车按相位顺序推算对比
+import time
+
+import numpy as np
+
+from aitbox.models.signal.isolated.cycler.timeline import compile_timeline
+from aitbox.models.signal.isolated.movement import phase_lane_mask
+from aitbox.schemas.singal import CyclerSignalSchema, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def naive_state(schema: CyclerSignalSchema, mask: np.ndarray, t: float, lane: int) -> bool:
+    """逐相位累加绿灯、黄灯、全红时间，判断到达时车道是否为绿灯"""
+    local = (t - schema.phase_offset) % schema.cycle
+    start = 0.0
+    for i, phase in enumerate(schema.rings[0].phases):
+        if start <= local < start + phase.green and mask[i, lane]:
+            return True
+        start += phase.green + phase.yellow + phase.all_red
+    return False
+
+
+def main(num_arrivals: int = 10_000_000, num_naive: int = 200_000):
+    rng = np.random.default_rng(0)
+    schema = CyclerSignalSchema(SignalSchemaType.CYCLER, make_rings(4), [0], [0], 100, 60, 180, 17)
+    mask = phase_lane_mask(make_cross(), 4)
+    times = rng.uniform(0, 86400.0, num_arrivals)
+    lanes = rng.integers(0, mask.shape[1], num_arrivals)
+
+    start = time.perf_counter()
+    timeline = compile_timeline(schema).movements(mask)
+    result = timeline.arrivals(times, lanes)
+    elapsed = time.perf_counter() - start
+    print(f"timeline: {num_arrivals} arrivals in {elapsed:.2f} s ({elapsed / num_arrivals * 1e9:.0f} ns each), "
+          f"{len(timeline.breaks)} breaks, mean wait {result.wait.mean():.1f} s")
+
+    start = time.perf_counter()
+    naive = [naive_state(schema, mask, t, lane) for t, lane in zip(times[:num_naive], lanes[:num_naive])]
+    elapsed = time.perf_counter() - start
+    print(f"per arrival loop: {num_naive} arrivals in {elapsed:.2f} s ({elapsed / num_naive * 1e9:.0f} ns each)")
+    assert np.array_equal(np.array(naive), result.state[:num_naive] >= 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : bench_indicator
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Cost of creating 1M indicators, against per-instance pandas frequency parsing
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from aitbox.schemas.indicator import Indicator, IndicatorType
+
+
+@dataclass
+class LegacyIndicator:
+    """Indicator as it was before: no slots, freq parsed by pandas in every instance"""
+    type: IndicatorType
+    source_id: str | int | None
+    value: Any
+    freq: str
+    timestamp: None | str | int = None
+    unit: None | str = None
+
+    def __post_init__(self):
+        try:
+            pd.tseries.frequencies.to_offset(self.freq)
+        except Exception:
+            pass
+
+
+def bench(n: int = 1_000_000) -> None:
+    rng = np.random.default_rng(0)
+    source_ids = [f"lane_{i % 20_000}" for i in range(n)]
+    values = rng.uniform(0, 1800, n)
+    timestamps = np.arange(n) % 86_400
+    value_list, timestamp_list = values.tolist(), timestamps.tolist()
+
+    cases = {
+        "legacy dataclass": lambda: [
+            LegacyIndicator(IndicatorType.VOLUME, s, v, "5min", t)
+            for s, v, t in zip(source_ids, value_list, timestamp_list)
+        ],
+        "Indicator()": lambda: [
+            Indicator(IndicatorType.VOLUME, s, v, "5min", t)
+            for s, v, t in zip(source_ids, value_list, timestamp_list)
+        ],
+        "Indicator.from_arrays": lambda: Indicator.from_arrays(
+            IndicatorType.VOLUME, source_ids, values, "5min", timestamps
+        ),
+    }
+    print(f"{'constructor':>22} {'time (s)':>9} {'us/indicator':>13}")
+    for name, build in cases.items():
+        start = time.perf_counter()
+        indicators = build()
+        elapsed = time.perf_counter() - start
+        assert len(indicators) == n
+        print(f"{name:>22} {elapsed:>9.3f} {elapsed / n * 1e6:>13.3f}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : bench_road_network_loader
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Load time of a synthetic city from GeoParquet, lazily and with every lane materialized
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import shapely
+
+from aitbox.schemas.road_network_loader import read_geoparquet
+
+DIRECTIONS = ("north", "east", "south", "west")
+OFFSETS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)], dtype=np.float64)
+
+
+def write_city(root: Path, side: int = 150, lanes_per_branch: int = 3) -> list:
+    """``side * side`` four-arm crosses on a 400 m grid, entry and exit branch per arm"""
+    geo = {"geo": json.dumps({"version": "1.0.0", "primary_column": "geometry",
+                              "columns": {"geometry": {"encoding": "WKB"}}})}
+    n = side * side
+    xy = np.stack(np.meshgrid(np.arange(side) * 400.0, np.arange(side) * 400.0), axis=-1).reshape(-1, 2)
+    cross_ids = np.array([f"c{i}" for i in range(n)], dtype=object)
+    pl.DataFrame({
+        "id": cross_ids, "name": cross_ids, "type": ["signal"] * n,
+        "geometry": shapely.to_wkb(shapely.points(xy)),
+    }).write_parquet(root / "cross.parquet", metadata=geo)
+
+    arm = np.repeat(np.tile(np.arange(4), n), 2)
+    cross = np.repeat(np.arange(n), 8)
+    kind = np.tile(["in", "out"], 4 * n)
+    branch_ids = [f"c{c}_{DIRECTIONS[a]}_{k}" for c, a, k in zip(cross.tolist(), arm.tolist(), kind.tolist())]
+    ends = xy[cross] + OFFSETS[arm] * 100
+    coords = np.where((kind == "in")[:, None, None], np.stack([ends, xy[cross]], 1), np.stack([xy[cross], ends], 1))
+    pl.DataFrame({
+        "id": branch_ids, "cross_id": cross_ids[cross], "name": [DIRECTIONS[a] for a in arm.tolist()],
+        "type": kind, "direction": [DIRECTIONS[a] for a in arm.tolist()],
+        "geometry": shapely.to_wkb(shapely.linestrings(coords)),
+    }).write_parquet(root / "branch.parquet", metadata=geo)
+
+    entries = [b for b, k in zip(branch_ids, kind.tolist()) if k == "in"]
+    lane_branch = np.repeat(np.array(entries, dtype=object), lanes_per_branch)
+    seq = np.tile(np.arange(lanes_per_branch), len(entries))
+    pl.DataFrame({
+        "id": [f"{b}_{s}" for b, s in zip(lane_branch.tolist(), seq.tolist())], "branch_id": lane_branch,
+        "seq_num": seq, "flow_type": ["in"] * len(seq), "turn_type": np.where(seq == 0, 2, 1),
+    }).write_parquet(root / "lane.parquet")
+    return [root / f"{name}.parquet" for name in ("cross", "branch", "lane")]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_city(Path(tmp))
+        start = time.perf_counter()
+        network = read_geoparquet(*paths)
+        loaded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        network.index.lane_cross(network.tables.lane["id"][0])
+        indexed = time.perf_counter() - start
+        lazy = not any(cross.branch.loaded for cross in network.cross)
+
+        start = time.perf_counter()
+        num_lanes = sum(len(branch.lane) for cross in network.cross for branch in cross.branch)
+        materialized = time.perf_counter() - start
+    print(f"crosses {len(network.cross)}, lanes {num_lanes}")
+    print(f"load (lazy branches/lanes) {loaded:8.3f} s")
+    print(f"index from tables          {indexed:8.3f} s (branches still lazy: {lazy})")
+    print(f"materialize every lane     {materialized:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : bench_schema_memory
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Memory of a synthetic million-lane network with plain and slotted schema dataclasses
+"""
+
+import dataclasses
+import gc
+import tracemalloc
+from typing import Dict, Type
+
+from shapely.geometry import LineString, Point
+
+from aitbox.schemas.road_network import (
+    Branch,
+    BranchType,
+    Cross,
+    CrossType,
+    DirectionType,
+    Lane,
+    LaneTurnType,
+    RoadSegment,
+)
+from aitbox.schemas.singal import CyclerPhase, PhaseType, Ring
+
+SCHEMAS = (Lane, Branch, Cross, RoadSegment, CyclerPhase, Ring)
+
+
+def plain(cls: Type) -> Type:
+    """Same fields as ``cls`` in a dataclass without slots, i.e. with a per-instance ``__dict__``"""
+    fields = [
+        (f.name, f.type, dataclasses.field(default=f.default) if f.default is not dataclasses.MISSING
+         else dataclasses.field())
+        for f in dataclasses.fields(cls)
+    ]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def build(classes: Dict[str, Type], num_lanes: int) -> Dict[str, list]:
+    """Four-arm crosses with 3 entry lanes per arm, 4 phases in one ring and a segment per arm"""
+    lane_cls, branch_cls, cross_cls = classes["Lane"], classes["Branch"], classes["Cross"]
+    segment_cls, phase_cls, ring_cls = classes["RoadSegment"], classes["CyclerPhase"], classes["Ring"]
+    point, line = Point(0, 0), LineString([(0, 0), (1, 1)])  # shared: only the schema objects are measured
+    objects = {name: [] for name in classes}
+    for c in range(num_lanes // 12):
+        branches = []
+        for d in range(4):
+            lanes = [lane_cls(c * 12 + d * 3 + i, i, 0, False, BranchType.IN, LaneTurnType.STRAIGHT)
+                     for i in range(3)]
+            objects["Lane"].extend(lanes)
+            branches.append(branch_cls(c * 8 + d, "", BranchType.IN, DirectionType.NORTH, line, lanes))
+            branches.append(branch_cls(c * 8 + d + 4, "", BranchType.OUT, DirectionType.NORTH, line, []))
+            objects["RoadSegment"].append(segment_cls(c * 4 + d, "", line, 400.0, c * 8 + d + 4, c * 8 + d, c, c))
+        objects["Branch"].extend(branches)
+        objects["Cross"].append(cross_cls(c, "", CrossType.SIGNAL, point, branches))
+        phases = [phase_cls(i, PhaseType.NORMAL, 20, 10, 60, 3, 3, 2, 3, i // 2) for i in range(4)]
+        objects["CyclerPhase"].extend(phases)
+        objects["Ring"].append(ring_cls(phases))
+    return objects
+
+
+def measure(classes: Dict[str, Type], num_lanes: int):
+    gc.collect()
+    tracemalloc.start()
+    objects = build(classes, num_lanes)
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_object = {}
+    for name, items in objects.items():
+        obj = items[0]
+        size = obj.__sizeof__() + (obj.__dict__.__sizeof__() if hasattr(obj, "__dict__") else 0)
+        per_object[name] = (size, len(items))
+    return total, per_object
+
+
+def main(num_lanes: int = 1_000_000):
+    before_total, before = measure({cls.__name__: plain(cls) for cls in SCHEMAS}, num_lanes)
+    after_total, after = measure({cls.__name__: cls for cls in SCHEMAS}, num_lanes)
+    print(f"{'schema':>12} {'count':>9} {'plain B/obj':>12} {'slots B/obj':>12}")
+    for name, (size, count) in before.items():
+        print(f"{name:>12} {count:>9} {size:>12} {after[name][0]:>12}")
+    print(f"total traced: plain {before_total / 2 ** 20:.1f} MiB, slots {after_total / 2 ** 20:.1f} MiB "
+          f"({1 - after_total / before_total:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
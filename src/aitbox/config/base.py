@@ -30,10 +30,12 @@ class ConfigBase:
                 arg_kwargs[field.name] = value
         explicit_kwargs = {**arg_kwargs, **kwargs}
         
-        from aitbox.config.config import GLOBAL_CONFIG
+        from aitbox.config.config import GLOBAL_CONFIG, LazyConfig
 
         yaml_obj = None
-        if GLOBAL_CONFIG is not None:
+        if isinstance(GLOBAL_CONFIG, LazyConfig):
+            yaml_obj = GLOBAL_CONFIG.find(cls)
+        elif GLOBAL_CONFIG is not None:
             yaml_obj = find_instance(GLOBAL_CONFIG, cls)
 
         for f in cls_fields:
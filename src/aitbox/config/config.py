@@ -8,15 +8,19 @@ Created     : 2025-12-27
 Description :
 """
 
+import copy
+import functools
 from functools import lru_cache
-from typing import Any
+from typing import Any, Dict, Hashable, Iterator, Set, Tuple
 
 import yaml
-from hydra.utils import instantiate
+from hydra.utils import get_object, instantiate
 
 GLOBAL_YAML_PATH: str | None = None
 GLOBAL_CONFIG: Any = None
 
+Path = Tuple[Hashable, ...]
+
 
 @lru_cache
 def load_yaml(path: str) -> dict:
@@ -25,7 +29,7 @@ def load_yaml(path: str) -> dict:
         return yaml.safe_load(f)
 
 
-def set_yaml_path(path: str) -> dict:
+def set_yaml_path(path: str) -> "LazyConfig":
     """ """
     global GLOBAL_YAML_PATH
     GLOBAL_YAML_PATH = path
@@ -36,8 +40,12 @@ def set_yaml_path(path: str) -> dict:
     return config
 
 
-def get_cfg(path: str | None = None) -> Any:
-    """ """
+def get_cfg(path: str | None = None) -> "LazyConfig":
+    """
+    Loaded config as a ``LazyConfig``, not the instantiated tree: attribute and item access, ``get``, ``==``,
+    ``in``, ``len`` and iteration behave as on the instantiated root, ``isinstance`` checks need
+    ``get_cfg().root``
+    """
     global GLOBAL_YAML_PATH
 
     yaml_path = path or GLOBAL_YAML_PATH
@@ -46,19 +54,161 @@ def get_cfg(path: str | None = None) -> Any:
             "YAML path not set. Provide path or call set_yaml_path(path) first."
         )
 
-    cfg = load_yaml(yaml_path)
-    cfg = instantiate_cfg(cfg)
-    return cfg
+    return LazyConfig(load_yaml(yaml_path))
 
 
 def instantiate_cfg(cfg: Any) -> Any:
     """ """
-    if isinstance(cfg, dict):
-        if "_target_" in cfg:
-            return instantiate(cfg, _convert_="object")
-        return {k: instantiate_cfg(v) for k, v in cfg.items()}
+    return LazyConfig(cfg).root
+
+
+def _is_hydra_key(key: Hashable) -> bool:
+    return isinstance(key, str) and key.startswith("_") and key.endswith("_")
+
+
+class LazyConfig:
+    """
+    Loaded YAML whose ``_target_`` nodes are instantiated on first access and then cached.
+
+    A node is built from its already built children, so every node is instantiated once however it is
+    reached; a node with ``_recursive_: False`` is handed to hydra as a whole, its children untouched.
+    ``find`` answers ``ConfigBase`` lookups from a type -> node index built once per config. The index
+    covers ``_target_`` nodes anywhere under a plain dict or list root too, which ``find_instance`` never
+    searched, so such nodes now supply ``ConfigBase`` defaults.
+
+    Attribute access, items, ``get``, ``==``, ``in``, ``len`` and iteration act on the root, e.g.
+    ``config.gpu.name`` or ``"gpu" in config``; ``node(*path)`` is the built node at a path. A plain dict
+    or list root answers them from the YAML and builds only the subtrees asked for; a ``_target_`` root is
+    built first.
+    """
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self._built: Dict[Path, Any] = {}
+        self._building: Set[Path] = set()
+        self._targets: Dict[Path, str] = {}  # target nodes in pre-order
+        self._nested: Set[Path] = set()  # nodes with a target node at or below them
+        self._index: Dict[type, Path] | None = None
+        self._walk((), raw)
+
+    def _walk(self, path: Path, node: Any) -> bool:
+        if isinstance(node, dict):
+            if "_target_" in node:
+                self._targets[path] = node["_target_"]
+                if node.get("_recursive_", True) is False:
+                    # hydra passes the children as plain values, they are not nodes of their own
+                    self._nested.add(path)
+                    return True
+            items = [(k, v) for k, v in node.items() if not _is_hydra_key(k)]
+        elif isinstance(node, list):
+            items = list(enumerate(node))
+        else:
+            return False
+        nested = path in self._targets
+        for key, value in items:
+            nested |= self._walk(path + (key,), value)
+        if nested:
+            self._nested.add(path)
+        return nested
+
+    @property
+    def root(self) -> Any:
+        """ """
+        return self.node()
+
+    def node(self, *path: Hashable) -> Any:
+        """Built value of the node at ``path`` (keys and list indices from the root)"""
+        if path in self._built:
+            return self._built[path]
+        node = self.raw
+        for key in path:
+            node = node[key]
+        value = self._build(path, node)
+        self._built[path] = value
+        return value
+
+    def _build(self, path: Path, node: Any) -> Any:
+        if path not in self._nested:
+            return copy.deepcopy(node)
+        if isinstance(node, list):
+            return [self.node(*path, i) for i in range(len(node))]
+        children = {
+            k: self.node(*path, k) for k in node if not _is_hydra_key(k) and path + (k,) in self._nested
+        }
+        if "_target_" not in node:
+            return {k: children[k] if k in children else self.node(*path, k) for k in node}
+
+        # hydra builds the node itself from its plain values, the built children are passed through as is
+        partial = node.get("_partial_", False)
+        plain = {k: v for k, v in node.items() if k not in children}
+        self._building.add(path)
+        try:
+            factory = instantiate({**plain, "_partial_": True}, _convert_=node.get("_convert_", "object"))
+            return functools.partial(factory, **children) if partial else factory(**children)
+        finally:
+            self._building.discard(path)
+
+    def find(self, cls: type) -> Any:
+        """
+        First instance of ``cls`` in pre-order, built on demand. None while any node is being built: the object
+        asking is then created by that node (or by its constructor) and must not take another node's values.
+        """
+        if self._index is None:
+            self._index = {}
+            for path, target in self._targets.items():
+                obj = get_object(target)
+                if isinstance(obj, type):
+                    for base in obj.__mro__:
+                        self._index.setdefault(base, path)
+        path = self._index.get(cls)
+        if path is None or self._building:
+            return None
+        return self.node(*path)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.root, name)
+
+    def _lazy_root(self) -> bool:
+        """Root is a plain dict or list whose items can be built one by one"""
+        return () not in self._targets and isinstance(self.raw, (dict, list))
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if not self._lazy_root():
+            return self.root[key]
+        if isinstance(self.raw, list):
+            if not isinstance(key, int):
+                return self.root[key]
+            key = range(len(self.raw))[key]  # one cache entry per item, IndexError when out of range
+        elif key not in self.raw:
+            raise KeyError(key)
+        return self.node(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """``get`` of the root, e.g. ``dict.get`` for a plain dict root"""
+        if self._lazy_root() and isinstance(self.raw, dict):
+            return self[key] if key in self.raw else default
+        return self.root.get(key, default)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyConfig):
+            other = other.root
+        return self.root == other
+
+    __hash__ = None
+
+    def __contains__(self, item: Any) -> bool:
+        if self._lazy_root() and isinstance(self.raw, dict):
+            return item in self.raw
+        return item in self.root
 
-    if isinstance(cfg, list):
-        return [instantiate_cfg(v) for v in cfg]
+    def __len__(self) -> int:
+        return len(self.raw) if self._lazy_root() else len(self.root)
 
-    return cfg
+    def __iter__(self) -> Iterator[Any]:
+        if not self._lazy_root():
+            return iter(self.root)
+        if isinstance(self.raw, dict):
+            return iter(self.raw)
+        return (self.node(i) for i in range(len(self.raw)))
@@ -10,6 +10,7 @@ Description :
 
 import os
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from dataclasses import dataclass
 from typing import Any
 
@@ -78,7 +79,14 @@ class TrainModelBase(TestModelBase):
         """"""
         ...
         
+    def no_sync(self):
+        """ """
+        if hasattr(self.model, "no_sync"):
+            return self.model.no_sync()
+        return nullcontext()
+
     def save_model(self, save_path):
         """ """
-        os.makedirs(save_path, exist_ok=True)
-        torch.save(self.model.state_dict(), save_path)
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        model = getattr(self.model, "module", self.model)
+        torch.save(model.state_dict(), save_path)
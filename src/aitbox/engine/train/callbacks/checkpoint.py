@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : checkpoint.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description : Full trainer state checkpoints written by a background thread, with top-K retention and resume
+"""
+
+import os
+import random
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import torch
+
+from aitbox.engine.train.callbacks.base import Callback
+from aitbox.engine.train.callbacks.wrapper import ddp_master_only
+from aitbox.utils.log import Log
+
+if TYPE_CHECKING:
+    from aitbox.engine.train.trainer import Trainer
+
+
+CHECKPOINT_PATTERN = re.compile(r"epoch(\d+)-step(\d+)\.pt$")
+
+
+def to_cpu(obj: Any) -> Any:
+    """Copy every tensor to CPU so the snapshot no longer aliases live training state"""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        return {k: to_cpu(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [to_cpu(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(to_cpu(v) for v in obj)
+    return obj
+
+
+def get_rng_state() -> dict:
+    """ """
+    state = {
+        "python": random.getstate(),
+        "numpy": np.random.get_state(),
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def set_rng_state(state: dict):
+    """ """
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+def latest_checkpoint(save_dir: str) -> str | None:
+    """ """
+    if not os.path.isdir(save_dir):
+        return None
+    steps = {}
+    for filename in os.listdir(save_dir):
+        match = CHECKPOINT_PATTERN.search(filename)
+        if match:
+            steps[filename] = int(match.group(2))
+    if not steps:
+        return None
+    return os.path.join(save_dir, max(steps, key=steps.get))
+
+
+class BaseCheckpointCallback(Callback):
+    """ """
+
+    caller: "Trainer"
+
+
+class CheckpointCallback(BaseCheckpointCallback):
+    """
+    Saves model, optimizer, scheduler, epoch, RNG and loader position.
+
+    Tensors are snapshotted to CPU on the training thread; serialization runs in a single background
+    worker, so at most one write is in flight. ``resume_from`` accepts a path or ``"last"``.
+    """
+
+    def __init__(
+        self,
+        save_dir: str,
+        every_n_epochs: int | None = 1,
+        every_n_steps: int | None = None,
+        top_k: int = 3,
+        monitor: str | None = None,
+        mode: str = "min",
+        resume_from: str | None = None,
+    ):
+        """ """
+        super().__init__()
+        if mode not in ("min", "max"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.save_dir = save_dir
+        self.every_n_epochs = every_n_epochs
+        self.every_n_steps = every_n_steps
+        self.top_k = top_k
+        self.monitor = monitor
+        self.mode = mode
+        self.resume_from = resume_from
+
+        self.saved: list[tuple[float, int, str]] = []
+        self._last_saved_step = -1
+        self._resume_total_loss = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._future: Future | None = None
+
+    def state_dict(self, batch_idx: int) -> dict:
+        """ """
+        trainer = self.caller
+        result_data = trainer.result_data
+        loaders = {}
+        for name in ("train", "val", "test"):
+            loader = getattr(trainer, f"{name}_loader_info").loader
+            if loader is not None:
+                loaders[name] = loader.state_dict()
+        return {
+            "epoch": trainer.epoch,
+            "batch_idx": batch_idx,
+            "global_step": result_data.acc_batch_idx,
+            "total_loss": result_data.total_loss,
+            "loss_list": {
+                name: list(getattr(result_data, f"{name}_loss_list")) for name in ("train", "val", "test")
+            },
+            "model": trainer.model.state_dict(),
+            "optimizer": trainer.optimizer.state_dict() if trainer.optimizer is not None else None,
+            "scheduler": trainer.scheduler.state_dict() if trainer.scheduler is not None else None,
+            "loaders": loaders,
+            "rng": get_rng_state(),
+        }
+
+    def load_state_dict(self, state: dict):
+        """ """
+        trainer = self.caller
+        trainer.model.load_state_dict(state["model"])
+        if state["optimizer"] is not None and trainer.optimizer is not None:
+            trainer.optimizer.load_state_dict(state["optimizer"])
+        if state["scheduler"] is not None and trainer.scheduler is not None:
+            trainer.scheduler.load_state_dict(state["scheduler"])
+
+        result_data = trainer.result_data
+        result_data.acc_batch_idx = state["global_step"]
+        for name, loss_list in state["loss_list"].items():
+            setattr(result_data, f"{name}_loss_list", list(loss_list))
+
+        for name, loader_state in state["loaders"].items():
+            loader = getattr(trainer, f"{name}_loader_info").loader
+            if loader is not None:
+                loader.load_state_dict(loader_state)
+
+        if state["batch_idx"] >= trainer.train_loader_info.max_batches:
+            trainer.start_epoch = state["epoch"] + 1
+        else:
+            trainer.start_epoch = state["epoch"]
+            trainer.start_batch_idx = state["batch_idx"] + 1
+            self._resume_total_loss = state["total_loss"]
+        self._last_saved_step = state["global_step"]
+        set_rng_state(state["rng"])
+
+    def before_fit(self):
+        """ """
+        if self.resume_from is None:
+            return
+        path = latest_checkpoint(self.save_dir) if self.resume_from == "last" else self.resume_from
+        if path is None:
+            Log.warning(f"No checkpoint found in {self.save_dir}, training from scratch")
+            return
+        self.load_state_dict(torch.load(path, map_location="cpu", weights_only=False))
+        Log.info(f"Resumed from {path} at epoch {self.caller.start_epoch} batch {self.caller.start_batch_idx}")
+
+    def before_epoch_train(self):
+        """ """
+        if self._resume_total_loss is not None:
+            self.caller.result_data.total_loss = self._resume_total_loss
+            self._resume_total_loss = None
+
+    def after_batch_train(self):
+        """ """
+        if self.every_n_steps and self.caller.result_data.acc_batch_idx % self.every_n_steps == 0:
+            self.save(self.caller.batch_result_data.batch_idx)
+
+    def after_epoch(self):
+        """ """
+        if self.every_n_epochs and self.caller.epoch % self.every_n_epochs == 0:
+            self.save(self.caller.train_loader_info.max_batches)
+
+    def finalize(self):
+        """ """
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def score(self) -> float:
+        """Larger is worse"""
+        if self.monitor is None:
+            return -self.caller.result_data.acc_batch_idx
+        values = getattr(self.caller.result_data, f"{self.monitor}_list")
+        if not values:
+            return float("inf")
+        return values[-1] if self.mode == "min" else -values[-1]
+
+    def wait(self):
+        """Block until the pending write finishes, re-raising its error if any"""
+        if self._future is not None:
+            self._future.result()
+            self._future = None
+
+    @ddp_master_only
+    def save(self, batch_idx: int):
+        """ """
+        step = self.caller.result_data.acc_batch_idx
+        if step == self._last_saved_step:
+            return
+        self._last_saved_step = step
+
+        self.wait()
+        state = to_cpu(self.state_dict(batch_idx))
+        path = os.path.join(self.save_dir, f"epoch{self.caller.epoch:04d}-step{step:08d}.pt")
+        self.saved.append((self.score(), step, path))
+
+        stale = []
+        while len(self.saved) > self.top_k:
+            worst = max(self.saved[:-1], key=lambda x: (x[0], -x[1]))
+            self.saved.remove(worst)
+            stale.append(worst[2])
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._future = self._executor.submit(self._write, state, path, stale)
+
+    def _write(self, state: dict, path: str, stale: list[str]):
+        """ """
+        os.makedirs(self.save_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        torch.save(state, tmp_path)
+        os.replace(tmp_path, path)
+        for stale_path in stale:
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : ddp.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description : DistributedDataParallel strategy for the Trainer
+"""
+
+import os
+from typing import TYPE_CHECKING
+
+import torch
+import torch.distributed as dist
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, DistributedSampler, IterableDataset, RandomSampler
+
+from aitbox.engine.train.callbacks.base import Callback
+from aitbox.engine.train.distributed import all_reduce_mean, is_distributed
+from aitbox.utils.log import Log
+
+if TYPE_CHECKING:
+    from aitbox.engine.train.trainer import Trainer
+
+
+def distributed_loader(loader: DataLoader) -> DataLoader:
+    """Rebuild ``loader`` with a DistributedSampler, keeping its other settings"""
+    if isinstance(loader.sampler, DistributedSampler):
+        return loader
+    if isinstance(loader.dataset, IterableDataset) or loader.batch_size is None:
+        Log.warning("DistributedSampler is not injected into a loader without an index sampler")
+        return loader
+    sampler = DistributedSampler(
+        loader.dataset,
+        shuffle=isinstance(loader.sampler, RandomSampler),
+        drop_last=loader.drop_last,
+    )
+    return DataLoader(
+        loader.dataset,
+        batch_size=loader.batch_size,
+        sampler=sampler,
+        num_workers=loader.num_workers,
+        collate_fn=loader.collate_fn,
+        pin_memory=loader.pin_memory,
+        drop_last=loader.drop_last,
+        timeout=loader.timeout,
+        worker_init_fn=loader.worker_init_fn,
+        prefetch_factor=loader.prefetch_factor,
+        persistent_workers=loader.persistent_workers,
+    )
+
+
+class BaseDDPCallback(Callback):
+    """ """
+
+    caller: "Trainer"
+
+
+class DDPCallback(BaseDDPCallback):
+    """
+    Wraps ``TrainModelBase.model`` in DistributedDataParallel and shards every loader.
+
+    Losses are all-reduced once per epoch/validation/test, so steps carry no extra collectives.
+    The callback runs first so that other callbacks see the reduced values.
+    """
+
+    weight: float = 1e9
+
+    def __init__(
+        self,
+        backend: str = "gloo",
+        bucket_cap_mb: float = 25,
+        find_unused_parameters: bool = False,
+        gradient_as_bucket_view: bool = True,
+        static_graph: bool = False,
+    ):
+        """ """
+        super().__init__()
+        self.backend = backend
+        self.bucket_cap_mb = bucket_cap_mb
+        self.find_unused_parameters = find_unused_parameters
+        self.gradient_as_bucket_view = gradient_as_bucket_view
+        self.static_graph = static_graph
+
+    def initialize(self):
+        """Join the process group from torchrun-style environment variables if not done yet"""
+        if is_distributed() or int(os.environ.get("WORLD_SIZE", 1)) <= 1:
+            return
+        dist.init_process_group(backend=self.backend)
+
+    def setup(self):
+        """ """
+        if not is_distributed():
+            return
+        for name in ("train", "val", "test"):
+            loader = getattr(self.caller, f"{name}_loader_info").loader
+            if loader is not None:
+                loader.loader = distributed_loader(loader.loader)
+
+        train_model = self.caller.model
+        if isinstance(train_model.model, DistributedDataParallel):
+            return
+        device = self.caller.device
+        device_ids = None
+        if device is not None and torch.device(device).type == "cuda":
+            device_ids = [torch.device(device).index or 0]
+        train_model.model = DistributedDataParallel(
+            train_model.model,
+            device_ids=device_ids,
+            bucket_cap_mb=self.bucket_cap_mb,
+            find_unused_parameters=self.find_unused_parameters,
+            gradient_as_bucket_view=self.gradient_as_bucket_view,
+            static_graph=self.static_graph,
+        )
+
+    def reduce(self, name: str):
+        """ """
+        if not is_distributed():
+            return
+        result_data = self.caller.result_data
+        loss_list = getattr(result_data, f"{name}_loss_list")
+        result_data.total_loss = all_reduce_mean(result_data.total_loss)
+        if loss_list:
+            loss_list[-1] = result_data.total_loss
+
+    def after_epoch_train(self):
+        """ """
+        self.reduce("train")
+
+    def after_validate(self):
+        """ """
+        self.reduce("val")
+
+    def after_test(self):
+        """ """
+        self.reduce("test")
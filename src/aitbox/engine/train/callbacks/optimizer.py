@@ -36,7 +36,7 @@ class OptimizerCallback(BaseOptimizerCallback):
         """ """
         self.caller.optimizer = self.caller.model.configure_optimizer()
 
-    def before_batch_train(self):
+    def after_batch_set_data(self):
         """ """
         if dist.is_available() and dist.is_initialized():
             if not self.caller.batch_result_data.batch_idx % self.caller.grad_accumulate_step == 0:
@@ -45,9 +45,9 @@ class OptimizerCallback(BaseOptimizerCallback):
 
     def after_batch_train_backward(self):
         """ """
-        if dist.is_available() and dist.is_initialized():
-            if not self.caller.batch_result_data.batch_idx % self.caller.grad_accumulate_step == 0:
-                self.ctx.__exit__(None, None, None)
+        if self.ctx is not None:
+            self.ctx.__exit__(None, None, None)
+            self.ctx = None
 
     def optimizer(self):
         """ """
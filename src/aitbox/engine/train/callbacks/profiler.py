@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : profiler.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description : Per-phase timing of the training loop and optional torch.profiler traces
+"""
+
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+import torch
+
+from aitbox.engine.train.callbacks.base import Callback
+from aitbox.engine.train.callbacks.wrapper import ddp_master_only
+from aitbox.utils.log import Log
+
+if TYPE_CHECKING:
+    from aitbox.engine.train.trainer import Trainer
+
+
+PHASES = ("data", "set_data", "train_step", "backward", "optimizer", "callbacks")
+
+
+def batch_size_of(batch: Any) -> int:
+    """ """
+    if isinstance(batch, torch.Tensor):
+        return batch.shape[0] if batch.dim() > 0 else 1
+    if isinstance(batch, (list, tuple)) and batch:
+        return batch_size_of(batch[0])
+    if isinstance(batch, dict) and batch:
+        return batch_size_of(next(iter(batch.values())))
+    if hasattr(batch, "shape") and len(batch.shape) > 0:
+        return batch.shape[0]
+    return 1
+
+
+def peak_memory(device) -> int:
+    """Peak memory in bytes: CUDA allocator peak on GPU, process max RSS otherwise"""
+    if device is not None and torch.device(device).type == "cuda" and torch.cuda.is_available():
+        return torch.cuda.max_memory_allocated(device)
+    try:
+        import resource
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class BaseProfilerCallback(Callback):
+    """ """
+
+    caller: "Trainer"
+
+
+class ProfilerCallback(BaseProfilerCallback):
+    """
+    Splits each training step into data / set_data / train_step / backward / optimizer / callbacks.
+
+    Every hook stamps the end of a phase, so the callback must run after all others of the same
+    event, hence the lowest weight.
+    """
+
+    weight: float = -1e9
+
+    def __init__(
+        self,
+        trace_dir: str | None = None,
+        trace_start: int = 10,
+        trace_warmup: int = 2,
+        trace_active: int = 5,
+        sync_cuda: bool = False,
+        verbose: bool = True,
+    ):
+        """ """
+        super().__init__()
+        self.trace_dir = trace_dir
+        self.trace_start = trace_start
+        self.trace_warmup = trace_warmup
+        self.trace_active = trace_active
+        self.sync_cuda = sync_cuda
+        self.verbose = verbose
+
+        self.history: list[dict] = []
+        self._totals = dict.fromkeys(PHASES, 0.0)
+        self._num_batches = 0
+        self._num_samples = 0
+        self._epoch_start = 0.0
+        self._last = 0.0
+        self._torch_profiler: torch.profiler.profile | None = None
+
+    def _now(self) -> float:
+        """ """
+        if self.sync_cuda and torch.cuda.is_available():
+            torch.cuda.synchronize()
+        return time.perf_counter()
+
+    def _mark(self, phase: str):
+        """ """
+        now = self._now()
+        self._totals[phase] += now - self._last
+        self._last = now
+
+    def before_fit(self):
+        """ """
+        if self.trace_dir is None:
+            return
+        os.makedirs(self.trace_dir, exist_ok=True)
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+        self._torch_profiler = torch.profiler.profile(
+            activities=activities,
+            schedule=torch.profiler.schedule(
+                skip_first=self.trace_start,
+                wait=0,
+                warmup=self.trace_warmup,
+                active=self.trace_active,
+                repeat=1,
+            ),
+            on_trace_ready=self._export_trace,
+            record_shapes=True,
+            profile_memory=True,
+        )
+        self._torch_profiler.__enter__()
+
+    def _export_trace(self, prof: torch.profiler.profile):
+        """ """
+        rank = torch.distributed.get_rank() if torch.distributed.is_initialized() else 0
+        path = os.path.join(self.trace_dir, f"trace_rank{rank}_step{prof.step_num}.json")
+        prof.export_chrome_trace(path)
+        Log.info(f"torch.profiler chrome trace saved to {path}")
+
+    def before_epoch_train(self):
+        """ """
+        self._totals = dict.fromkeys(PHASES, 0.0)
+        self._num_batches = 0
+        self._num_samples = 0
+        if self.caller.device is not None and torch.device(self.caller.device).type == "cuda":
+            torch.cuda.reset_peak_memory_stats(self.caller.device)
+        self._epoch_start = self._last = self._now()
+
+    def before_batch_train(self):
+        """ """
+        self._mark("data")
+
+    def after_batch_set_data(self):
+        """ """
+        self._mark("set_data")
+
+    def after_batch_train_step(self):
+        """ """
+        self._mark("train_step")
+
+    def backward(self):
+        """ """
+        self._mark("backward")
+
+    def optimizer(self):
+        """ """
+        self._mark("optimizer")
+
+    def after_batch_train(self):
+        """ """
+        self._num_batches += 1
+        self._num_samples += batch_size_of(self.caller.batch_result_data.batch)
+        if self._torch_profiler is not None:
+            self._torch_profiler.step()
+        self._mark("callbacks")
+
+    def after_epoch_train(self):
+        """ """
+        elapsed = self._now() - self._epoch_start
+        self.report(elapsed)
+
+    @ddp_master_only
+    def report(self, elapsed: float):
+        """ """
+        num_batches = max(self._num_batches, 1)
+        stats = {
+            "epoch": self.caller.epoch,
+            "num_batches": self._num_batches,
+            "num_samples": self._num_samples,
+            "elapsed": elapsed,
+            "throughput": self._num_samples / elapsed if elapsed > 0 else 0.0,
+            "data_wait_ratio": self._totals["data"] / elapsed if elapsed > 0 else 0.0,
+            "peak_memory": peak_memory(self.caller.device),
+        }
+        for phase in PHASES:
+            stats[f"{phase}_ms"] = self._totals[phase] / num_batches * 1000
+        self.history.append(stats)
+
+        if self.verbose:
+            phases = " ".join(f"{phase}={stats[f'{phase}_ms']:.2f}ms" for phase in PHASES)
+            Log.info(
+                f"Epoch {stats['epoch']} profile: {phases} | "
+                f"throughput={stats['throughput']:.1f} samples/s "
+                f"data_wait={stats['data_wait_ratio']:.1%} "
+                f"peak_memory={stats['peak_memory'] / 2 ** 20:.1f}MB"
+            )
+
+    def after_fit(self):
+        """ """
+        if self._torch_profiler is not None:
+            self._torch_profiler.__exit__(None, None, None)
+            self._torch_profiler = None
@@ -10,6 +10,7 @@ Description :
 
 import functools
 
+import torch
 import torch.distributed as dist
 from tqdm import tqdm
 from torch.utils.data import DataLoader, DistributedSampler
@@ -23,8 +24,10 @@ class InfiniteLoader:
     def __init__(self, loader: DataLoader):
         """ """
         self.loader = loader
-        self.iterator = iter(loader)
+        self.iter_rng_state = None
+        self.iterator = None
         self.num_iter = 1
+        self.num_batch = 0
 
     def __iter__(self):
         """ """
@@ -32,13 +35,23 @@ class InfiniteLoader:
 
     def __next__(self):
         """ """
+        if self.iterator is None:
+            self.new_iterator()
         try:
-            return next(self.iterator)
+            batch = next(self.iterator)
         except StopIteration:
             self.num_iter += 1
             self.set_epoch()
-            self.iterator = iter(self.loader)
-            return next(self.iterator)
+            self.new_iterator()
+            batch = next(self.iterator)
+        self.num_batch += 1
+        return batch
+
+    def new_iterator(self):
+        """The RNG state is kept so that a resumed run can replay the same shuffle order"""
+        self.num_batch = 0
+        self.iter_rng_state = torch.get_rng_state()
+        self.iterator = iter(self.loader)
 
     def __len__(self):
         """ """
@@ -58,6 +71,32 @@ class InfiniteLoader:
         if isinstance(self.loader.sampler, DistributedSampler):
             self.loader.sampler.set_epoch(self.num_iter)
 
+    def state_dict(self) -> dict:
+        """ """
+        return {
+            "num_iter": self.num_iter,
+            "num_batch": self.num_batch,
+            "iter_rng_state": self.iter_rng_state,
+        }
+
+    def load_state_dict(self, state: dict):
+        """Rebuild the iterator of the saved pass with its shuffle RNG and skip consumed batches"""
+        self.num_iter = state["num_iter"]
+        self.num_batch = 0
+        self.iterator = None
+        if state["num_batch"] >= len(self.loader):
+            self.num_iter += 1
+        if self.num_iter > 1:
+            self.set_epoch()
+        if state["iter_rng_state"] is None or not 0 < state["num_batch"] < len(self.loader):
+            return
+        rng_state = torch.get_rng_state()
+        torch.set_rng_state(state["iter_rng_state"])
+        self.new_iterator()
+        for _ in range(state["num_batch"]):
+            next(self)
+        torch.set_rng_state(rng_state)
+
 
 def ddp_master_only(func):
     """ """
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : distributed.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description : Process group launcher and collective helpers for DDP training
+"""
+
+import os
+import socket
+from typing import Callable
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+
+def is_distributed() -> bool:
+    """ """
+    return dist.is_available() and dist.is_initialized()
+
+
+def get_rank() -> int:
+    """ """
+    return dist.get_rank() if is_distributed() else 0
+
+
+def get_world_size() -> int:
+    """ """
+    return dist.get_world_size() if is_distributed() else 1
+
+
+def find_free_port() -> int:
+    """ """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def all_reduce_mean(value: float | torch.Tensor) -> float | torch.Tensor:
+    """Mean of a scalar or tensor across ranks; returned unchanged outside DDP"""
+    if not is_distributed():
+        return value
+    is_tensor = isinstance(value, torch.Tensor)
+    tensor = value.detach().clone().double() if is_tensor else torch.tensor(value, dtype=torch.float64)
+    dist.all_reduce(tensor, op=dist.ReduceOp.SUM)
+    tensor /= dist.get_world_size()
+    return tensor.to(value.dtype) if is_tensor else tensor.item()
+
+
+def _worker(rank: int, fn: Callable, world_size: int, backend: str, master_addr: str, master_port: int, args):
+    """ """
+    os.environ["MASTER_ADDR"] = master_addr
+    os.environ["MASTER_PORT"] = str(master_port)
+    os.environ["RANK"] = str(rank)
+    os.environ["WORLD_SIZE"] = str(world_size)
+    dist.init_process_group(backend=backend, rank=rank, world_size=world_size)
+    try:
+        fn(rank, world_size, *args)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch(
+    fn: Callable,
+    nprocs: int,
+    *args,
+    backend: str = "gloo",
+    master_addr: str = "127.0.0.1",
+    master_port: int | None = None,
+):
+    """
+    Spawns ``nprocs`` local processes, each calling ``fn(rank, world_size, *args)`` inside an
+    initialized process group. ``gloo`` runs on CPU-only machines.
+    """
+    if master_port is None:
+        master_port = find_free_port()
+    mp.spawn(
+        _worker,
+        args=(fn, nprocs, backend, master_addr, master_port, args),
+        nprocs=nprocs,
+        join=True,
+    )
@@ -116,6 +116,8 @@ class Trainer(CallbackMixin):
         self.grad_accumulate_step = 1
         self.fit_stop_signal = False
         self.epoch = 0
+        self.start_epoch = 1
+        self.start_batch_idx = 1
 
         self.train_loader_info = LoaderInfo()
         self.val_loader_info = LoaderInfo()
@@ -150,9 +152,10 @@ class Trainer(CallbackMixin):
             [train_loader, val_loader, test_loader],
         )
         self.set_model()
+        self("setup")
         self("configure_optimizer")
         self("before_fit")
-        for epoch in range(1, self.epochs + 1):
+        for epoch in range(self.start_epoch, self.epochs + 1):
             self.epoch = epoch
             self("before_epoch")
             self.train_epoch()
@@ -173,12 +176,14 @@ class Trainer(CallbackMixin):
         self.model.train()
         self.result_data.init(self.train_loader_info.loader)
         self("before_epoch_train")
-        for batch_idx in range(1, self.train_loader_info.max_batches + 1):
+        start_batch_idx, self.start_batch_idx = self.start_batch_idx, 1
+        for batch_idx in range(start_batch_idx, self.train_loader_info.max_batches + 1):
             batch = next(self.train_loader_info.loader)
             self("before_batch_train")
             batch = self.set_data(batch)
             self.result_data.set_acc_batch_idx()
             self.batch_result_data.set_batch(batch_idx, batch)
+            self("after_batch_set_data")
             output: StepOutput = self.model.train_step(batch)
             self("after_batch_train_step")
             self.batch_result_data.set_batch_output(output)
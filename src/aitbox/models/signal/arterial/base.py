@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : base
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+
+import abc
+from typing import List
+
+from aitbox.schemas.road_network import Cross, RoadSegment
+from aitbox.schemas.singal import SignalSchema
+
+
+class ArterialSolver(abc.ABC):
+    """ """
+
+    @abc.abstractmethod
+    def solve(
+        self,
+        crosses: List[Cross],
+        segments: List[RoadSegment],
+        schemas: List[SignalSchema],
+        *args,
+        **kwargs,
+    ) -> List[SignalSchema]:
+        """ """
+        ...
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : green_wave
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Two-way green wave offsets of an arterial by bandwidth search on a discretized offset grid
+"""
+
+import dataclasses
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.models.signal.arterial.base import ArterialSolver
+from aitbox.schemas.road_network import Cross, RoadSegment
+from aitbox.schemas.singal import CyclerSignalSchema
+
+
+class GreenWaveResult(NamedTuple):
+    """ """
+    offsets: np.ndarray  # (n,) seconds, first cross is 0
+    bandwidth_out: float  # seconds, first cross -> last cross
+    bandwidth_in: float  # seconds, last cross -> first cross
+    schemas: List[CyclerSignalSchema]
+
+
+def travel_times(crosses: Sequence[Cross], segments: Sequence[RoadSegment],
+                 speeds: float | Sequence[float]) -> np.ndarray:
+    """Cumulative travel time (s) from the first cross to every cross; speeds are km/h per segment"""
+    if len(segments) != len(crosses) - 1:
+        raise ValueError("An arterial of n crosses needs n - 1 segments")
+    for i, segment in enumerate(segments):
+        ends = {segment.start_cross_id, segment.end_cross_id}
+        if ends != {crosses[i].id, crosses[i + 1].id}:
+            raise ValueError(f"Segment {segment.id} does not join {crosses[i].id} and {crosses[i + 1].id}")
+    lengths = np.array([segment.length for segment in segments], dtype=np.float64)
+    speeds = np.broadcast_to(np.asarray(speeds, dtype=np.float64), lengths.shape)
+    return np.concatenate(([0.0], np.cumsum(lengths / (speeds / 3.6))))
+
+
+def green_window(schema: CyclerSignalSchema, phase_index: int) -> Tuple[float, float]:
+    """Start (relative to the cycle start) and length of the green of a phase, counted in its own ring"""
+    position = phase_index
+    for ring in schema.rings:
+        if position < len(ring.phases):
+            start = sum(p.green + p.yellow + p.all_red for p in ring.phases[:position])
+            return float(start), float(ring.phases[position].green)
+        position -= len(ring.phases)
+    raise IndexError(f"Phase {phase_index} not found in schema")
+
+
+def longest_circular_run(mask: np.ndarray) -> np.ndarray:
+    """Longest run of True along the last axis, wrapping around"""
+    bins = mask.shape[-1]
+    doubled = np.concatenate([mask, mask], axis=-1)
+    position = np.arange(2 * bins)
+    last_false = np.maximum.accumulate(np.where(doubled, -1, position), axis=-1)
+    return np.minimum((position - last_false).max(axis=-1), bins)
+
+
+class GreenWaveSolver(ArterialSolver):
+    """
+    Maximizes ``weight_out * b_out + weight_in * b_in`` over the offsets of a common-cycle arterial.
+
+    Time in the cycle is split into ``resolution``-second bins and the coordinated green of every cross is
+    shifted by its travel time to the first cross. Fixing the outbound band at the start of the cycle and
+    the inbound band at ``delta``, every cross can be checked on its own: it only has to cover both bands
+    with one offset. The search is vectorized over ``(cross, delta, offset)``, without iterating over offset
+    combinations, and is run a second time with the inbound band anchored so that inbound-only solutions
+    are reached too; together the two runs are exact on the grid.
+    """
+
+    def __init__(self, resolution: float = 1.0, weight_out: float = 1.0, weight_in: float = 1.0):
+        self.resolution = resolution
+        self.weight_out = weight_out
+        self.weight_in = weight_in
+
+    @staticmethod
+    def bandwidths(offsets: np.ndarray, green_start: np.ndarray, green: np.ndarray, travel: np.ndarray,
+                   bins: int) -> Tuple[int, int]:
+        """Outbound and inbound bandwidth in bins for the given offsets"""
+        position = np.arange(bins)[None, :]
+        start = (offsets + green_start)[:, None]
+        out_mask = (position - start + travel[:, None]) % bins < green[:, None]
+        in_mask = (position - start - travel[:, None]) % bins < green[:, None]
+        return int(longest_circular_run(out_mask.all(axis=0))), int(longest_circular_run(in_mask.all(axis=0)))
+
+    @staticmethod
+    def _anchored_search(green: np.ndarray, green_start: np.ndarray, travel: np.ndarray, bins: int,
+                         weight_lead: float, weight_other: float) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Best weighted bands with the lead band anchored at [0, w_lead); the lead direction travels along
+        ``travel``, the other one against it. Passing ``-travel`` anchors the inbound band instead.
+
+        Returns:
+            best score, (n, D) mask of the feasible shifts d of every cross, (n, D) offset (bins) per shift
+        """
+        n = len(green)
+        # Lead band [0, w_lead): the shifted lead green of cross i starts at -d, d in [0, g_i),
+        # covering w_lead <= g_i - d. Its other green then starts at 2 * travel_i - d, and covers a
+        # band [delta, delta + w_other) when w_other <= g_i - ((delta - start) mod bins).
+        d = np.arange(green.max())
+        valid = d[None, :] < green[:, None]  # (n, D)
+        other_start = (2 * travel[:, None] - d[None, :]) % bins  # (n, D)
+        delta = np.arange(bins)
+        other_width = green[:, None, None] - (delta[None, :, None] - other_start[:, None, :]) % bins  # (n, bins, D)
+        other_width = np.where(valid[:, None, :], np.maximum(other_width, 0), -1)
+
+        # best other width of cross i with a lead band of w_lead: max over d <= g_i - w_lead
+        prefix = np.maximum.accumulate(other_width, axis=2)
+        w_lead = np.arange(green.min() + 1)
+        index = np.minimum(green[:, None] - w_lead[None, :], green[:, None] - 1)  # (n, W)
+        best_other = np.take_along_axis(prefix, np.broadcast_to(index[:, None, :], (n, bins, len(w_lead))), axis=2)
+        w_other = best_other.min(axis=0)  # (bins, W)
+        score = weight_lead * w_lead[None, :] + weight_other * w_other
+        delta_opt, w_lead_opt = np.unravel_index(int(np.argmax(score)), score.shape)
+
+        feasible = valid & (d[None, :] <= green[:, None] - w_lead_opt) & \
+            (other_width[:, delta_opt, :] >= w_other[delta_opt, w_lead_opt])
+        theta = (-d[None, :] - green_start[:, None] + travel[:, None]) % bins
+        return float(score[delta_opt, w_lead_opt]), feasible, theta
+
+    def optimize(
+        self,
+        crosses: List[Cross],
+        segments: List[RoadSegment],
+        schemas: List[CyclerSignalSchema],
+        speeds: float | Sequence[float] = 50.0,
+        coord_phases: int | Sequence[int] = 0,
+        initial_offsets: Sequence[float] | None = None,
+    ) -> GreenWaveResult:
+        """
+        Args:
+            crosses: ordered crosses of the arterial
+            segments: ``segments[i]`` joins ``crosses[i]`` and ``crosses[i + 1]``
+            schemas: cycler schemas of the crosses, all with the same cycle
+            speeds: design speed per segment (km/h)
+            coord_phases: index of the coordinated phase of every cross, serving both directions
+            initial_offsets: previous offsets (s); among offsets giving the optimal bands, the closest
+                to them are kept so that re-optimization does not shift signals needlessly
+        """
+        cycles = {schema.cycle for schema in schemas}
+        if len(cycles) != 1:
+            raise ValueError(f"Arterial coordination needs a common cycle, got {sorted(cycles)}")
+        cycle = cycles.pop()
+        n = len(crosses)
+        bins = max(int(round(cycle / self.resolution)), 1)
+        coord_phases = np.broadcast_to(np.asarray(coord_phases), (n,))
+        windows = np.array([green_window(s, int(p)) for s, p in zip(schemas, coord_phases)]).reshape(n, 2)
+        green_start = np.round(windows[:, 0] / self.resolution).astype(np.int64)
+        green = np.clip(np.round(windows[:, 1] / self.resolution).astype(np.int64), 1, bins)
+        travel = np.round(travel_times(crosses, segments, speeds) / self.resolution).astype(np.int64)
+
+        # a band of width >= 1 in either direction can be moved to the start of the cycle, so anchoring the
+        # outbound band and then the inbound band covers every solution
+        _, feasible, theta = max(
+            self._anchored_search(green, green_start, travel, bins, self.weight_out, self.weight_in),
+            self._anchored_search(green, green_start, -travel, bins, self.weight_in, self.weight_out),
+            key=lambda result: result[0],
+        )
+
+        # every cross picks a feasible d, the middle one or the one closest to the previous offsets
+        choice = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            options = np.flatnonzero(feasible[i])
+            choice[i] = options[len(options) // 2]
+        if initial_offsets is not None:
+            previous = np.round(np.asarray(initial_offsets, dtype=np.float64) / self.resolution).astype(np.int64)
+            base = theta[0, choice[0]]
+            for i in range(1, n):
+                options = np.flatnonzero(feasible[i])
+                distance = (theta[i, options] - base - (previous[i] - previous[0])) % bins
+                choice[i] = options[np.argmin(np.minimum(distance, bins - distance))]
+        offsets = (theta[np.arange(n), choice] - theta[0, choice[0]]) % bins
+
+        out_band, in_band = self.bandwidths(offsets, green_start, green, travel, bins)
+        offsets_s = offsets * self.resolution
+        return GreenWaveResult(
+            offsets=offsets_s,
+            bandwidth_out=float(out_band * self.resolution),
+            bandwidth_in=float(in_band * self.resolution),
+            schemas=[dataclasses.replace(s, phase_offset=int(round(o))) for s, o in zip(schemas, offsets_s)],
+        )
+
+    def solve(self, crosses: List[Cross], segments: List[RoadSegment], schemas: List[CyclerSignalSchema], *args,
+              **kwargs) -> List[CyclerSignalSchema]:
+        return self.optimize(crosses, segments, schemas, *args, **kwargs).schemas
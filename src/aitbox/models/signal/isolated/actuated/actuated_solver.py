@@ -4,20 +4,36 @@
 # @File : actuated_solver.py
 # @Author : run
 # @Date : 2026/1/19 20:51
-from typing import List
+import dataclasses
+from typing import Dict, List
 
+import numpy as np
+
+from aitbox.models.signal.isolated.actuated.controller import ActuatedController
 from aitbox.models.signal.isolated.base import IsolatedSolver
 from aitbox.schemas.indicator import Indicator
 from aitbox.schemas.road_network import Cross
-from aitbox.schemas.singal import SignalSchema
+from aitbox.schemas.singal import ActuatedSignalSchema, SignalSchema
 
 
 class ActuatedSolver(IsolatedSolver):
-    def __init__(self, *args):
-        pass
+    """由检测器过车时间戳回放感应控制，得到当前时刻的运行相位"""
 
-    def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
-              **kwargs) -> SignalSchema:
-        # todo 确认指标所在位置
+    def __init__(self, transition: float = 5.0, recall: bool = True):
+        self.controller = ActuatedController(transition, recall)
 
-        return schema
+    def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
+              actuations: Dict[str | int, np.ndarray] | None = None, now: float | None = None,
+              start_time: float = 0.0, **kwargs) -> SignalSchema:
+        """
+        Args:
+            actuations: 各车道 [start_time, now] 内的过车时间戳（秒）
+            now: 当前时刻，缺省为最后一次过车时刻
+        """
+        if not isinstance(schema, ActuatedSignalSchema) or not actuations:
+            return schema
+        if now is None:
+            now = max((float(np.max(t)) for t in actuations.values() if len(t)), default=start_time)
+        timeline = self.controller.run_crosses([cross], [schema], [actuations], now + 1e-9, start_time)[0]
+        phase, elapsed = timeline.state_at(now)
+        return dataclasses.replace(schema, running_phase=[phase], running_time=[int(elapsed)])
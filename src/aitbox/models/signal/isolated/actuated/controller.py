@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : controller.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 感应控制仿真器，由检测器过车时间戳回放各路口的相位序列
+from bisect import bisect_right
+from enum import IntEnum
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.models.signal.isolated.movement import entry_lanes, phase_lane_mask, schema_movements, schema_phases
+from aitbox.schemas.road_network import Cross
+from aitbox.schemas.singal import ActuatedPhase, ActuatedSignalSchema
+
+
+class Termination(IntEnum):
+    """绿灯结束原因"""
+    GAP_OUT = 0  # 车头时距超过允许间隔
+    MAX_OUT = 1  # 达到最大绿
+
+
+class ActuatedTimeline(NamedTuple):
+    """单个路口回放得到的绿灯序列，各数组一一对应"""
+    phase: np.ndarray  # (K,) 相位序号
+    start: np.ndarray  # (K,) 绿灯开始时刻（秒）
+    end: np.ndarray  # (K,) 绿灯结束时刻（秒）
+    termination: np.ndarray  # (K,) Termination
+
+    def state_at(self, t: float) -> Tuple[int, float]:
+        """t 时刻正在运行（含其后的过渡时间）的相位及其已运行时间"""
+        k = int(np.searchsorted(self.start, t, side="right")) - 1
+        if k < 0:
+            return int(self.phase[0]) if len(self.phase) else 0, 0.0
+        return int(self.phase[k]), float(t - self.start[k])
+
+
+class PhaseTiming(NamedTuple):
+    """按相位展开的感应参数"""
+    min_green: np.ndarray
+    max_green: np.ndarray
+    gap: np.ndarray  # 允许的最大车头时距：min(单位延长时间, 最大切断间隔)
+
+
+def phase_timing(schema: ActuatedSignalSchema) -> PhaseTiming:
+    """相位未设置最小绿时使用方案的初始绿灯时间"""
+    phases: List[ActuatedPhase] = schema_phases(schema)
+    min_green = np.array([p.min_green if p.min_green > 0 else schema.start_green for p in phases], dtype=np.float64)
+    max_green = np.maximum(np.array([p.max_green for p in phases], dtype=np.float64), min_green)
+    gap = np.array([p.green_extend_unit for p in phases], dtype=np.float64)
+    if schema.max_break_gap and schema.max_break_gap > 0:
+        gap = np.minimum(gap, schema.max_break_gap)
+    return PhaseTiming(min_green, max_green, gap)
+
+
+def gap_breaks(times: np.ndarray, gap: float) -> List[int]:
+    """车头时距不小于 gap 的过车序号，即延长链在这些位置断开"""
+    return (np.flatnonzero(np.diff(times) >= gap) + 1).tolist()
+
+
+def green_end(times: List[float], breaks: List[int], start: float, min_green: float, max_green: float,
+              gap: float) -> Tuple[float, Termination]:
+    """
+    计算从 start 开始的绿灯何时结束。每次过车把绿灯延长到 过车时刻 + gap，
+    最小绿结束后若延长时间内无车则 gap-out，延长到最大绿则 max-out。
+
+    延长链的断点由 gap_breaks 预先算好，每次只需两次二分查找，与绿灯内的过车数无关。
+    单次查询的参考实现，ActuatedController.run 对所有路口批量执行同一规则。
+    """
+    min_end, max_end = start + min_green, start + max_green
+    i = bisect_right(times, min_end)
+    end = min_end
+    if i > 0 and times[i - 1] >= start:
+        end = max(end, times[i - 1] + gap)
+    if i < len(times) and times[i] < end:
+        # times[i:b] 相邻车头时距均小于 gap，绿灯延续到其中最后一辆车之后 gap 秒
+        k = bisect_right(breaks, i)
+        b = breaks[k] if k < len(breaks) else len(times)
+        end = times[b - 1] + gap
+    if end >= max_end:
+        return max_end, Termination.MAX_OUT
+    return end, Termination.GAP_OUT
+
+
+class ActuatedController:
+    """
+    多路口感应控制回放。所有路口逐绿灯同步推进，每一轮用向量运算同时算出各路口当前相位的
+    gap-out/max-out 时刻，不做逐秒循环，也不逐路口调用 Python 代码。
+
+    Args:
+        transition: 相位间的过渡时间（黄灯 + 全红，秒）
+        recall: True 时每个相位都至少运行最小绿；False 时跳过自上次放行以来没有请求的相位，
+            所有相位都无请求时按顺序运行下一相位
+    """
+
+    def __init__(self, transition: float = 5.0, recall: bool = True):
+        self.transition = transition
+        self.recall = recall
+        self._lane_phase: Dict[Tuple[str | int, tuple], Tuple[Dict[str | int, int], np.ndarray]] = {}
+
+    def phase_actuations(self, cross: Cross, schema: ActuatedSignalSchema,
+                         actuations: Dict[str | int, np.ndarray]) -> List[np.ndarray]:
+        """
+        把按车道给出的过车时间戳合并为按相位的有序时间戳。车道-相位对应按环与屏障位置确定（见 schema_movements），
+        与周期式求解器一致，每个路口每种相位结构只构建一次
+        """
+        movements = tuple(schema_movements(schema))
+        key = (cross.id, movements)
+        cached = self._lane_phase.get(key)
+        if cached is None:
+            lane_index = {lane.id: i for i, (_, lane) in enumerate(entry_lanes(cross))}
+            cached = self._lane_phase[key] = (lane_index, phase_lane_mask(cross, len(movements), movements))
+        lane_index, mask = cached
+
+        per_lane = [np.empty(0)] * mask.shape[1]
+        for lane_id, times in actuations.items():
+            if lane_id in lane_index:
+                per_lane[lane_index[lane_id]] = np.asarray(times, dtype=np.float64)
+        return [
+            np.sort(np.concatenate([per_lane[j] for j in np.flatnonzero(row)] or [np.empty(0)]))
+            for row in mask
+        ]
+
+    def _next_phases(self, num_phases: np.ndarray, current: np.ndarray, requested) -> np.ndarray:
+        """
+        各路口的下一相位。recall 时按顺序轮转；否则取顺序上第一个有请求的相位，
+        requested(step) 返回各路口在 current + step 相位上是否有请求
+        """
+        following = (current + 1) % num_phases
+        if self.recall:
+            return following
+        result = following.copy()
+        found = np.zeros(len(current), dtype=bool)
+        for step in range(1, int(num_phases.max(initial=0)) + 1):
+            hit = ~found & (step <= num_phases) & requested(step)
+            result[hit] = ((current + step) % num_phases)[hit]
+            found |= hit
+        return result
+
+    def run(self, schemas: Sequence[ActuatedSignalSchema], actuations: Sequence[Sequence[np.ndarray]],
+            horizon: float, start_time: float = 0.0) -> List[ActuatedTimeline]:
+        """
+        回放 [start_time, horizon) 内所有路口的感应控制。各路口相互独立，每一轮为所有仍在回放的路口
+        同时计算当前相位的结束时刻，轮数等于单个路口的绿灯数，每轮只有若干次向量运算。
+
+        所有 (路口, 相位) 的过车时间戳展平为一个数组，以 段号 * span + 时刻 为全局有序键，
+        一次 searchsorted 即完成所有路口在各自时间戳段内的二分查找；每辆车所在延长链的最后一辆车预先算好。
+
+        Args:
+            schemas: 各路口的感应方案，running_phase[0] 为起始相位
+            actuations: 各路口按相位合并的有序过车时间戳，见 phase_actuations
+            horizon: 回放结束时刻（秒）
+            start_time: 回放开始时刻（秒）
+        """
+        num_crosses = len(schemas)
+        timings = [phase_timing(schema) for schema in schemas]
+        num_phases = np.array([len(timing.gap) for timing in timings], dtype=np.int64)
+        width = max(int(num_phases.max(initial=0)), 1)
+        min_green, max_green, gap = (np.zeros((num_crosses, width)) for _ in range(3))
+        segments = []
+        for c, (timing, cross_times) in enumerate(zip(timings, actuations)):
+            n = num_phases[c]
+            min_green[c, :n], max_green[c, :n], gap[c, :n] = timing.min_green, timing.max_green, timing.gap
+            segments.extend(np.asarray(cross_times[p], dtype=np.float64) if p < n else np.empty(0)
+                            for p in range(width))
+
+        lengths = np.array([len(times) for times in segments], dtype=np.int64)
+        seg_start = np.concatenate(([0], np.cumsum(lengths)))
+        times = np.concatenate(segments) if segments else np.empty(0)
+        seg_of = np.repeat(np.arange(len(segments)), lengths)
+        # 延长链在段首或车头时距 >= gap 处断开，chain_last[i] 为第 i 辆车所在链的最后一辆车
+        new_chain = np.ones(len(times), dtype=bool)
+        new_chain[1:] = (np.diff(times) >= gap.ravel()[seg_of[1:]]) | (seg_of[1:] != seg_of[:-1])
+        chain_last = np.flatnonzero(np.r_[new_chain[1:], True])[np.cumsum(new_chain) - 1]
+
+        shift = np.floor(min(times.min(initial=start_time), start_time))
+        top = max(times.max(initial=horizon), horizon) + max_green.max(initial=0) + gap.max(initial=0)
+        span = np.ceil(top - shift) + 2
+        keys = seg_of * span + (times - shift)
+        times, chain_last = np.r_[times, np.inf], np.r_[chain_last, len(times)]  # 哨兵，避免越界
+
+        def count_before(seg: np.ndarray, t: np.ndarray) -> np.ndarray:
+            """各段中时刻不大于 t 的过车数（以全局下标表示）"""
+            i = np.searchsorted(keys, seg * span + (np.maximum(t, shift - 1) - shift), side="right")
+            return np.clip(i, seg_start[seg], seg_start[seg + 1])
+
+        last_end = np.full((num_crosses, width), -np.inf)
+        phase = np.array([schema.running_phase[0] if schema.running_phase else 0 for schema in schemas],
+                         dtype=np.int64)
+        start = np.full(num_crosses, float(start_time))
+        active = np.flatnonzero(num_phases > 0)
+        rounds = []
+        while len(active):
+            c, p, t = active, phase[active], start[active]
+            seg = c * width + p
+            min_end, max_end, g = t + min_green[c, p], t + max_green[c, p], gap[c, p]
+            i = count_before(seg, min_end)
+            end = min_end
+            prev = times[np.maximum(i - 1, 0)]
+            end = np.where((i > seg_start[seg]) & (prev >= t), np.maximum(end, prev + g), end)
+            extend = (i < seg_start[seg + 1]) & (times[i] < end)
+            end = np.where(extend, times[chain_last[i]] + g, end)
+            max_out = end >= max_end
+            end = np.where(max_out, max_end, end)
+            rounds.append((c, p, t, np.minimum(end, horizon), max_out))
+
+            last_end[c, p] = end
+            next_start = end + self.transition
+            keep = next_start < horizon
+            c, p, next_start = c[keep], p[keep], next_start[keep]
+
+            def requested(step: int, c=c, p=p, now=next_start) -> np.ndarray:
+                candidate = (p + step) % num_phases[c]
+                seg = c * width + candidate
+                return count_before(seg, now) > count_before(seg, last_end[c, candidate])
+
+            phase[c] = self._next_phases(num_phases[c], p, requested)
+            start[c] = next_start
+            active = c
+
+        if rounds:
+            cross, p, t, end, max_out = (np.concatenate(column) for column in zip(*rounds))
+        else:
+            cross, p, t, end, max_out = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), \
+                np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+        order = np.argsort(cross, kind="stable")
+        bounds = np.searchsorted(cross[order], np.arange(num_crosses + 1))
+        reason = np.where(max_out, Termination.MAX_OUT, Termination.GAP_OUT).astype(np.int8)
+        return [
+            ActuatedTimeline(p[index].astype(np.int64), t[index], end[index], reason[index])
+            for index in (order[a:b] for a, b in zip(bounds[:-1], bounds[1:]))
+        ]
+
+    def run_crosses(self, crosses: Sequence[Cross], schemas: Sequence[ActuatedSignalSchema],
+                    actuations: Sequence[Dict[str | int, np.ndarray]], horizon: float,
+                    start_time: float = 0.0) -> List[ActuatedTimeline]:
+        """run 的便捷入口，过车时间戳按车道 id 给出"""
+        merged = [
+            self.phase_actuations(cross, schema, lane_times)
+            for cross, schema, lane_times in zip(crosses, schemas, actuations)
+        ]
+        return self.run(schemas, merged, horizon, start_time)
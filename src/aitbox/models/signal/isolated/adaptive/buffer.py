@@ -73,3 +73,103 @@ class Buffer:
     def clear(self) -> None:
         """清空缓冲区"""
         self.samples.clear()
+
+
+@dataclass
+class RingBuffer:
+    """与 Buffer 接口一致的环形缓冲区，数据存放在预分配的 NumPy 数组中"""
+    capacity: int
+    seed: int | None = None
+    as_tensor: bool = False
+    device: str | None = None
+
+    def __post_init__(self):
+        self.rng = np.random.default_rng(self.seed)
+        self.states: np.ndarray | None = None
+        self.actions: np.ndarray | None = None
+        self.rewards: np.ndarray | None = None
+        self.next_states: np.ndarray | None = None
+        self.dones: np.ndarray | None = None
+        self.ptr = 0
+        self.count = 0
+
+    def _allocate(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                  next_states: np.ndarray) -> None:
+        """按首批样本的形状和类型预分配存储"""
+        self.states = np.empty((self.capacity, *states.shape[1:]), dtype=states.dtype)
+        self.actions = np.empty((self.capacity, *actions.shape[1:]), dtype=actions.dtype)
+        self.rewards = np.empty((self.capacity, *rewards.shape[1:]), dtype=rewards.dtype)
+        self.next_states = np.empty((self.capacity, *next_states.shape[1:]), dtype=next_states.dtype)
+        self.dones = np.empty(self.capacity, dtype=bool)
+
+    def add(self, state: np.ndarray, action: np.ndarray,
+            reward: np.ndarray, next_state: np.ndarray, done: bool = False) -> None:
+        """添加单个样本到缓冲区"""
+        self.add_batch(np.asarray(state)[None], np.asarray(action)[None], np.asarray(reward)[None],
+                       np.asarray(next_state)[None], np.asarray([done]))
+
+    def add_batch(self, states: np.ndarray, actions: np.ndarray,
+                  rewards: np.ndarray, next_states: np.ndarray, dones: np.ndarray) -> None:
+        """批量添加样本，超出容量时覆盖最旧的样本"""
+        self._store(states, actions, rewards, next_states, dones)
+
+    def _store(self, states: np.ndarray, actions: np.ndarray,
+               rewards: np.ndarray, next_states: np.ndarray, dones: np.ndarray) -> np.ndarray:
+        """写入环形数组并返回写入的位置"""
+        states, actions = np.asarray(states), np.asarray(actions)
+        rewards, next_states = np.asarray(rewards), np.asarray(next_states)
+        dones = np.asarray(dones, dtype=bool).reshape(-1)
+        if self.states is None:
+            self._allocate(states, actions, rewards, next_states)
+
+        n = len(states)
+        if n > self.capacity:
+            states, actions, rewards = states[-self.capacity:], actions[-self.capacity:], rewards[-self.capacity:]
+            next_states, dones = next_states[-self.capacity:], dones[-self.capacity:]
+            self.ptr = (self.ptr + n - self.capacity) % self.capacity
+            n = self.capacity
+
+        index = (self.ptr + np.arange(n)) % self.capacity
+        self.states[index] = states
+        self.actions[index] = actions
+        self.rewards[index] = rewards
+        self.next_states[index] = next_states
+        self.dones[index] = dones
+        self.ptr = (self.ptr + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+        return index
+
+    def sample(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """不放回地随机采样一批数据"""
+        batch_size = min(batch_size, self.count)
+        index = self.rng.choice(self.count, batch_size, replace=False)
+        return self._gather(index)
+
+    def _gather(self, index: np.ndarray, *extra: np.ndarray) -> tuple:
+        """按位置取出样本，extra 为随样本一起输出的附加数组"""
+        batch = (
+            self.states[index],
+            self.actions[index],
+            self.rewards[index].reshape(-1),
+            self.next_states[index],
+            self.dones[index],
+            *extra,
+        )
+        if self.as_tensor:
+            import torch
+
+            batch = tuple(torch.as_tensor(x, device=self.device) for x in batch)
+        return batch
+
+    def size(self) -> int:
+        """返回当前缓冲区大小"""
+        return self.count
+
+    def is_full(self) -> bool:
+        """检查缓冲区是否已满"""
+        return self.count == self.capacity
+
+    def clear(self) -> None:
+        """清空缓冲区，保留已分配的存储"""
+        self.ptr = 0
+        self.count = 0
@@ -5,19 +5,237 @@
 # @Author : run
 # @Date : 2026/1/19 20:53
 # Description: 基于DQN的强化学习信号控制模式求解器
-from typing import List
+import copy
+from typing import Dict, List
 
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader, IterableDataset
+
+from aitbox.engine.train.base import StepOutput, TrainModelBase
+from aitbox.engine.train.callbacks.base import Callback
+from aitbox.engine.train.trainer import Trainer
+from aitbox.models.signal.isolated.adaptive.buffer import RingBuffer
+from aitbox.models.signal.isolated.adaptive.env import ObservationBuilder, TrafficEnv, apply_phases
+from aitbox.models.signal.isolated.adaptive.prioritized_buffer import PrioritizedBuffer
 from aitbox.models.signal.isolated.base import IsolatedSolver
 from aitbox.schemas.indicator import Indicator
 from aitbox.schemas.road_network import Cross
 from aitbox.schemas.singal import SignalSchema
 
 
+class QNetwork(nn.Module):
+    """状态末尾 num_actions 维为有效相位 mask，无效相位的 Q 值被屏蔽"""
+
+    def __init__(self, state_dim: int, num_actions: int, hidden_dim: int = 128):
+        super().__init__()
+        self.num_actions = num_actions
+        self.layer = nn.Sequential(
+            nn.Linear(state_dim, hidden_dim),
+            nn.ReLU(),
+            nn.Linear(hidden_dim, hidden_dim),
+            nn.ReLU(),
+            nn.Linear(hidden_dim, num_actions),
+        )
+
+    def forward(self, state: torch.Tensor) -> torch.Tensor:
+        q = self.layer(torch.log1p(state.clamp(min=0)))
+        mask = state[..., -self.num_actions:] > 0.5
+        return q.masked_fill(~mask, torch.finfo(q.dtype).min)
+
+
+class ReplayDataset(IterableDataset):
+    """每个 epoch 从回放缓冲区采样 num_batches 个 batch"""
+
+    def __init__(self, buffer: RingBuffer, batch_size: int, num_batches: int):
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.num_batches = num_batches
+
+    def __len__(self):
+        return self.num_batches
+
+    def __iter__(self):
+        keys = ("states", "actions", "rewards", "next_states", "dones", "weights", "indices")
+        for _ in range(self.num_batches):
+            yield {k: torch.as_tensor(v) for k, v in zip(keys, self.buffer.sample(self.batch_size))}
+
+    def loader(self) -> DataLoader:
+        return DataLoader(self, batch_size=None)
+
+
+class DQNTrainModel(TrainModelBase):
+    """Double DQN：在线网络选动作、目标网络估值"""
+
+    def __init__(self, model: QNetwork, lr: float = 1e-3, gamma: float = 0.99):
+        self.lr = lr
+        self.gamma = gamma
+        super().__init__(model)
+        self.target = copy.deepcopy(model).requires_grad_(False)
+        self.optimizer = None
+
+    def train_step(self, batch: Dict[str, torch.Tensor]) -> StepOutput:
+        q = self.model(batch["states"]).gather(1, batch["actions"].long().unsqueeze(1)).squeeze(1)
+        with torch.no_grad():
+            next_actions = self.model(batch["next_states"]).argmax(dim=1, keepdim=True)
+            next_q = self.target(batch["next_states"]).gather(1, next_actions).squeeze(1)
+            not_terminated = 1.0 - batch["dones"].float()
+            target = batch["rewards"].float() + self.gamma * not_terminated * next_q
+        loss = self.compute_loss(q, target, batch.get("weights"))
+        return StepOutput(loss, (q - target).detach())
+
+    @torch.no_grad()
+    def validate_step(self, batch: Dict[str, torch.Tensor]) -> StepOutput:
+        return self.train_step(batch)
+
+    def configure_criterion(self) -> nn.Module:
+        return nn.SmoothL1Loss(reduction="none")
+
+    def configure_optimizer(self) -> torch.optim.Optimizer:
+        """每轮迭代都会重新 fit，优化器只创建一次以保留 Adam 状态"""
+        if self.optimizer is None:
+            self.optimizer = torch.optim.Adam(self.model.parameters(), lr=self.lr)
+        return self.optimizer
+
+    def compute_loss(self, prediction, ground_truth, weights=None, *args, **kwargs):
+        loss = self.criterion(prediction, ground_truth)
+        if weights is not None:
+            loss = loss * weights
+        return loss.mean()
+
+    def sync_target(self, tau: float = 1.0) -> None:
+        if tau >= 1.0:
+            self.target.load_state_dict(self.model.state_dict())
+            return
+        with torch.no_grad():
+            for target, online in zip(self.target.parameters(), self.model.parameters()):
+                target.lerp_(online, tau)
+
+
+class TargetSyncCallback(Callback):
+    """每 sync_interval 次参数更新同步一次目标网络，tau < 1 时为软更新"""
+
+    caller: "Trainer"
+
+    def __init__(self, sync_interval: int = 500, tau: float = 1.0):
+        super().__init__()
+        self.sync_interval = sync_interval
+        self.tau = tau
+
+    def after_batch_train(self):
+        if self.caller.result_data.acc_batch_idx % self.sync_interval == 0:
+            self.caller.model.sync_target(self.tau)
+
+
+class PriorityUpdateCallback(Callback):
+    """用本 batch 的 TD 误差更新优先经验回放的优先级"""
+
+    caller: "Trainer"
+
+    def __init__(self, buffer: PrioritizedBuffer):
+        super().__init__()
+        self.buffer = buffer
+
+    def after_batch_train(self):
+        batch = self.caller.batch_result_data.batch
+        td_errors = self.caller.batch_result_data.batch_result
+        self.buffer.update_priorities(batch["indices"].cpu().numpy(), td_errors.cpu().numpy())
+
+
 class DQNSolver(IsolatedSolver):
-    def __init__(self, *args):
-        pass
+    """
+    DQN 信号控制求解器。状态为 TrafficEnv 观测拼接有效相位 mask，所有路口共享同一 Q 网络，
+    solve_batch 一次前向推理完成所有路口的相位决策。
+    """
+
+    def __init__(self, num_lanes: int, num_phases: int, hidden_dim: int = 128, lr: float = 1e-3,
+                 gamma: float = 0.99, buffer_capacity: int = 100_000, batch_size: int = 256,
+                 sync_interval: int = 500, tau: float = 1.0, prioritized: bool = False,
+                 epsilon_start: float = 1.0, epsilon_end: float = 0.05, epsilon_decay: float = 0.95,
+                 device=None, seed: int | None = None):
+        self.num_lanes = num_lanes
+        self.num_phases = num_phases
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.tau = tau
+        self.epsilon = epsilon_start
+        self.epsilon_end = epsilon_end
+        self.epsilon_decay = epsilon_decay
+        self.device = torch.device(device) if device is not None else torch.device("cpu")
+        self.rng = np.random.default_rng(seed)
+
+        self.observation = ObservationBuilder(num_lanes, num_phases)
+        self.state_dim = self.observation.obs_dim + num_phases
+        self.q_network = QNetwork(self.state_dim, num_phases, hidden_dim).to(self.device)
+        self.train_model = DQNTrainModel(self.q_network, lr, gamma)
+        buffer_cls = PrioritizedBuffer if prioritized else RingBuffer
+        self.buffer = buffer_cls(buffer_capacity, seed=seed)
+
+    @staticmethod
+    def state(obs: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        return np.concatenate([obs, masks.astype(np.float32)], axis=1)
+
+    @torch.inference_mode()
+    def greedy(self, states: np.ndarray) -> np.ndarray:
+        self.q_network.eval()
+        q = self.q_network(torch.as_tensor(states, device=self.device))
+        return q.argmax(dim=1).cpu().numpy()
+
+    def epsilon_greedy(self, states: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        actions = self.greedy(states)
+        explore = self.rng.random(len(states)) < self.epsilon
+        random_actions = np.argmax(self.rng.random(masks.shape) * masks, axis=1)
+        return np.where(explore, random_actions, actions)
+
+    def learn(self, env: TrafficEnv, iterations: int, steps_per_iteration: int = 16,
+              updates_per_iteration: int = 16, callbacks=None) -> List[float]:
+        """
+        采集与更新交替进行，返回每轮迭代每个路口的平均单步奖励
+
+        Args:
+            env: 向量化环境，车道数与相位数需与求解器一致
+            iterations: 迭代轮数
+            steps_per_iteration: 每轮环境步数，每步写入 N 条样本
+            updates_per_iteration: 每轮参数更新次数
+            callbacks: 额外传给 Trainer 的回调
+        """
+        if (env.num_lanes, env.num_phases) != (self.num_lanes, self.num_phases):
+            raise ValueError("环境的车道数/相位数与求解器不一致")
+        trainer_callbacks = [TargetSyncCallback(self.sync_interval, self.tau)]
+        if isinstance(self.buffer, PrioritizedBuffer):
+            trainer_callbacks.append(PriorityUpdateCallback(self.buffer))
+        trainer = Trainer(model=self.train_model, device=self.device, callbacks=trainer_callbacks + (callbacks or []))
+
+        masks = env.phase_mask
+        states = self.state(env.reset(), masks)
+        history = []
+        for _ in range(iterations):
+            rewards_sum = 0.0
+            for _ in range(steps_per_iteration):
+                actions = self.epsilon_greedy(states, masks)
+                obs, rewards, terminated, truncated, info = env.step(actions)
+                # 缓冲区的 dones 只记录终止；截断样本的下一状态是截断时刻的观测，目标值照常自举
+                next_states = self.state(info.get("final_observation", obs), masks)
+                self.buffer.add_batch(states, actions, rewards, next_states, terminated)
+                states = self.state(obs, masks) if (terminated | truncated).any() else next_states
+                rewards_sum += rewards.mean()
+            history.append(rewards_sum / steps_per_iteration)
+            self.epsilon = max(self.epsilon_end, self.epsilon * self.epsilon_decay)
+
+            if self.buffer.size() >= self.batch_size:
+                loader = ReplayDataset(self.buffer, self.batch_size, updates_per_iteration).loader()
+                trainer.fit(train_loader=loader, epochs=1)
+        return history
 
     def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
               **kwargs) -> SignalSchema:
-        # todo 确认指标所在位置
-        return schema
+        return self.solve_batch([cross], indicators, [schema])[0]
+
+    def solve_batch(self, crosses: List[Cross], indicators: Indicator | List[Indicator],
+                    schemas: List[SignalSchema | None] | None = None) -> List[SignalSchema]:
+        """一次前向推理为所有路口选择下一相位，写入 running_phase/running_time"""
+        schemas = schemas or [None] * len(crosses)
+        obs, masks = self.observation(crosses, indicators, schemas)
+        actions = self.greedy(self.state(obs, masks))
+        return apply_phases(schemas, actions.tolist())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : env.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 基于排队模型的多路口向量化仿真环境，用于在 CPU 上训练强化学习信号控制求解器
+import copy
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from aitbox.models.signal.isolated.movement import entry_lanes, phase_lane_mask, schema_movements, schema_phases
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.road_network import Cross
+from aitbox.schemas.singal import SignalSchema, SignalSchemaType
+
+DEFAULT_NUM_PHASES = 4
+
+
+class TrafficEnv:
+    """
+    N 个路口同时仿真的向量化环境，所有状态为 (N, L) / (N, P) 的 NumPy 数组，一次 step 即一次批量运算。
+
+    每个决策步长 step_length 秒，动作为每个路口下一步显示的相位编号；未满足最小绿时忽略切换，
+    切换时先经过黄灯+全红的损失时间。车道排队按泊松到达、饱和流率放行的点排队模型更新。
+    观测为 [各车道排队, 当前相位 one-hot, 相位已运行时间]，奖励为负的 DELAY 或 QUEUE_LENGTH 指标。
+    排队模型没有终止状态，回合只会在 episode_length 处被截断（truncated），截断后自动 reset。
+    """
+
+    def __init__(
+        self,
+        phase_lane_mask: np.ndarray,
+        lane_mask: np.ndarray,
+        arrival_rate: np.ndarray,
+        saturation_flow: float | np.ndarray = 1800.0,
+        min_green: float | np.ndarray = 10.0,
+        transition: float | np.ndarray = 5.0,
+        phase_mask: np.ndarray | None = None,
+        step_length: float = 5.0,
+        episode_length: float = 3600.0,
+        reward_type: IndicatorType = IndicatorType.DELAY,
+        stochastic: bool = True,
+        lane_ids: List[List[str | int]] | None = None,
+        cross_ids: List[str | int] | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            phase_lane_mask: (N, P, L) 相位放行车道矩阵
+            lane_mask: (N, L) 有效车道
+            arrival_rate: (N, L) 到达率（veh/h）
+            saturation_flow: 每车道饱和流率（veh/h）
+            min_green: (N, P) 最小绿灯时间（s）
+            transition: (N, P) 相位结束后的黄灯+全红时间（s）
+            phase_mask: (N, P) 有效相位
+        """
+        if reward_type not in (IndicatorType.DELAY, IndicatorType.QUEUE_LENGTH):
+            raise ValueError(f"不支持的奖励指标: {reward_type}")
+        self.phase_lane_mask = np.asarray(phase_lane_mask, dtype=bool)
+        self.num_envs, self.num_phases, self.num_lanes = self.phase_lane_mask.shape
+        shape_np, shape_nl = (self.num_envs, self.num_phases), (self.num_envs, self.num_lanes)
+
+        self.lane_mask = np.asarray(lane_mask, dtype=bool)
+        self.arrival_rate = np.broadcast_to(np.asarray(arrival_rate, dtype=np.float64) / 3600, shape_nl)
+        self.saturation_flow = np.broadcast_to(np.asarray(saturation_flow, dtype=np.float64) / 3600, shape_nl)
+        self.min_green = np.broadcast_to(np.asarray(min_green, dtype=np.float64), shape_np)
+        self.transition = np.broadcast_to(np.asarray(transition, dtype=np.float64), shape_np)
+        self.phase_mask = (
+            self.phase_lane_mask.any(axis=2) if phase_mask is None else np.asarray(phase_mask, dtype=bool)
+        )
+        self.step_length = step_length
+        self.max_steps = int(np.ceil(episode_length / step_length))
+        self.reward_type = reward_type
+        self.stochastic = stochastic
+        self.lane_ids = lane_ids
+        self.cross_ids = cross_ids
+        self.rng = np.random.default_rng(seed)
+
+        self._index = np.arange(self.num_envs)
+        self.queue = np.zeros(shape_nl)
+        self.delay = np.zeros(shape_nl)
+        self.phase = np.zeros(self.num_envs, dtype=np.int64)
+        self.elapsed = np.zeros(self.num_envs)
+        self.lost_remaining = np.zeros(self.num_envs)
+        self.steps = 0
+
+    @classmethod
+    def from_crosses(
+        cls,
+        crosses: Sequence[Cross],
+        arrival_rates: Dict[str | int, float] | np.ndarray | float,
+        schemas: Sequence[SignalSchema | None] | None = None,
+        **kwargs,
+    ) -> "TrafficEnv":
+        """
+        由路口和信号方案构建环境，车道与相位按最大数量补齐。
+
+        Args:
+            crosses: 路口列表
+            arrival_rates: 按车道 id 的到达率字典、(N, L) 数组或统一值（veh/h）
+            schemas: 每个路口的信号方案，提供相位结构、最小绿与黄灯/全红；为 None 时使用默认四相位
+        """
+        schemas = schemas or [None] * len(crosses)
+        phases = [schema_phases(schema) for schema in schemas]
+        lanes = [entry_lanes(cross) for cross in crosses]
+        num_envs = len(crosses)
+        num_phases = max([len(p) or DEFAULT_NUM_PHASES for p in phases], default=DEFAULT_NUM_PHASES)
+        num_lanes = max([len(lane) for lane in lanes], default=0)
+
+        mask = np.zeros((num_envs, num_phases, num_lanes), dtype=bool)
+        lane_mask = np.zeros((num_envs, num_lanes), dtype=bool)
+        phase_mask = np.zeros((num_envs, num_phases), dtype=bool)
+        min_green = np.full((num_envs, num_phases), kwargs.pop("min_green", 10.0), dtype=np.float64)
+        transition = np.full((num_envs, num_phases), kwargs.pop("transition", 5.0), dtype=np.float64)
+        rates = np.zeros((num_envs, num_lanes))
+        lane_ids = []
+
+        for i, (cross, schema, cross_phases, cross_lanes) in enumerate(zip(crosses, schemas, phases, lanes)):
+            n_p, n_l = len(cross_phases) or DEFAULT_NUM_PHASES, len(cross_lanes)
+            # 与周期式求解器相同的车道-相位对应：按环与屏障位置
+            mask[i, :n_p, :n_l] = phase_lane_mask(cross, n_p, schema_movements(schema, n_p))
+            lane_mask[i, :n_l] = True
+            phase_mask[i, :n_p] = True
+            for j, phase in enumerate(cross_phases):
+                if getattr(phase, "min_green", None) is not None:
+                    min_green[i, j] = phase.min_green
+                if getattr(phase, "yellow", None) is not None:
+                    transition[i, j] = phase.yellow + getattr(phase, "all_red", 0)
+            ids = [lane.id for _, lane in cross_lanes]
+            lane_ids.append(ids)
+            if isinstance(arrival_rates, dict):
+                rates[i, :n_l] = [arrival_rates.get(lane_id, 0.0) for lane_id in ids]
+
+        if not isinstance(arrival_rates, dict):
+            rates = np.broadcast_to(np.asarray(arrival_rates, dtype=np.float64), rates.shape) * lane_mask
+
+        return cls(
+            phase_lane_mask=mask,
+            lane_mask=lane_mask,
+            arrival_rate=rates,
+            min_green=min_green,
+            transition=transition,
+            phase_mask=phase_mask,
+            lane_ids=lane_ids,
+            cross_ids=[cross.id for cross in crosses],
+            **kwargs,
+        )
+
+    @property
+    def observation_dim(self) -> int:
+        return self.num_lanes + self.num_phases + 1
+
+    def observation(self) -> np.ndarray:
+        """(N, L + P + 1) 观测"""
+        obs = np.zeros((self.num_envs, self.observation_dim), dtype=np.float32)
+        obs[:, :self.num_lanes] = self.queue
+        obs[self._index, self.num_lanes + self.phase] = 1.0
+        obs[:, -1] = self.elapsed
+        return obs
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.queue[:] = 0
+        self.delay[:] = 0
+        self.phase[:] = 0
+        self.elapsed[:] = 0
+        self.lost_remaining[:] = 0
+        self.steps = 0
+        return self.observation()
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Args:
+            actions: (N,) 下一步的相位编号
+
+        Returns:
+            obs, rewards (N,), terminated (N,), truncated (N,), info；info["indicators"] 为本步的
+            QUEUE_LENGTH/DELAY 数组，截断时 obs 为 reset 后的观测，截断时刻的观测在 info["final_observation"]
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        dt = self.step_length
+        current_min_green = self.min_green[self._index, self.phase]
+        switch = (
+            (actions != self.phase)
+            & (self.elapsed >= current_min_green)
+            & self.phase_mask[self._index, actions]
+        )
+        self.lost_remaining = np.where(switch, self.transition[self._index, self.phase], self.lost_remaining)
+        self.phase = np.where(switch, actions, self.phase)
+        self.elapsed = np.where(switch, 0.0, self.elapsed)
+
+        green = np.clip(dt - self.lost_remaining, 0.0, dt)
+        self.lost_remaining = np.maximum(self.lost_remaining - dt, 0.0)
+        served = self.phase_lane_mask[self._index, self.phase]
+
+        expected = self.arrival_rate * dt
+        arrivals = self.rng.poisson(expected) if self.stochastic else expected
+        arrivals = arrivals * self.lane_mask
+        capacity = self.saturation_flow * green[:, None] * served
+        queue_before = self.queue
+        available = queue_before + arrivals
+        departures = np.minimum(available, capacity)
+        self.queue = available - departures
+        self.delay = 0.5 * (queue_before + self.queue) * dt
+
+        self.elapsed += green
+        self.steps += 1
+
+        if self.reward_type == IndicatorType.DELAY:
+            rewards = -self.delay.sum(axis=1)
+        else:
+            rewards = -self.queue.sum(axis=1)
+        info = {
+            "indicators": {IndicatorType.QUEUE_LENGTH: self.queue.copy(), IndicatorType.DELAY: self.delay.copy()},
+            "departures": departures,
+        }
+
+        truncated = np.full(self.num_envs, self.steps >= self.max_steps)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        obs = self.observation()
+        if truncated.any():
+            info["final_observation"] = obs
+            obs = self.reset()
+        return obs, rewards.astype(np.float32), terminated, truncated, info
+
+    def indicators(self, index: int) -> List[Indicator]:
+        """第 index 个路口当前的车道级 QUEUE_LENGTH / DELAY 指标"""
+        lane_ids = self.lane_ids[index] if self.lane_ids is not None else list(range(self.num_lanes))
+        freq = f"{int(self.step_length)}s"
+        timestamp = int(self.steps * self.step_length)
+        result = []
+        for j, lane_id in enumerate(lane_ids):
+            result.append(Indicator(IndicatorType.QUEUE_LENGTH, lane_id, float(self.queue[index, j]), freq,
+                                    timestamp, "veh"))
+            result.append(Indicator(IndicatorType.DELAY, lane_id, float(self.delay[index, j]), freq,
+                                    timestamp, "veh*s"))
+        return result
+
+
+class ObservationBuilder:
+    """由实时 QUEUE_LENGTH 指标和运行状态构建与 TrafficEnv 一致的观测，进口车道 id 按 cross.id 缓存"""
+
+    def __init__(self, num_lanes: int, num_phases: int):
+        self.num_lanes = num_lanes
+        self.num_phases = num_phases
+        self.obs_dim = num_lanes + num_phases + 1
+        self._lane_ids: Dict[str | int, List[str | int]] = {}
+
+    def lane_ids(self, cross: Cross) -> List[str | int]:
+        lane_ids = self._lane_ids.get(cross.id)
+        if lane_ids is None:
+            lane_ids = [lane.id for _, lane in entry_lanes(cross)][:self.num_lanes]
+            self._lane_ids[cross.id] = lane_ids
+        return lane_ids
+
+    def __call__(self, crosses: Sequence[Cross], indicators: Indicator | List[Indicator],
+                 schemas: Sequence[SignalSchema | None]) -> tuple[np.ndarray, np.ndarray]:
+        """返回 (N, obs_dim) 观测与 (N, P) 相位 mask"""
+        if isinstance(indicators, Indicator):
+            indicators = [indicators]
+        queue = {i.source_id: i.value for i in indicators if i.type == IndicatorType.QUEUE_LENGTH}
+        obs = np.zeros((len(crosses), self.obs_dim), dtype=np.float32)
+        masks = np.zeros((len(crosses), self.num_phases), dtype=bool)
+        for n, (cross, schema) in enumerate(zip(crosses, schemas)):
+            lane_ids = self.lane_ids(cross)
+            obs[n, :len(lane_ids)] = [queue.get(lane_id, 0.0) for lane_id in lane_ids]
+            num_phases = len(schema_phases(schema)) or self.num_phases
+            if num_phases > self.num_phases:
+                raise ValueError(f"路口 {cross.id} 的方案有 {num_phases} 个相位，超过求解器的 {self.num_phases} 个")
+            if schema is not None and schema.running_phase and not 0 <= schema.running_phase[0] < num_phases:
+                raise ValueError(f"路口 {cross.id} 的运行相位 {schema.running_phase[0]} 超出相位数 {num_phases}")
+            masks[n, :num_phases] = True
+            if schema is not None and schema.running_phase:
+                obs[n, self.num_lanes + schema.running_phase[0]] = 1.0
+                obs[n, -1] = schema.running_time[0] if schema.running_time else 0
+            else:
+                obs[n, self.num_lanes] = 1.0
+        return obs, masks
+
+
+def apply_phases(schemas: Sequence[SignalSchema | None], actions: Sequence[int]) -> List[SignalSchema]:
+    """将决策的相位写入方案副本的 running_phase，相位不变时保留 running_time"""
+    result = []
+    for schema, action in zip(schemas, actions):
+        if schema is None:
+            result.append(SignalSchema(SignalSchemaType.ADAPTIVE, [], [action], [0]))
+            continue
+        schema = copy.copy(schema)
+        keep = bool(schema.running_phase) and schema.running_phase[0] == action
+        schema.running_phase = [action]
+        schema.running_time = [schema.running_time[0] if keep and schema.running_time else 0]
+        result.append(schema)
+    return result
@@ -6,19 +6,260 @@
 # @Date : 2026/1/19 20:54
 # Description: 基于IPPO的强化学习信号控制模式求解器
 
-from typing import List
+from typing import Dict, List
 
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.distributions import Categorical
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler
+
+from aitbox.engine.train.base import StepOutput, TrainModelBase
+from aitbox.engine.train.trainer import Trainer
+from aitbox.models.signal.isolated.adaptive.env import ObservationBuilder, TrafficEnv, apply_phases
 from aitbox.models.signal.isolated.base import IsolatedSolver
 from aitbox.schemas.indicator import Indicator
 from aitbox.schemas.road_network import Cross
 from aitbox.schemas.singal import SignalSchema
 
 
+class ActorCritic(nn.Module):
+    """所有路口共享参数的策略/价值网络，无效相位通过 mask 屏蔽"""
+
+    def __init__(self, obs_dim: int, num_actions: int, hidden_dim: int = 128):
+        super().__init__()
+        self.trunk = nn.Sequential(
+            nn.Linear(obs_dim, hidden_dim),
+            nn.Tanh(),
+            nn.Linear(hidden_dim, hidden_dim),
+            nn.Tanh(),
+        )
+        self.policy = nn.Linear(hidden_dim, num_actions)
+        self.value = nn.Linear(hidden_dim, 1)
+
+    def forward(self, obs: torch.Tensor, mask: torch.Tensor | None = None) -> tuple[torch.Tensor, torch.Tensor]:
+        hidden = self.trunk(torch.log1p(obs.clamp(min=0)))
+        logits = self.policy(hidden)
+        if mask is not None:
+            logits = logits.masked_fill(~mask, torch.finfo(logits.dtype).min)
+        return logits, self.value(hidden).squeeze(-1)
+
+
+class RolloutBuffer:
+    """预分配的 (T, N, ...) rollout 张量，GAE 在时间维倒序递推、在路口维整体向量化"""
+
+    def __init__(self, num_steps: int, num_envs: int, obs_dim: int, num_actions: int, device=None):
+        self.num_steps = num_steps
+        self.num_envs = num_envs
+        shape = (num_steps, num_envs)
+        self.obs = torch.zeros(*shape, obs_dim, device=device)
+        self.masks = torch.zeros(*shape, num_actions, dtype=torch.bool, device=device)
+        self.actions = torch.zeros(shape, dtype=torch.long, device=device)
+        self.logprobs = torch.zeros(shape, device=device)
+        self.rewards = torch.zeros(shape, device=device)
+        self.terminated = torch.zeros(shape, device=device)
+        self.truncated = torch.zeros(shape, device=device)
+        self.final_values = torch.zeros(shape, device=device)
+        self.values = torch.zeros(shape, device=device)
+        self.advantages = torch.zeros(shape, device=device)
+        self.returns = torch.zeros(shape, device=device)
+        self.step = 0
+
+    def add(self, obs, masks, actions, logprobs, rewards, terminated, values, truncated=None,
+            final_values=None) -> None:
+        """final_values 为截断时刻观测的价值，仅在 truncated 处使用"""
+        t = self.step
+        self.obs[t] = obs
+        self.masks[t] = masks
+        self.actions[t] = actions
+        self.logprobs[t] = logprobs
+        self.rewards[t] = torch.as_tensor(rewards, device=self.rewards.device)
+        self.terminated[t] = torch.as_tensor(terminated, dtype=torch.float32, device=self.terminated.device)
+        self.values[t] = values
+        if truncated is None:
+            self.truncated[t] = 0.0
+        else:
+            self.truncated[t] = torch.as_tensor(truncated, dtype=torch.float32, device=self.truncated.device)
+            self.final_values[t] = 0.0 if final_values is None else final_values
+        self.step += 1
+
+    def compute_gae(self, last_values: torch.Tensor, gamma: float, gae_lambda: float) -> None:
+        """
+        terminated[t] 表示第 t 步动作后进入终止状态，不再自举；truncated[t] 表示回合因时间上限被截断，
+        下一观测已属于新回合，改用截断时刻观测的价值 final_values[t] 自举，且优势不跨回合累积
+        """
+        gae = torch.zeros_like(last_values)
+        next_values = last_values
+        for t in reversed(range(self.num_steps)):
+            not_terminated = 1.0 - self.terminated[t]
+            bootstrap = torch.where(self.truncated[t] > 0, self.final_values[t], next_values)
+            delta = self.rewards[t] + gamma * bootstrap * not_terminated - self.values[t]
+            gae = delta + gamma * gae_lambda * not_terminated * (1.0 - self.truncated[t]) * gae
+            self.advantages[t] = gae
+            next_values = self.values[t]
+        self.returns = self.advantages + self.values
+        self.step = 0
+
+    def flatten(self) -> Dict[str, torch.Tensor]:
+        size = self.num_steps * self.num_envs
+        return {
+            "obs": self.obs.reshape(size, -1),
+            "masks": self.masks.reshape(size, -1),
+            "actions": self.actions.reshape(size),
+            "logprobs": self.logprobs.reshape(size),
+            "advantages": self.advantages.reshape(size),
+            "returns": self.returns.reshape(size),
+        }
+
+
+class RolloutDataset(Dataset):
+    """按索引批量取数的 rollout 数据集，配合 BatchSampler 一次取出整个 minibatch"""
+
+    def __init__(self, data: Dict[str, torch.Tensor]):
+        self.data = data
+        self.size = len(next(iter(data.values())))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index) -> Dict[str, torch.Tensor]:
+        index = torch.as_tensor(index)
+        return {k: v[index] for k, v in self.data.items()}
+
+    def loader(self, batch_size: int) -> DataLoader:
+        sampler = BatchSampler(RandomSampler(self), batch_size=batch_size, drop_last=False)
+        return DataLoader(self, sampler=sampler, batch_size=None)
+
+
+class IPPOTrainModel(TrainModelBase):
+    """PPO 裁剪目标，由 Trainer 驱动 minibatch 更新"""
+
+    def __init__(self, model: ActorCritic, lr: float = 3e-4, clip_eps: float = 0.2,
+                 value_coef: float = 0.5, entropy_coef: float = 0.01):
+        self.lr = lr
+        self.clip_eps = clip_eps
+        self.value_coef = value_coef
+        self.entropy_coef = entropy_coef
+        super().__init__(model)
+        self.optimizer = None
+
+    def train_step(self, batch: Dict[str, torch.Tensor]) -> StepOutput:
+        prediction = self.model(batch["obs"], batch["masks"])
+        loss = self.compute_loss(prediction, batch)
+        return StepOutput(loss, prediction)
+
+    @torch.no_grad()
+    def validate_step(self, batch: Dict[str, torch.Tensor]) -> StepOutput:
+        return self.train_step(batch)
+
+    def configure_criterion(self) -> nn.Module:
+        return nn.MSELoss()
+
+    def configure_optimizer(self) -> torch.optim.Optimizer:
+        """每轮迭代都会重新 fit，优化器只创建一次以保留 Adam 状态"""
+        if self.optimizer is None:
+            self.optimizer = torch.optim.Adam(self.model.parameters(), lr=self.lr)
+        return self.optimizer
+
+    def compute_loss(self, prediction, ground_truth: Dict[str, torch.Tensor], *args, **kwargs):
+        logits, values = prediction
+        dist = Categorical(logits=logits)
+        logprobs = dist.log_prob(ground_truth["actions"])
+        advantages = ground_truth["advantages"]
+        advantages = (advantages - advantages.mean()) / (advantages.std(unbiased=False) + 1e-8)
+
+        ratio = torch.exp(logprobs - ground_truth["logprobs"])
+        clipped = torch.clamp(ratio, 1 - self.clip_eps, 1 + self.clip_eps)
+        policy_loss = -torch.min(ratio * advantages, clipped * advantages).mean()
+        value_loss = self.criterion(values, ground_truth["returns"])
+        entropy = dist.entropy().mean()
+        return policy_loss + self.value_coef * value_loss - self.entropy_coef * entropy
+
+
 class IPPOSolver(IsolatedSolver):
-    def __init__(self, *args):
-        pass
+    """
+    独立 PPO：一个共享参数的策略同时为所有路口决策。
+
+    观测与 TrafficEnv 一致：[各进口车道排队长度, 当前相位 one-hot, 当前相位已运行时间]。
+    """
+
+    def __init__(self, num_lanes: int, num_phases: int, hidden_dim: int = 128, lr: float = 3e-4,
+                 gamma: float = 0.99, gae_lambda: float = 0.95, clip_eps: float = 0.2,
+                 value_coef: float = 0.5, entropy_coef: float = 0.01, device=None):
+        self.num_lanes = num_lanes
+        self.num_phases = num_phases
+        self.obs_dim = num_lanes + num_phases + 1
+        self.gamma = gamma
+        self.gae_lambda = gae_lambda
+        self.device = torch.device(device) if device is not None else torch.device("cpu")
+        self.policy = ActorCritic(self.obs_dim, num_phases, hidden_dim).to(self.device)
+        self.train_model = IPPOTrainModel(self.policy, lr, clip_eps, value_coef, entropy_coef)
+        self.observation = ObservationBuilder(num_lanes, num_phases)
+
+    @torch.no_grad()
+    def act(self, obs: torch.Tensor, masks: torch.Tensor, deterministic: bool = False):
+        logits, values = self.policy(obs, masks)
+        if deterministic:
+            return logits.argmax(dim=-1), None, values
+        dist = Categorical(logits=logits)
+        actions = dist.sample()
+        return actions, dist.log_prob(actions), values
+
+    def collect(self, env: TrafficEnv, buffer: RolloutBuffer, obs: np.ndarray) -> np.ndarray:
+        """采集 buffer.num_steps 步的 rollout 并计算 GAE，返回最后的观测"""
+        masks = torch.as_tensor(env.phase_mask, device=self.device)
+        self.policy.eval()
+        for _ in range(buffer.num_steps):
+            obs_tensor = torch.as_tensor(obs, device=self.device)
+            actions, logprobs, values = self.act(obs_tensor, masks)
+            next_obs, rewards, terminated, truncated, info = env.step(actions.cpu().numpy())
+            final_values = None
+            if truncated.any():
+                _, _, final_values = self.act(torch.as_tensor(info["final_observation"], device=self.device), masks)
+            buffer.add(obs_tensor, masks, actions, logprobs, rewards, terminated, values, truncated, final_values)
+            obs = next_obs
+        _, _, last_values = self.act(torch.as_tensor(obs, device=self.device), masks)
+        buffer.compute_gae(last_values, self.gamma, self.gae_lambda)
+        return obs
+
+    def learn(self, env: TrafficEnv, iterations: int, rollout_steps: int = 128, ppo_epochs: int = 4,
+              batch_size: int = 1024, callbacks=None) -> List[float]:
+        """
+        rollout 采集与 PPO 更新交替进行，返回每轮迭代每个路口的平均单步奖励
+
+        Args:
+            env: 向量化环境，车道数与相位数需与求解器一致
+            iterations: 迭代轮数
+            rollout_steps: 每轮采集的步数
+            ppo_epochs: 每轮对 rollout 的训练遍数
+            batch_size: minibatch 大小
+            callbacks: 传给 Trainer 的回调
+        """
+        if (env.num_lanes, env.num_phases) != (self.num_lanes, self.num_phases):
+            raise ValueError("环境的车道数/相位数与求解器不一致")
+        buffer = RolloutBuffer(rollout_steps, env.num_envs, self.obs_dim, self.num_phases, self.device)
+        trainer = Trainer(model=self.train_model, device=self.device, callbacks=callbacks)
+
+        history = []
+        obs = env.reset()
+        for _ in range(iterations):
+            obs = self.collect(env, buffer, obs)
+            history.append(buffer.rewards.mean().item())
+            loader = RolloutDataset(buffer.flatten()).loader(batch_size)
+            trainer.fit(train_loader=loader, epochs=ppo_epochs)
+        return history
 
     def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
               **kwargs) -> SignalSchema:
-        # todo 确认指标所在位置
-        return schema
+        return self.solve_batch([cross], indicators, [schema])[0]
+
+    def solve_batch(self, crosses: List[Cross], indicators: Indicator | List[Indicator],
+                    schemas: List[SignalSchema | None] | None = None) -> List[SignalSchema]:
+        """一次前向推理为所有路口选择下一相位，写入 running_phase/running_time"""
+        schemas = schemas or [None] * len(crosses)
+        obs, masks = self.observation(crosses, indicators, schemas)
+        self.policy.eval()
+        actions, _, _ = self.act(
+            torch.as_tensor(obs, device=self.device), torch.as_tensor(masks, device=self.device), True
+        )
+        return apply_phases(schemas, actions.tolist())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : prioritized_buffer.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 基于 sum-tree 的优先经验回放缓冲区
+from dataclasses import dataclass
+
+from typing import Tuple
+
+import numpy as np
+
+from aitbox.models.signal.isolated.adaptive.buffer import RingBuffer
+
+
+class SumTree:
+    """数组实现的 sum-tree/min-tree，所有操作按批向量化，单次更新与采样复杂度为 O(log n)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.depth = max(int(np.ceil(np.log2(capacity))), 0)
+        self.num_leaves = 1 << self.depth
+        self.sum_tree = np.zeros(2 * self.num_leaves, dtype=np.float64)
+        self.min_tree = np.full(2 * self.num_leaves, np.inf, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return self.sum_tree[1]
+
+    @property
+    def min(self) -> float:
+        return self.min_tree[1]
+
+    def update(self, index: np.ndarray, priorities: np.ndarray) -> None:
+        """设置叶子优先级，并逐层向上重算父节点"""
+        node = np.asarray(index, dtype=np.int64) + self.num_leaves
+        self.sum_tree[node] = priorities
+        self.min_tree[node] = priorities
+        for _ in range(self.depth):
+            node = np.unique(node >> 1)
+            left, right = node << 1, (node << 1) + 1
+            self.sum_tree[node] = self.sum_tree[left] + self.sum_tree[right]
+            self.min_tree[node] = np.minimum(self.min_tree[left], self.min_tree[right])
+
+    def find(self, targets: np.ndarray) -> np.ndarray:
+        """找到前缀和首次超过 targets 的叶子位置"""
+        node = np.ones(len(targets), dtype=np.int64)
+        targets = np.array(targets, dtype=np.float64)
+        for _ in range(self.depth):
+            left = node << 1
+            left_sum = self.sum_tree[left]
+            go_right = targets > left_sum
+            targets -= np.where(go_right, left_sum, 0.0)
+            node = left + go_right
+        return node - self.num_leaves
+
+    def get(self, index: np.ndarray) -> np.ndarray:
+        return self.sum_tree[np.asarray(index, dtype=np.int64) + self.num_leaves]
+
+
+@dataclass
+class PrioritizedBuffer(RingBuffer):
+    """优先经验回放 (PER)：按 p^alpha 分层采样，并返回重要性采样权重"""
+    alpha: float = 0.6
+    beta: float = 0.4
+    beta_increment: float = 0.0
+    eps: float = 1e-6
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.tree = SumTree(self.capacity)
+        self.max_priority = 1.0
+
+    def add_batch(self, states: np.ndarray, actions: np.ndarray,
+                  rewards: np.ndarray, next_states: np.ndarray, dones: np.ndarray) -> None:
+        """批量添加样本，新样本使用当前最大优先级以保证至少被采样一次"""
+        index = self._store(states, actions, rewards, next_states, dones)
+        self.tree.update(index, np.full(len(index), self.max_priority ** self.alpha))
+
+    def sample(self, batch_size: int) -> Tuple[np.ndarray, ...]:
+        """分层采样，返回 (states, actions, rewards, next_states, dones, weights, indices)"""
+        batch_size = min(batch_size, self.count)
+        total = self.tree.total
+        segment = total / max(batch_size, 1)
+        targets = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        index = np.minimum(self.tree.find(np.minimum(targets, np.nextafter(total, 0))), self.count - 1)
+
+        priorities = self.tree.get(index)
+        weights = (priorities / self.tree.min) ** -self.beta
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self._gather(index, weights.astype(np.float32), index)
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        """根据 TD 误差更新优先级"""
+        indices = np.asarray(indices).reshape(-1)
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64).reshape(-1)) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max(initial=0.0)))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def clear(self) -> None:
+        """清空缓冲区与优先级"""
+        super().clear()
+        self.tree = SumTree(self.capacity)
+        self.max_priority = 1.0
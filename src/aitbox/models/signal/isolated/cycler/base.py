@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : base.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 周期式信号配时求解器的公共流程：指标 -> 车道流量比 -> 关键流量比 -> 周期 -> 绿信比
+import abc
+import dataclasses
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.models.signal.isolated.base import IsolatedSolver
+from aitbox.models.signal.isolated.cycler.evaluator import TimingEvaluation, average_delay, evaluate, plan_timings
+from aitbox.models.signal.isolated.movement import (
+    DEFAULT_PHASE_MOVEMENTS,
+    entry_lanes,
+    phase_lane_mask,
+    ring_barrier_movements,
+    sequential_movements,
+)
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.indicator_store import IndicatorStore
+from aitbox.schemas.road_network import BranchType, Cross, LaneTurnType
+from aitbox.schemas.singal import CyclerPhase, CyclerSignalSchema, PhaseType, Ring, SignalSchema, SignalSchemaType
+
+
+class LanePhaseMapping(NamedTuple):
+    """路口进口车道与相位的对应关系，按路口缓存"""
+    lane_index: Dict[str, int]  # 车道 id -> 车道列位置
+    branch_lanes: Dict[str, np.ndarray]  # 进口道 id -> 其车道列位置
+    mask: np.ndarray  # (num_phases, num_lanes) 相位是否放行该车道
+
+
+class CyclerSolver(IsolatedSolver):
+    """
+    周期式求解器基类。子类只需实现 calc_cycle，绿信比按各相位关键流量比分配。
+
+    指标可按车道或进口道给出：VOLUME 为流量（veh/h），按饱和流率换算为流量比，进口道流量均分到其车道；
+    SATURATION 直接作为流量比。同一对象上车道级指标覆盖进口道级指标，SATURATION 覆盖 VOLUME。
+    """
+
+    def __init__(self, min_cycle: int = 50, max_cycle: int = 180, saturation_flow: float = 1800.0,
+                 num_phases: int = 4, min_green: int = 10, max_green: int = 60, yellow: int = 3,
+                 all_red: int = 2, start_up_loss: int = 3,
+                 phase_movements: Sequence[Tuple[str, LaneTurnType]] = DEFAULT_PHASE_MOVEMENTS):
+        self.min_cycle = min_cycle
+        self.max_cycle = max_cycle
+        self.saturation_flow = saturation_flow
+        self.num_phases = num_phases
+        self.min_green = min_green
+        self.max_green = max_green
+        self.yellow = yellow
+        self.all_red = all_red
+        self.start_up_loss = start_up_loss
+        self.phase_movements = phase_movements
+        self._mappings: Dict[Tuple[str | int, tuple], LanePhaseMapping] = {}
+
+    def lane_phase_mapping(self, cross: Cross, rings: Sequence[Ring] | int) -> LanePhaseMapping:
+        """
+        相位放行的流向按环与屏障位置确定（见 ring_barrier_movements）；rings 为整数时视为该数量相位的单环无屏障方案。
+        每个路口每种相位结构只构建一次，路口渠化变化后需调用 clear_cache
+        """
+        if isinstance(rings, int):
+            movements = tuple(sequential_movements(rings, self.phase_movements))
+        else:
+            movements = tuple(ring_barrier_movements(rings, self.phase_movements))
+        key = (cross.id, movements)
+        mapping = self._mappings.get(key)
+        if mapping is None:
+            lanes = [lane for _, lane in entry_lanes(cross)]
+            lane_index = {lane.id: i for i, lane in enumerate(lanes)}
+            branch_lanes = {
+                branch.id: np.array([lane_index[lane.id] for lane in branch.lane if lane.id in lane_index],
+                                    dtype=np.int64)
+                for branch in cross.branch if branch.type == BranchType.IN
+            }
+            mask = phase_lane_mask(cross, len(movements), movements)
+            mapping = self._mappings[key] = LanePhaseMapping(lane_index, branch_lanes, mask)
+        return mapping
+
+    def clear_cache(self) -> None:
+        self._mappings.clear()
+
+    def default_phases(self) -> List[CyclerPhase]:
+        return [
+            CyclerPhase(i, PhaseType.NORMAL, self.min_green, self.min_green, self.max_green, 0, self.yellow,
+                        self.all_red, self.start_up_loss, i // 2)
+            for i in range(self.num_phases)
+        ]
+
+    def flow_ratios(self, mapping: LanePhaseMapping,
+                    indicators: Indicator | List[Indicator] | IndicatorStore) -> np.ndarray:
+        """各进口车道的流量比 y = q / s"""
+        if isinstance(indicators, Indicator):
+            indicators = [indicators]
+        if isinstance(indicators, IndicatorStore):
+            entries = self._latest_entries(mapping, indicators)
+        else:
+            entries = ((i.source_id, i.type, i.value) for i in indicators)
+        y = np.zeros(len(mapping.lane_index), dtype=np.float64)
+        # 进口道级先写、车道级后写；同级内 SATURATION 后写
+        order = {
+            (False, IndicatorType.VOLUME): 0, (False, IndicatorType.SATURATION): 1,
+            (True, IndicatorType.VOLUME): 2, (True, IndicatorType.SATURATION): 3,
+        }
+        updates = []
+        for source_id, indicator_type, value in entries:
+            if source_id in mapping.lane_index:
+                index, is_lane = np.array([mapping.lane_index[source_id]]), True
+            elif source_id in mapping.branch_lanes:
+                index, is_lane = mapping.branch_lanes[source_id], False
+            else:
+                continue
+            rank = order.get((is_lane, indicator_type))
+            if rank is not None and len(index):
+                updates.append((rank, indicator_type, index, float(value)))
+
+        for _, indicator_type, index, value in sorted(updates, key=lambda u: u[0]):
+            if indicator_type == IndicatorType.VOLUME:
+                y[index] = value / len(index) / self.saturation_flow
+            else:
+                y[index] = value
+        return y
+
+    @staticmethod
+    def _latest_entries(mapping: LanePhaseMapping, store: IndicatorStore) -> List[Tuple[str | int, IndicatorType, float]]:
+        """列式指标库中各车道/进口道最新的 VOLUME 与 SATURATION，不构造 Indicator 对象"""
+        source_ids = list(mapping.lane_index) + list(mapping.branch_lanes)
+        entries = []
+        for indicator_type in (IndicatorType.VOLUME, IndicatorType.SATURATION):
+            values = store.latest(indicator_type, source_ids)
+            entries.extend(
+                (source_ids[k], indicator_type, values[k]) for k in np.flatnonzero(~np.isnan(values))
+            )
+        return entries
+
+    @staticmethod
+    def critical_flow_ratios(mask: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """每个相位放行车道中的最大流量比"""
+        return np.where(mask, y, 0.0).max(axis=1, initial=0.0)
+
+    @staticmethod
+    def lost_times(phases: Sequence[CyclerPhase]) -> np.ndarray:
+        """相位损失时间 = 启动损失 + 全红（黄灯视为有效绿灯）"""
+        return np.array([phase.start_up_loss + phase.all_red for phase in phases], dtype=np.float64)
+
+    def cycle_bounds(self, schema: SignalSchema | None) -> Tuple[int, int]:
+        if isinstance(schema, CyclerSignalSchema):
+            return schema.min_cycle, schema.max_cycle
+        return self.min_cycle, self.max_cycle
+
+    @abc.abstractmethod
+    def calc_cycle(self, lost: np.ndarray, y: np.ndarray, schema: SignalSchema | None = None) -> int:
+        """step1: 计算路口周期"""
+        ...
+
+    @staticmethod
+    def allocate_green_split(cycle: int, lost: np.ndarray, y: np.ndarray,
+                             phases: Sequence[CyclerPhase]) -> np.ndarray:
+        """
+        step2: 按关键流量比分配有效绿灯 g_i = (C - ΣL) * y_i / ΣY，换算为显示绿灯 G_i = g_i + l_i - 黄灯 - 全红，
+        并限制在 [min_green, max_green]
+        """
+        sum_y = y.sum()
+        share = y / sum_y if sum_y > 0 else np.full(len(y), 1.0 / max(len(y), 1))
+        effective = max(cycle - lost.sum(), 0.0) * share
+        clearance = np.array([phase.yellow + phase.all_red for phase in phases], dtype=np.float64)
+        green = np.rint(effective + lost - clearance)
+        min_green = np.array([phase.min_green for phase in phases], dtype=np.float64)
+        max_green = np.array([phase.max_green for phase in phases], dtype=np.float64)
+        return np.clip(green, min_green, max_green).astype(np.int64)
+
+    @staticmethod
+    def fit_cycle(greens: np.ndarray, phases: Sequence[CyclerPhase], cycle: int,
+                  weights: np.ndarray | None = None) -> np.ndarray:
+        """
+        在 [min_green, max_green] 内增减绿灯使环长等于给定周期：差值按 weights（默认均分）分给尚有余量的相位，
+        不足 1 秒的余数按权重从大到小逐秒分配。所有相位都到达边界时无法补齐，环长与周期不等
+        """
+        greens = np.asarray(greens, dtype=np.int64).copy()
+        low = np.array([phase.min_green for phase in phases], dtype=np.int64)
+        high = np.array([phase.max_green for phase in phases], dtype=np.int64)
+        weights = np.ones(len(greens)) if weights is None else np.asarray(weights, dtype=np.float64)
+        diff = cycle - int(greens.sum()) - sum(phase.yellow + phase.all_red for phase in phases)
+        while diff != 0:
+            sign = 1 if diff > 0 else -1
+            room = np.maximum(high - greens if sign > 0 else greens - low, 0)
+            free = room > 0
+            if not free.any():
+                break
+            w = np.where(free, weights, 0.0)
+            w = w if w.sum() > 0 else free.astype(np.float64)
+            step = np.minimum(np.floor(abs(diff) * w / w.sum()).astype(np.int64), room)
+            if not step.any():
+                order = np.argsort(-w, kind="stable")[:abs(diff)]
+                step[order[free[order]]] = 1
+            greens += sign * step
+            diff -= sign * int(step.sum())
+        return greens
+
+    def phase_flows(self, cross: Cross, indicators: Indicator | List[Indicator] | IndicatorStore,
+                    rings: Sequence[Ring]) -> np.ndarray:
+        """各相位需求，取关键车道流量 q = y * s（veh/h），相位按环内顺序展平"""
+        mapping = self.lane_phase_mapping(cross, rings)
+        critical = self.critical_flow_ratios(mapping.mask, self.flow_ratios(mapping, indicators))
+        return critical * self.saturation_flow
+
+    def evaluate(self, cross: Cross, indicators: Indicator | List[Indicator] | IndicatorStore,
+                 schemas: Sequence[CyclerSignalSchema], model: str = "hcm") -> TimingEvaluation:
+        """
+        一次评价同一相位结构的多个候选方案，各相位需求见 phase_flows
+
+        Returns:
+            (K, P) 的通行能力、饱和度、延误与剩余排队，相位按环内顺序展平
+        """
+        flow = self.phase_flows(cross, indicators, schemas[0].rings)
+        return evaluate(plan_timings(schemas), flow, self.saturation_flow, model)
+
+    def cycle_delays(self, cross: Cross, indicators: Indicator | List[Indicator] | IndicatorStore,
+                     schema: SignalSchema | None, cycles: Sequence[int],
+                     model: str = "hcm") -> Tuple[List[CyclerSignalSchema], np.ndarray]:
+        """
+        按各候选周期生成方案（绿信比分配同 solve），一次 evaluate 评价全部方案
+
+        Returns:
+            各候选周期的方案，及其路口总延误（各相位关键车道流量 × 延误之和，veh·s/h）
+        """
+        plans = [self.solve(cross, indicators, schema, cycle=int(cycle)) for cycle in cycles]
+        flow = self.phase_flows(cross, indicators, plans[0].rings)
+        evaluation = evaluate(plan_timings(plans), flow, self.saturation_flow, model)
+        return plans, average_delay(evaluation, flow) * flow.sum()
+
+    def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
+              cycle: int | Sequence[int] | None = None, **kwargs) -> CyclerSignalSchema:
+        """
+        绿灯按流量比分配并限制在 [min_green, max_green] 后，再按流量比增减补齐到周期。
+        最小绿等约束使某个环无法压缩到周期内时，方案周期放宽为最长的环长。
+
+        Args:
+            cycle: 指定公共周期（如协调控制子区），此时跳过 calc_cycle；给出多个候选周期时
+                经 cycle_delays 评价，返回路口总延误最小的方案
+        """
+        if cycle is not None and np.ndim(cycle) > 0:
+            plans, delay = self.cycle_delays(cross, indicators, schema, cycle)
+            return plans[int(np.argmin(delay))]
+        rings = schema.rings if schema is not None else []
+        if not rings or not all(isinstance(phase, CyclerPhase) for ring in rings for phase in ring.phases):
+            rings = [Ring(self.default_phases())]
+        mapping = self.lane_phase_mapping(cross, rings)
+        critical = self.critical_flow_ratios(mapping.mask, self.flow_ratios(mapping, indicators))
+
+        # 多环时各环共用周期，取各环所需周期的最大值
+        bounds = np.cumsum([0] + [len(ring.phases) for ring in rings])
+        lost = [self.lost_times(ring.phases) for ring in rings]
+        y = [critical[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        if cycle is None:
+            cycle = max(self.calc_cycle(l, y_ring, schema) for l, y_ring in zip(lost, y))
+
+        new_rings, ring_cycles = [], []
+        for ring, l, y_ring in zip(rings, lost, y):
+            greens = self.allocate_green_split(cycle, l, y_ring, ring.phases)
+            greens = self.fit_cycle(greens, ring.phases, cycle, y_ring)
+            phases = [dataclasses.replace(phase, green=int(green)) for phase, green in zip(ring.phases, greens)]
+            new_rings.append(Ring(phases))
+            ring_cycles.append(sum(phase.green + phase.yellow + phase.all_red for phase in phases))
+
+        min_cycle, max_cycle = self.cycle_bounds(schema)
+        keep_running = schema is not None and len(schema.running_phase) == len(new_rings)
+        return CyclerSignalSchema(
+            type=SignalSchemaType.CYCLER,
+            rings=new_rings,
+            running_phase=list(schema.running_phase) if keep_running else [0] * len(new_rings),
+            running_time=list(schema.running_time) if keep_running else [0] * len(new_rings),
+            cycle=int(max(cycle, *ring_cycles)),
+            min_cycle=min_cycle,
+            max_cycle=max_cycle,
+            phase_offset=schema.phase_offset if isinstance(schema, CyclerSignalSchema) else 0,
+        )
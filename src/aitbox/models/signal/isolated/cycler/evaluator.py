@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : evaluator.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 周期式配时方案的向量化评价：通行能力、饱和度、延误（Webster / HCM）、剩余排队
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.singal import CyclerPhase, CyclerSignalSchema
+
+
+class PlanTimings(NamedTuple):
+    """K 个候选方案的周期与各相位有效绿灯，相位按环内顺序展平"""
+    cycle: np.ndarray  # (K,) 周期（秒）
+    effective_green: np.ndarray  # (K, P) 有效绿灯（秒）
+
+
+class TimingEvaluation(NamedTuple):
+    """各方案各相位的评价结果，形状为 flow / saturation_flow 与 (K, P) 广播后的形状"""
+    capacity: np.ndarray  # 通行能力 c = s * g / C（veh/h）
+    degree_of_saturation: np.ndarray  # 饱和度 x = q / c
+    delay: np.ndarray  # 平均控制延误（s/veh）
+    residual_queue: np.ndarray  # 分析时段末的剩余排队（veh）
+
+
+def effective_green(phase: CyclerPhase) -> float:
+    """有效绿灯 g = G + 黄灯 + 全红 - (启动损失 + 全红)，与 CyclerSolver.lost_times 一致"""
+    return phase.green + phase.yellow - phase.start_up_loss
+
+
+def plan_timings(schemas: Sequence[CyclerSignalSchema]) -> PlanTimings:
+    """将多个候选方案整理为数组；各方案的相位数需一致"""
+    greens = [[effective_green(phase) for ring in schema.rings for phase in ring.phases] for schema in schemas]
+    if len({len(g) for g in greens}) > 1:
+        raise ValueError("候选方案的相位数不一致")
+    return PlanTimings(
+        np.array([schema.cycle for schema in schemas], dtype=np.float64),
+        np.array(greens, dtype=np.float64).reshape(len(schemas), -1),
+    )
+
+
+def webster_delay(cycle: np.ndarray, green_ratio: np.ndarray, x: np.ndarray, flow: np.ndarray) -> np.ndarray:
+    """
+    Webster 延误 d = C(1-λ)² / (2(1-λx)) + x² / (2q(1-x)) - 0.65 (C/q²)^(1/3) x^(2+5λ)，q 以 veh/s 计；
+    x >= 1 时公式失效，返回 inf
+    """
+    q = flow / 3600.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        uniform = cycle * (1 - green_ratio) ** 2 / (2 * (1 - green_ratio * x))
+        random = np.where(q > 0, x ** 2 / (2 * q * (1 - x)), 0.0)
+        correction = np.where(q > 0, 0.65 * np.cbrt(cycle / q ** 2) * x ** (2 + 5 * green_ratio), 0.0)
+        delay = np.maximum(uniform + random - correction, 0.0)
+    return np.where(x < 1, delay, np.inf)
+
+
+def hcm_delay(cycle: np.ndarray, green_ratio: np.ndarray, x: np.ndarray, capacity: np.ndarray,
+              period: float = 0.25, k: float = 0.5, upstream: float = 1.0) -> np.ndarray:
+    """
+    HCM 控制延误 d = d1 + d2（不计初始排队 d3，PF = 1）：
+    d1 = 0.5 C (1-λ)² / (1 - min(1, x) λ)，d2 = 900 T [(x-1) + sqrt((x-1)² + 8 k I x / (c T))]，T 以小时计
+    """
+    uniform = 0.5 * cycle * (1 - green_ratio) ** 2 / (1 - np.minimum(x, 1.0) * green_ratio)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        incremental = 900 * period * ((x - 1) + np.sqrt((x - 1) ** 2 + 8 * k * upstream * x / (capacity * period)))
+    return uniform + np.where(capacity > 0, incremental, np.inf)
+
+
+def evaluate(
+    timings: PlanTimings,
+    flow: np.ndarray,
+    saturation_flow: np.ndarray | float = 1800.0,
+    model: str = "hcm",
+    period: float = 0.25,
+) -> TimingEvaluation:
+    """
+    同时评价所有候选方案的所有相位，flow / saturation_flow 与 (K, P) 按 NumPy 规则广播，
+    例如 (P,) 为所有方案共用的需求，(S, 1, P) 为 S 个需求场景。
+
+    Args:
+        timings: 候选方案，见 plan_timings
+        flow: 各相位关键车道流量（veh/h）
+        saturation_flow: 各相位关键车道饱和流率（veh/h）
+        model: "hcm" 或 "webster"
+        period: 分析时段（小时），用于 HCM 增量延误与剩余排队
+    """
+    if model not in ("hcm", "webster"):
+        raise ValueError(f"未知的延误模型: {model}")
+    cycle = timings.cycle[:, None]
+    green_ratio = np.clip(timings.effective_green / cycle, 0.0, 1.0)
+    flow = np.asarray(flow, dtype=np.float64)
+    capacity = np.asarray(saturation_flow, dtype=np.float64) * green_ratio
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.where(capacity > 0, flow / capacity, np.where(flow > 0, np.inf, 0.0))
+    if model == "webster":
+        delay = webster_delay(cycle, green_ratio, x, flow)
+    else:
+        delay = hcm_delay(cycle, green_ratio, x, capacity, period)
+    shape = np.broadcast_shapes(flow.shape, capacity.shape)
+    return TimingEvaluation(
+        np.broadcast_to(capacity, shape),
+        np.broadcast_to(x, shape),
+        np.broadcast_to(delay, shape),
+        np.broadcast_to(np.maximum(flow - capacity, 0.0) * period, shape),
+    )
+
+
+def average_delay(evaluation: TimingEvaluation, flow: np.ndarray) -> np.ndarray:
+    """按流量加权的路口平均延误（s/veh），在最后一维（相位）上聚合"""
+    flow = np.broadcast_to(np.asarray(flow, dtype=np.float64), evaluation.delay.shape)
+    total = flow.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted = np.where(flow > 0, flow * evaluation.delay, 0.0).sum(axis=-1)
+        return np.where(total > 0, weighted / total, 0.0)
+
+
+def to_indicators(
+    evaluation: TimingEvaluation,
+    source_ids: Sequence[str | int],
+    freq: str,
+    timestamp: None | str | int = None,
+    plan: int = 0,
+) -> List[Indicator]:
+    """取出一个方案各相位的 DELAY、CAPACITY、DEGREE_OF_SATURATION 指标"""
+    columns = [
+        (IndicatorType.DELAY, evaluation.delay, "s"),
+        (IndicatorType.CAPACITY, evaluation.capacity, "veh/h"),
+        (IndicatorType.DEGREE_OF_SATURATION, evaluation.degree_of_saturation, None),
+    ]
+    if evaluation.delay.ndim != 2:
+        raise ValueError("仅支持 (K, P) 形状的评价结果")
+    n = len(source_ids)
+    return Indicator.from_arrays(
+        [t for t, _, _ in columns for _ in range(n)],
+        list(source_ids) * len(columns),
+        np.concatenate([values[plan] for _, values, _ in columns]),
+        freq,
+        [timestamp] * (n * len(columns)),
+        [unit for _, _, unit in columns for _ in range(n)],
+    )
@@ -4,29 +4,21 @@
 # @File : simple_solver.py
 # @Author : run
 # @Date : 2026/1/18 20:43
-from typing import List
+import numpy as np
 
-from aitbox.models.signal.isolated.base import IsolatedSolver
-from aitbox.schemas.indicator import Indicator
-from aitbox.schemas.road_network import Cross
-from aitbox.schemas.singal import SignalSchema
+from aitbox.models.signal.isolated.cycler.base import CyclerSolver
+from aitbox.schemas.singal import CyclerSignalSchema, SignalSchema
 
 
-class SimpleSolver(IsolatedSolver):
-    def __init__(self, *args):
-        pass
+class SimpleSolver(CyclerSolver):
+    """周期沿用现有方案（无方案时为 cycle），仅按关键流量比重新分配绿信比"""
 
+    def __init__(self, cycle: int = 120, **kwargs):
+        super().__init__(**kwargs)
+        self.cycle = cycle
 
-    def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
-              **kwargs) -> SignalSchema:
-        pass
-
-
-    def calc_cycle(self):
-        #step1: calc cycle for intersection
-
-        pass
-
-    def allocate_green_split(self):
-        # step2: allocate green split for every phase
-        pass
+    def calc_cycle(self, lost: np.ndarray, y: np.ndarray, schema: SignalSchema | None = None) -> int:
+        # step1: calc cycle for intersection
+        min_cycle, max_cycle = self.cycle_bounds(schema)
+        cycle = schema.cycle if isinstance(schema, CyclerSignalSchema) else self.cycle
+        return int(np.clip(cycle, min_cycle, max_cycle))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : timeline.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+# Description: 将环-屏障结构的周期式方案编译为周期内的灯色时间线，按二分查找回答任意时刻的灯色
+from enum import IntEnum
+from itertools import groupby
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from aitbox.schemas.singal import CyclerPhase, CyclerSignalSchema, PhaseType
+
+
+class SignalState(IntEnum):
+    """灯色，数值越大通行权越高；车道由多个相位放行时取最大值"""
+    RED = 0
+    YELLOW = 1
+    GREEN_FLASH = 2
+    GREEN = 3
+
+
+class PhaseWindows(NamedTuple):
+    """各相位在周期内的灯色切换时刻（秒，相对周期起点），相位按环内顺序展平"""
+    start: np.ndarray  # (P,) 绿灯开始
+    green_flash: np.ndarray  # (P,) 绿闪开始
+    yellow: np.ndarray  # (P,) 黄灯开始
+    red: np.ndarray  # (P,) 红灯（全红）开始
+    end: np.ndarray  # (P,) 全红结束，即环内下一相位开始
+
+
+class Arrivals(NamedTuple):
+    """到达时刻的评价结果，与输入一一对应"""
+    state: np.ndarray  # 到达时的灯色 SignalState
+    wait: np.ndarray  # 到下一次绿灯开始的等待时间（秒），绿灯与绿闪到达为 0，从不放行为 inf
+
+
+class SignalTimeline(NamedTuple):
+    """
+    一个周期内的灯色时间线：breaks 为升序的切换时刻，第 k 个区间 [breaks[k], breaks[k + 1]) 内
+    第 m 个流向（相位或车道）的灯色为 states[k, m]。绝对时刻 t 对应周期内时刻 (t - origin) mod cycle。
+    """
+    cycle: float
+    origin: float  # 某个周期起点的绝对时刻
+    breaks: np.ndarray  # (N,) 周期内切换时刻，breaks[0] == 0
+    states: np.ndarray  # (N, M) int8 灯色
+    next_green: np.ndarray  # (N, M) 区间内到达时下一次绿灯开始的周期内时刻，可超过 cycle；放行区间为区间起点
+
+    def locate(self, t) -> Tuple[np.ndarray, np.ndarray]:
+        """绝对时刻所在的区间序号与周期内时刻"""
+        local = np.mod(np.asarray(t, dtype=np.float64) - self.origin, self.cycle)
+        return np.searchsorted(self.breaks, local, side="right") - 1, local
+
+    def state_at(self, t: float) -> np.ndarray:
+        """t 时刻各流向的灯色"""
+        k, _ = self.locate(t)
+        return self.states[k]
+
+    def state(self, t, movement) -> np.ndarray:
+        """各时刻对应流向的灯色，t 与 movement 按 NumPy 规则广播"""
+        k, _ = self.locate(t)
+        return self.states[k, movement]
+
+    def arrivals(self, t, movement) -> Arrivals:
+        """
+        一次评价大量车辆到达：t 为到达停车线的绝对时刻，movement 为其流向序号。
+        黄灯与红灯到达视为需要停车，等待到该流向下一次绿灯开始
+        """
+        k, local = self.locate(t)
+        state = self.states[k, movement]
+        wait = np.where(state >= SignalState.GREEN_FLASH, 0.0, self.next_green[k, movement] - local)
+        return Arrivals(state, wait)
+
+    def movements(self, mask: np.ndarray) -> "SignalTimeline":
+        """
+        由 (P, M) 的相位-流向放行矩阵（如 phase_lane_mask）得到各流向的时间线：
+        灯色取放行相位中的最大值，下一次绿灯取最早者，并合并灯色不变的相邻区间
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape[0] != self.states.shape[1]:
+            raise ValueError(f"放行矩阵有 {mask.shape[0]} 个相位，时间线有 {self.states.shape[1]} 个")
+        states = np.where(mask[None], self.states[:, :, None], SignalState.RED).max(axis=1).astype(np.int8)
+        next_green = np.where(mask[None], self.next_green[:, :, None], np.inf).min(axis=1)
+        next_green = np.where(states >= SignalState.GREEN_FLASH, self.breaks[:, None], next_green)
+        keep = np.r_[True, (states[1:] != states[:-1]).any(axis=1)]
+        return SignalTimeline(self.cycle, self.origin, self.breaks[keep], states[keep], next_green[keep])
+
+
+def _barrier_groups(schema: CyclerSignalSchema) -> List[List[Tuple[int, List[CyclerPhase]]]]:
+    """各环按 barrier_id 划分的连续相位组"""
+    rings = [[(barrier, list(phases)) for barrier, phases in groupby(ring.phases, key=lambda p: p.barrier_id)]
+             for ring in schema.rings]
+    if len({tuple(barrier for barrier, _ in groups) for groups in rings}) > 1:
+        raise ValueError("各环的屏障顺序不一致")
+    return rings
+
+
+def phase_windows(schema: CyclerSignalSchema) -> Tuple[float, PhaseWindows]:
+    """
+    按环-屏障结构排布各相位：各环的相位依次运行，同一屏障区在所有环中同时开始、同时结束，
+    屏障区长度取各环该区相位长度之和的最大值，较短的环将差值补给该区最后一个相位的绿灯。
+    周期取屏障区总长与 schema.cycle 的较大值，多出的时间补给最后一个屏障区。
+
+    Returns:
+        周期长度与各相位的切换时刻
+    """
+    rings = _barrier_groups(schema)
+    if not rings or not rings[0]:
+        raise ValueError("方案没有相位")
+    lengths = np.array([[sum(p.green + p.yellow + p.all_red for p in phases) for _, phases in groups]
+                        for groups in rings], dtype=np.float64)
+    barrier = lengths.max(axis=0)
+    cycle = max(float(barrier.sum()), float(schema.cycle))
+    barrier[-1] += cycle - barrier.sum()
+    barrier_start = np.concatenate(([0.0], np.cumsum(barrier)[:-1]))
+
+    start, green_end, flash, yellow_end, end = [], [], [], [], []
+    for r, groups in enumerate(rings):
+        for b, (_, phases) in enumerate(groups):
+            t = barrier_start[b]
+            slack = barrier[b] - lengths[r, b]
+            for i, phase in enumerate(phases):
+                green = phase.green + (slack if i == len(phases) - 1 else 0.0)
+                start.append(t)
+                green_end.append(t + green)
+                flash.append(t + max(green - phase.green_flash, 0.0))
+                yellow_end.append(t + green + phase.yellow)
+                t += green + phase.yellow + phase.all_red
+                end.append(t)
+    return cycle, PhaseWindows(*(np.array(v, dtype=np.float64) for v in (start, flash, green_end, yellow_end, end)))
+
+
+def compile_timeline(schema: CyclerSignalSchema, now: float | None = None) -> SignalTimeline:
+    """
+    将方案编译为各相位的灯色时间线，流向序号即环内顺序展平后的相位序号；空相位始终为红灯。
+
+    Args:
+        schema: 周期式方案
+        now: 给定时以 running_phase[0] / running_time[0] 对齐周期起点（now 时刻第一个环的该相位已运行
+            running_time 秒），否则以 phase_offset 为周期起点
+    """
+    cycle, windows = phase_windows(schema)
+    if now is not None and schema.running_phase:
+        elapsed = schema.running_time[0] if schema.running_time else 0
+        origin = float(now) - windows.start[schema.running_phase[0]] - elapsed
+    else:
+        origin = float(schema.phase_offset)
+    origin %= cycle
+
+    points = np.concatenate([windows.start, windows.green_flash, windows.yellow, windows.red, [0.0]])
+    breaks = np.unique(np.mod(points, cycle))
+    u = breaks[:, None]
+    states = np.select(
+        [u < windows.start, u < windows.green_flash, u < windows.yellow, u < windows.red],
+        [SignalState.RED, SignalState.GREEN, SignalState.GREEN_FLASH, SignalState.YELLOW],
+        SignalState.RED,
+    ).astype(np.int8)
+    phases = [phase for ring in schema.rings for phase in ring.phases]
+    has_green = (windows.yellow > windows.start) & np.array([p.type != PhaseType.EMPTY for p in phases], dtype=bool)
+    states[:, ~has_green] = SignalState.RED
+
+    next_green = np.where(windows.start >= u, windows.start, windows.start + cycle)
+    next_green = np.where(has_green, next_green, np.inf)
+    next_green = np.where(states >= SignalState.GREEN_FLASH, u, next_green)
+    return SignalTimeline(cycle, origin, breaks, states, next_green)
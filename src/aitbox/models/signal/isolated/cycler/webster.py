@@ -8,10 +8,28 @@ Created     : 2026-01-12
 Description : 获得webster模型的信号配时
 """
 import logging
+from enum import IntFlag
+from typing import List, NamedTuple, Sequence, Tuple
 
 import numpy as np
 
 
+class WebsterStatus(IntFlag):
+    """批量计算时每个路口的状态标记"""
+    OK = 0
+    EMPTY = 1  # 相位列表为空
+    HIGH_SATURATION = 2  # 饱和度之和大于0.85，周期偏大
+    NEAR_SATURATION = 4  # 饱和度之和不小于0.90，直接使用最大周期
+    OVERSATURATED = 8  # 饱和度之和不小于1.0，Webster公式不适用
+
+
+class WebsterBatchResult(NamedTuple):
+    """批量Webster配时结果，green 与输入的扁平相位数组一一对应"""
+    cycle: np.ndarray  # (N,) 信号周期（秒）
+    green: np.ndarray  # (M,) 各相位有效绿灯时间（秒）
+    status: np.ndarray  # (N,) WebsterStatus 标记
+
+
 class Webster:
     def __init__(self, min_cycle=50, max_cycle=180):
         """初始化Webster计算器
@@ -76,3 +94,61 @@ class Webster:
 
         return webster_cycle
 
+    @staticmethod
+    def pack(arrays: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """将各路口的相位数组拼接为扁平数组与 (N+1,) 偏移量"""
+        counts = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=len(arrays))
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        flat = np.concatenate([np.asarray(a, dtype=np.float64) for a in arrays]) if len(arrays) else np.empty(0)
+        return flat, offsets
+
+    def get_cycle_by_webster_batch(self, l: np.ndarray, y: np.ndarray, offsets: np.ndarray) -> WebsterBatchResult:
+        """批量计算N个路口的Webster周期与绿信比，全部为向量化运算
+
+        周期公式与 get_cycle_by_webster 一致: C = 1.5 * ΣL / (1 - ΣY)，结果限制在[min_cycle, max_cycle]；
+        各相位有效绿灯 g_i = (C - ΣL) * y_i / ΣY。异常路口不抛出异常，而是通过 status 标记。
+
+        Args:
+            l: (M,) 所有路口各相位损失时间拼接的扁平数组（秒）
+            y: (M,) 所有路口各相位流量比拼接的扁平数组
+            offsets: (N+1,) 第 i 个路口的相位为 [offsets[i], offsets[i+1])
+
+        Returns:
+            WebsterBatchResult: 周期、各相位绿灯时间与状态标记
+        """
+        l = np.asarray(l, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+
+        sum_l = np.concatenate(([0.0], np.cumsum(l)))
+        sum_l = sum_l[offsets[1:]] - sum_l[offsets[:-1]]
+        sum_y = np.concatenate(([0.0], np.cumsum(y)))
+        sum_y = sum_y[offsets[1:]] - sum_y[offsets[:-1]]
+
+        status = np.zeros(len(counts), dtype=np.int8)
+        status[counts == 0] |= WebsterStatus.EMPTY
+        status[sum_y > 0.85] |= WebsterStatus.HIGH_SATURATION
+        status[sum_y >= 0.90] |= WebsterStatus.NEAR_SATURATION
+        status[sum_y >= 1.00] |= WebsterStatus.OVERSATURATED
+
+        near = sum_y >= 0.90
+        denominator = np.where(near, 1.0, 1.0 - sum_y)
+        cycle = np.round(1.5 * sum_l / denominator)
+        cycle = np.clip(cycle, self.min_cycle, self.max_cycle)
+        cycle[near] = self.max_cycle
+        cycle = cycle.astype(np.int64)
+
+        effective = np.repeat(np.maximum(cycle - sum_l, 0.0), counts)
+        sum_y_rep = np.repeat(sum_y, counts)
+        share = np.divide(y, sum_y_rep, out=np.repeat(1.0 / np.maximum(counts, 1), counts), where=sum_y_rep > 0)
+        green = effective * share
+
+        return WebsterBatchResult(cycle=cycle, green=green, status=status)
+
+    def get_cycle_by_webster_list(self, l: List[Sequence[float]], y: List[Sequence[float]]) -> WebsterBatchResult:
+        """get_cycle_by_webster_batch 的便捷入口，输入为各路口的相位数组列表"""
+        flat_l, offsets = self.pack(l)
+        flat_y, _ = self.pack(y)
+        return self.get_cycle_by_webster_batch(flat_l, flat_y, offsets)
@@ -3,29 +3,44 @@
 # @File : webster_solver.py
 # @Author : run
 # @Date : 2026/1/18 20:43
-from typing import List
+import logging
+from typing import List, Sequence
 
-from aitbox.models.signal.isolated.base import IsolatedSolver
+import numpy as np
+
+from aitbox.models.signal.isolated.cycler.base import CyclerSolver
+from aitbox.models.signal.isolated.cycler.webster import Webster, WebsterStatus
 from aitbox.schemas.indicator import Indicator
 from aitbox.schemas.road_network import Cross
-from aitbox.schemas.singal import SignalSchema
+from aitbox.schemas.singal import CyclerSignalSchema, SignalSchema
 
 
-class WebsterSolver(IsolatedSolver):
-    def __init__(self, *args):
-        pass
+class WebsterSolver(CyclerSolver):
+    """
+    Webster 周期 C = 1.5 * ΣL / (1 - ΣY)，绿信比按关键流量比分配
 
-    def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
-              **kwargs) -> SignalSchema:
+    Args:
+        cycle_factors: Webster 周期的候选倍数，如 (0.75, 1.0, 1.25, 1.5)。Webster 公式基于近似延误模型，
+            多于一个候选时按 evaluate 的延误（HCM）在候选周期中选取总延误最小者；默认只用 Webster 周期
+    """
 
-        # todo 确认指标所在位置
-        return schema
+    def __init__(self, *args, cycle_factors: Sequence[float] = (1.0,), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cycle_factors = tuple(cycle_factors)
+        self.logger = logging.getLogger(__name__)
 
-    def calc_cycle(self):
+    def solve(self, cross: Cross, indicators: Indicator | List[Indicator], schema: SignalSchema | None = None, *args,
+              cycle: int | Sequence[int] | None = None, **kwargs) -> CyclerSignalSchema:
+        if cycle is None and len(self.cycle_factors) > 1:
+            webster = super().solve(cross, indicators, schema).cycle
+            min_cycle, max_cycle = self.cycle_bounds(schema)
+            cycle = sorted({int(np.clip(round(webster * f), min_cycle, max_cycle)) for f in self.cycle_factors})
+        return super().solve(cross, indicators, schema, *args, cycle=cycle, **kwargs)
+
+    def calc_cycle(self, lost: np.ndarray, y: np.ndarray, schema: SignalSchema | None = None) -> int:
         # step1: calc cycle for intersection
-
-        pass
-
-    def allocate_green_split(self):
-        # step2: allocate green split for every phase
-        pass
+        min_cycle, max_cycle = self.cycle_bounds(schema)
+        result = Webster(min_cycle, max_cycle).get_cycle_by_webster_list([lost], [y])
+        if result.status[0] & WebsterStatus.OVERSATURATED:
+            self.logger.warning("关键流量比之和不小于1.0，使用最大周期")
+        return int(result.cycle[0])
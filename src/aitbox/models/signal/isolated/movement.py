@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : movement
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Lane to phase mapping of an intersection from Branch.direction and LaneTurnType
+"""
+
+from functools import reduce
+from itertools import groupby
+from operator import or_
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.schemas.road_network import BranchType, Cross, DirectionType, Lane, LaneTurnType
+from aitbox.schemas.singal import Phase, Ring, SignalSchema
+
+
+class Axis:
+    """ """
+    NS = "ns"
+    EW = "ew"
+
+
+DIRECTION_AXIS = {
+    DirectionType.NORTH: Axis.NS,
+    DirectionType.SOUTH: Axis.NS,
+    DirectionType.EAST_NORTH: Axis.NS,
+    DirectionType.WEST_SOUTH: Axis.NS,
+    DirectionType.EAST: Axis.EW,
+    DirectionType.WEST: Axis.EW,
+    DirectionType.WEST_NORTH: Axis.EW,
+    DirectionType.EAST_SOUTH: Axis.EW,
+}
+
+# Classic four-phase plan: NS through, NS left, EW through, EW left. Right turns run with through.
+DEFAULT_PHASE_MOVEMENTS: Tuple[Tuple[str, LaneTurnType], ...] = (
+    (Axis.NS, LaneTurnType.STRAIGHT | LaneTurnType.RIGHT),
+    (Axis.NS, LaneTurnType.LEFT | LaneTurnType.UTURN),
+    (Axis.EW, LaneTurnType.STRAIGHT | LaneTurnType.RIGHT),
+    (Axis.EW, LaneTurnType.LEFT | LaneTurnType.UTURN),
+)
+
+
+def entry_lanes(cross: Cross) -> List[Tuple[DirectionType, Lane]]:
+    """Approach lanes of the cross in branch order, with the direction of their branch"""
+    lanes = []
+    for branch in cross.branch:
+        if branch.type != BranchType.IN:
+            continue
+        for lane in branch.lane:
+            if lane.flow_type == BranchType.IN:
+                lanes.append((branch.direction, lane))
+    return lanes
+
+
+def schema_phases(schema: SignalSchema | None) -> List[Phase]:
+    """Phases of all rings flattened in ring order"""
+    if schema is None:
+        return []
+    return [phase for ring in schema.rings for phase in ring.phases]
+
+
+def _runs(phase_movements: Sequence[Tuple[str, LaneTurnType]]) -> List[List[Tuple[str, LaneTurnType]]]:
+    """Consecutive movements sharing an axis"""
+    return [list(run) for _, run in groupby(phase_movements, key=lambda movement: movement[0])]
+
+
+def sequential_movements(
+    num_phases: int,
+    phase_movements: Sequence[Tuple[str, LaneTurnType]] = DEFAULT_PHASE_MOVEMENTS,
+) -> List[Tuple[str, LaneTurnType]]:
+    """
+    Movements of phases running one after another without barriers.
+
+    With at least as many phases as ``phase_movements`` they are taken in order, wrapping around. With fewer,
+    phase ``k`` serves every turn of axis run ``k % num_runs`` (e.g. a two-phase plan is NS then EW), so no
+    approach is left without green.
+    """
+    if num_phases >= len(phase_movements):
+        return [phase_movements[k % len(phase_movements)] for k in range(num_phases)]
+    runs = [_merge(run) for run in _runs(phase_movements)]
+    return [runs[k % len(runs)] for k in range(num_phases)]
+
+
+def _merge(movements: Sequence[Tuple[str, LaneTurnType]]) -> Tuple[str, LaneTurnType]:
+    """One movement serving every turn of movements on the same axis"""
+    return movements[0][0], reduce(or_, (turn for _, turn in movements))
+
+
+def schema_movements(
+    schema: SignalSchema | None,
+    num_phases: int | None = None,
+    phase_movements: Sequence[Tuple[str, LaneTurnType]] = DEFAULT_PHASE_MOVEMENTS,
+) -> List[Tuple[str, LaneTurnType]]:
+    """
+    Movement of every phase of a schema by ring and barrier (``ring_barrier_movements``); without a schema
+    or phases, ``sequential_movements`` of ``num_phases`` (default one phase per movement)
+    """
+    if schema_phases(schema):
+        return ring_barrier_movements(schema.rings, phase_movements)
+    return sequential_movements(len(phase_movements) if num_phases is None else num_phases, phase_movements)
+
+
+def phase_lane_mask(
+    cross: Cross,
+    num_phases: int | None = None,
+    phase_movements: Sequence[Tuple[str, LaneTurnType]] = DEFAULT_PHASE_MOVEMENTS,
+) -> np.ndarray:
+    """
+    ``(num_phases, num_lanes)`` bool matrix, True where the phase gives green to the lane.
+
+    Phase ``i`` serves the ``i``-th of ``sequential_movements``; a shared lane such as STRAIGHT_LEFT is
+    served by every phase that covers one of its turns.
+    """
+    lanes = entry_lanes(cross)
+    num_phases = len(phase_movements) if num_phases is None else num_phases
+    phase_movements = sequential_movements(num_phases, phase_movements)
+    axes = np.array([DIRECTION_AXIS[direction] for direction, _ in lanes], dtype=object)
+    turns = np.array([int(lane.turn_type) for _, lane in lanes], dtype=np.int64)
+
+    mask = np.zeros((num_phases, len(lanes)), dtype=bool)
+    for i in range(num_phases):
+        axis, turn = phase_movements[i]
+        mask[i] = (axes == axis) & ((turns & int(turn)) != 0)
+    return mask
+
+
+def ring_barrier_movements(
+    rings: Sequence[Ring],
+    phase_movements: Sequence[Tuple[str, LaneTurnType]] = DEFAULT_PHASE_MOVEMENTS,
+) -> List[Tuple[str, LaneTurnType]]:
+    """
+    Movement of every phase of a ring-barrier plan, phases flattened in ring order.
+
+    ``phase_movements`` is read as runs sharing an axis, one run per barrier (the default is NS through and
+    left, then EW through and left). The ``b``-th barrier group of each ring serves run ``b % num_runs`` and
+    its ``k``-th phase the ``k``-th movement of that run, so concurrent phases of all rings serve the same
+    axis; when a group has fewer phases than its run, its last phase also serves the rest of the run. A ring
+    without barriers, i.e. a single group, follows ``sequential_movements``.
+    """
+    runs = _runs(phase_movements)
+    movements = []
+    for ring in rings:
+        groups = [list(phases) for _, phases in groupby(ring.phases, key=lambda p: getattr(p, "barrier_id", 0))]
+        if len(groups) == 1:
+            movements.extend(sequential_movements(len(ring.phases), phase_movements))
+            continue
+        for b, phases in enumerate(groups):
+            run = runs[b % len(runs)]
+            if len(phases) < len(run):
+                run = run[:len(phases) - 1] + [_merge(run[len(phases) - 1:])]
+            movements.extend(run[k % len(run)] for k in range(len(phases)))
+    return movements
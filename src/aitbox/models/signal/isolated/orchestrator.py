@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : orchestrator
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Run an IsolatedSolver over every signalized cross of a road network
+"""
+
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.models.signal.isolated.base import IsolatedSolver
+from aitbox.schemas.indicator import Indicator
+from aitbox.schemas.indicator_store import IndicatorStore
+from aitbox.schemas.road_network import Cross, CrossType, RoadNetwork
+from aitbox.schemas.singal import SignalSchema
+
+_worker_solver: IsolatedSolver | None = None
+
+
+class SolveResult(NamedTuple):
+    """Results aligned with ``cross_ids``, which follow the order of ``RoadNetwork.cross``"""
+    cross_ids: List[str | int]
+    schemas: List[SignalSchema | None]  # None where the solve failed
+    errors: Dict[str | int, str]
+    latency: np.ndarray  # seconds per cross; batch solves are amortized over the batch
+
+
+def _init_worker(solver: IsolatedSolver) -> None:
+    global _worker_solver
+    _worker_solver = solver
+
+
+def _solve_chunk(
+    tasks: Sequence[Tuple[Cross, List[Indicator], SignalSchema | None]],
+    solver: IsolatedSolver | None = None,
+) -> List[Tuple[SignalSchema | None, str | None, float]]:
+    solver = solver or _worker_solver
+    results = []
+    for cross, indicators, schema in tasks:
+        start = time.perf_counter()
+        try:
+            results.append((solver.solve(cross, indicators, schema), None, time.perf_counter() - start))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}", time.perf_counter() - start))
+    return results
+
+
+class SolveOrchestrator:
+    """
+    Solves all ``CrossType.SIGNAL`` crosses of a network with one solver.
+
+    Solvers exposing ``solve_batch`` are called once for the whole network. Otherwise crosses are
+    split into chunks and solved on a thread or process pool; ``executor="serial"`` solves inline.
+    The pool is kept alive between runs so per-cross solver caches survive periodic re-solves. A
+    process pool pickles the solver once when it starts, so passing a different solver object
+    restarts it.
+    """
+
+    def __init__(
+        self,
+        network: RoadNetwork,
+        executor: str = "thread",
+        max_workers: int | None = None,
+        chunk_size: int = 16,
+        use_batch: bool = True,
+    ):
+        if executor not in ("serial", "thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.network = network
+        self.executor = executor
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.use_batch = use_batch
+        self.crosses = [cross for cross in network.cross if cross.type == CrossType.SIGNAL]
+        self.latency: Dict[str, List[np.ndarray]] = defaultdict(list)
+        self._source_cross: Dict[str | int, str | int] | None = None
+        self._pool: Executor | None = None
+        self._pool_solver: IsolatedSolver | None = None
+
+    def __enter__(self) -> "SolveOrchestrator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_solver = None
+
+    @property
+    def source_cross(self) -> Dict[str | int, str | int]:
+        """Cross id of every cross, branch and lane id of the signalized crosses"""
+        if self._source_cross is None:
+            mapping = {}
+            for cross in self.crosses:
+                mapping[cross.id] = cross.id
+                for branch in cross.branch:
+                    mapping[branch.id] = cross.id
+                    for lane in branch.lane:
+                        mapping[lane.id] = cross.id
+            self._source_cross = mapping
+        return self._source_cross
+
+    def group_indicators(
+        self, indicators: Iterable[Indicator] | IndicatorStore | Mapping[str | int, List[Indicator]]
+    ) -> Dict[str | int, List[Indicator] | IndicatorStore]:
+        """
+        Bucket indicators by the cross their source belongs to; a mapping is taken as already grouped.
+        An ``IndicatorStore`` is split into one sub-store per cross without materializing indicators.
+        """
+        if isinstance(indicators, Mapping):
+            return {k: v if isinstance(v, IndicatorStore) else list(v) for k, v in indicators.items()}
+        source_cross = self.source_cross
+        if isinstance(indicators, IndicatorStore):
+            return indicators.split(source_cross)
+        grouped = defaultdict(list)
+        for indicator in indicators:
+            cross_id = source_cross.get(indicator.source_id)
+            if cross_id is not None:
+                grouped[cross_id].append(indicator)
+        return grouped
+
+    def _get_pool(self, solver: IsolatedSolver) -> Executor:
+        if self.executor == "process" and self._pool is not None and self._pool_solver is not solver:
+            self.close()
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(self.max_workers, initializer=_init_worker, initargs=(solver,))
+            else:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="solve")
+            self._pool_solver = solver
+        return self._pool
+
+    def run(
+        self,
+        solver: IsolatedSolver,
+        indicators: Iterable[Indicator] | IndicatorStore | Mapping[str | int, List[Indicator]],
+        schemas: Mapping[str | int, SignalSchema] | None = None,
+    ) -> SolveResult:
+        """Solve every signalized cross and record the per-cross latency under the solver name"""
+        grouped = self.group_indicators(indicators)
+        schemas = schemas or {}
+        cross_ids = [cross.id for cross in self.crosses]
+        tasks = [(cross, grouped.get(cross.id, []), schemas.get(cross.id)) for cross in self.crosses]
+
+        if self.use_batch and hasattr(solver, "solve_batch"):
+            results = self._solve_batch(solver, tasks)
+        elif self.executor == "serial":
+            results = _solve_chunk(tasks, solver)
+        else:
+            chunks = [tasks[i:i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)]
+            pool = self._get_pool(solver)
+            if self.executor == "process":
+                outputs = pool.map(_solve_chunk, chunks)
+            else:
+                outputs = pool.map(_solve_chunk, chunks, [solver] * len(chunks))
+            results = [result for output in outputs for result in output]
+
+        latency = np.array([elapsed for _, _, elapsed in results], dtype=np.float64)
+        self.latency[type(solver).__name__].append(latency)
+        errors = {cross_id: error for cross_id, (_, error, _) in zip(cross_ids, results) if error is not None}
+        return SolveResult(cross_ids, [schema for schema, _, _ in results], errors, latency)
+
+    @staticmethod
+    def _solve_batch(solver, tasks) -> List[Tuple[SignalSchema | None, str | None, float]]:
+        if not tasks:
+            return []
+        crosses = [cross for cross, _, _ in tasks]
+        indicators = [indicator for _, cross_indicators, _ in tasks for indicator in cross_indicators]
+        start = time.perf_counter()
+        try:
+            schemas, error = solver.solve_batch(crosses, indicators, [schema for _, _, schema in tasks]), None
+        except Exception as e:
+            schemas, error = [None] * len(tasks), f"{type(e).__name__}: {e}"
+        elapsed = (time.perf_counter() - start) / len(tasks)
+        return [(schema, error, elapsed) for schema in schemas]
+
+    def latency_percentiles(self, q: Sequence[float] = (50, 90, 99)) -> Dict[str, Dict[str, float]]:
+        """Per-cross latency percentiles in milliseconds over all runs, keyed by solver class name"""
+        report = {}
+        for name, runs in self.latency.items():
+            latency = np.concatenate(runs) * 1e3
+            if len(latency):
+                report[name] = {f"p{p:g}": float(v) for p, v in zip(q, np.percentile(latency, q))}
+        return report
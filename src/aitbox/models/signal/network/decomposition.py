@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : decomposition
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Split the signalized part of a road network into coordinated subgraphs and arterial chains
+"""
+
+from collections import deque
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.schemas.road_network import Cross, CrossType, RoadNetwork, RoadSegment
+
+
+class Link(NamedTuple):
+    """Coordinated link between two crosses, given by their positions"""
+    a: int
+    b: int
+    length: float
+
+
+class Subgraph(NamedTuple):
+    """ """
+    crosses: List[Cross]
+    chains: List[List[int]]  # positions in ``crosses``, each chain ordered along its segments
+    chain_segments: List[List[RoadSegment]]  # ``chain_segments[k][i]`` joins chain positions i and i + 1
+    links: List[Link]  # coordinated links not covered by a chain
+
+
+class BoundaryLink(NamedTuple):
+    """Coordinated link cut by the decomposition"""
+    subgraph_a: int
+    a: int
+    subgraph_b: int
+    b: int
+    length: float
+
+
+def signal_adjacency(network: RoadNetwork, max_length: float) -> Dict[str | int, Dict[str | int, RoadSegment]]:
+    """Signalized crosses joined by a segment not longer than ``max_length``; the shortest segment wins"""
+    adjacency = {cross.id: {} for cross in network.cross if cross.type == CrossType.SIGNAL}
+    for segment in network.road_segment:
+        a, b = segment.start_cross_id, segment.end_cross_id
+        if a == b or a not in adjacency or b not in adjacency or segment.length > max_length:
+            continue
+        if b not in adjacency[a] or segment.length < adjacency[a][b].length:
+            adjacency[a][b] = adjacency[b][a] = segment
+    return adjacency
+
+
+def chain_cover(nodes: Sequence[str | int], adjacency: Dict[str | int, Dict[str | int, RoadSegment]]
+                ) -> Tuple[List[List[str | int]], List[Tuple[str | int, str | int]]]:
+    """
+    Greedy path cover: start at the remaining node of lowest degree and keep walking to the nearest
+    remaining neighbour. Returns the chains and the edges left between them.
+    """
+    remaining = set(nodes)
+    order = {node: i for i, node in enumerate(nodes)}
+    chains = []
+    while remaining:
+        start = min(remaining, key=lambda n: (sum(m in remaining for m in adjacency[n]), order[n]))
+        chain = [start]
+        remaining.discard(start)
+        while True:
+            options = [m for m in adjacency[chain[-1]] if m in remaining]
+            if not options:
+                break
+            nxt = min(options, key=lambda m: (adjacency[chain[-1]][m].length, order[m]))
+            chain.append(nxt)
+            remaining.discard(nxt)
+        chains.append(chain)
+
+    in_chain = {frozenset(pair) for chain in chains for pair in zip(chain[:-1], chain[1:])}
+    extra = sorted(
+        {frozenset((a, b)) for a in nodes for b in adjacency[a] if b in order} - in_chain,
+        key=lambda pair: sorted(order[n] for n in pair),
+    )
+    return chains, [tuple(sorted(pair, key=order.get)) for pair in extra]
+
+
+def decompose(network: RoadNetwork, coordination_distance: float = 800.0,
+              max_size: int = 20) -> Tuple[List[Subgraph], List[BoundaryLink]]:
+    """
+    Grow subgraphs breadth-first over coordinated links (segments up to ``coordination_distance``
+    metres between signalized crosses) until ``max_size`` crosses; links cut by the size limit are
+    returned as boundary links to be reconciled after the subgraphs are optimized independently.
+    """
+    adjacency = signal_adjacency(network, coordination_distance)
+    crosses = {cross.id: cross for cross in network.cross if cross.id in adjacency}
+    owner: Dict[str | int, Tuple[int, int]] = {}
+    groups: List[List[str | int]] = []
+    for root in crosses:
+        if root in owner:
+            continue
+        group, queue = [], deque([root])
+        owner[root] = (len(groups), 0)
+        while queue and len(group) < max_size:
+            node = queue.popleft()
+            owner[node] = (len(groups), len(group))
+            group.append(node)
+            for nbr in sorted(adjacency[node], key=lambda m: adjacency[node][m].length):
+                if nbr not in owner:
+                    owner[nbr] = (len(groups), -1)
+                    queue.append(nbr)
+        for node in queue:  # reached but not taken: free for the next subgraph
+            del owner[node]
+        groups.append(group)
+
+    subgraphs = []
+    for group in groups:
+        position = {node: i for i, node in enumerate(group)}
+        local = {node: {m: s for m, s in adjacency[node].items() if m in position} for node in group}
+        chains, extra = chain_cover(group, local)
+        subgraphs.append(Subgraph(
+            crosses=[crosses[node] for node in group],
+            chains=[[position[node] for node in chain] for chain in chains],
+            chain_segments=[[local[a][b] for a, b in zip(chain[:-1], chain[1:])] for chain in chains],
+            links=[Link(position[a], position[b], local[a][b].length) for a, b in extra],
+        ))
+
+    boundary = []
+    for a, neighbours in adjacency.items():
+        for b, segment in neighbours.items():
+            (ga, ia), (gb, ib) = owner[a], owner[b]
+            if ga < gb:
+                boundary.append(BoundaryLink(ga, ia, gb, ib, segment.length))
+    return subgraphs, boundary
+
+
+def circular_distance(x: np.ndarray, cycle: int) -> np.ndarray:
+    x = np.mod(x, cycle)
+    return np.minimum(x, cycle - x)
+
+
+def reconcile(
+    offsets: Sequence[np.ndarray],
+    links: Sequence[Tuple[int, int, int, int, float]],
+    cycle: int,
+    previous: Sequence[np.ndarray | None] | None = None,
+    anchor_weight: float = 0.1,
+    max_sweeps: int = 20,
+) -> Tuple[np.ndarray, int]:
+    """
+    Shift whole groups of offsets so that linked crosses progress by their travel time in either direction.
+
+    Group shifts are updated one group at a time (Gauss-Seidel), each by scanning every shift of the cycle
+    at once. With ``previous`` offsets, groups are first aligned to them and pulled towards them by
+    ``anchor_weight``, which keeps a re-optimized plan close to the running one and converges in fewer
+    sweeps; without them the first group is held at shift 0.
+
+    Args:
+        offsets: per group, the offsets (s) of its crosses relative to the group
+        links: ``(group_a, a, group_b, b, travel_time)`` between crosses of different groups
+        cycle: common cycle (s)
+        previous: per group, the previous absolute offsets of its crosses, or None
+
+    Returns:
+        per-group shifts and the number of sweeps until no shift changed
+    """
+    num_groups = len(offsets)
+    shifts = np.zeros(num_groups, dtype=np.int64)
+    candidates = np.arange(cycle)
+    anchored = [previous is not None and previous[g] is not None for g in range(num_groups)]
+    for g in range(num_groups):
+        if anchored[g]:
+            cost = circular_distance(offsets[g][None, :] + candidates[:, None] - previous[g][None, :], cycle)
+            shifts[g] = int(np.argmin(cost.sum(axis=1)))
+
+    by_group: Dict[int, List[Tuple[int, int, int, float]]] = {g: [] for g in range(num_groups)}
+    for ga, a, gb, b, travel in links:
+        by_group[ga].append((a, gb, b, travel))
+        by_group[gb].append((b, ga, a, travel))
+
+    free = [g for g in range(num_groups) if by_group[g] and (anchored[g] or g != 0 or any(anchored))]
+    for sweep in range(1, max_sweeps + 1):
+        changed = False
+        for g in free:
+            cost = np.zeros(cycle)
+            for a, other, b, travel in by_group[g]:
+                diff = offsets[g][a] + candidates - (offsets[other][b] + shifts[other])
+                cost += np.minimum(circular_distance(diff - travel, cycle), circular_distance(diff + travel, cycle))
+            if anchored[g]:
+                cost += anchor_weight * circular_distance(
+                    offsets[g][None, :] + candidates[:, None] - previous[g][None, :], cycle).sum(axis=1)
+            best = int(np.argmin(cost))
+            if cost[best] < cost[shifts[g]] - 1e-9:
+                shifts[g], changed = best, True
+        if not changed:
+            return shifts, sweep
+    return shifts, max_sweeps
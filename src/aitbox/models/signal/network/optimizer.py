@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : optimizer
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Network-wide cycle, split and offset optimization over coordinated subgraphs
+"""
+
+import dataclasses
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+import numpy as np
+
+from aitbox.models.signal.arterial.green_wave import GreenWaveSolver
+from aitbox.models.signal.isolated.cycler.base import CyclerSolver
+from aitbox.models.signal.isolated.cycler.webster_solver import WebsterSolver
+from aitbox.models.signal.isolated.orchestrator import SolveOrchestrator
+from aitbox.models.signal.network.decomposition import Subgraph, decompose, reconcile
+from aitbox.schemas.indicator import Indicator
+from aitbox.schemas.indicator_store import IndicatorStore
+from aitbox.schemas.road_network import RoadNetwork
+from aitbox.schemas.singal import CyclerSignalSchema
+
+_worker_solvers: Tuple[CyclerSolver, GreenWaveSolver] | None = None
+
+
+class SubgraphPlan(NamedTuple):
+    """ """
+    schemas: List[CyclerSignalSchema]  # offsets relative to the subgraph
+    cycle: int
+    sweeps: int
+
+
+class NetworkPlan(NamedTuple):
+    """ """
+    schemas: Dict[str | int, CyclerSignalSchema]
+    subgraphs: List[List[str | int]]
+    cycles: List[int]
+    iterations: int  # boundary reconciliation sweeps
+
+
+def _init_worker(cycler: CyclerSolver, green_wave: GreenWaveSolver) -> None:
+    global _worker_solvers
+    _worker_solvers = (cycler, green_wave)
+
+
+def _optimize_subgraph(
+    subgraph: Subgraph,
+    indicators: List[List[Indicator]],
+    previous: List[CyclerSignalSchema | None],
+    speed: float,
+    cycle_tolerance: int,
+    cycle_candidates: int = 1,
+    cycle_step: int = 5,
+    solvers: Tuple[CyclerSolver, GreenWaveSolver] | None = None,
+) -> SubgraphPlan:
+    """Common cycle, splits at that cycle, green waves along the chains, then chains aligned to each other"""
+    cycler, green_wave = solvers or _worker_solvers
+    crosses = subgraph.crosses
+    isolated = [cycler.solve(c, i, p) for c, i, p in zip(crosses, indicators, previous)]
+    min_cycle, max_cycle = max(s.min_cycle for s in isolated), min(s.max_cycle for s in isolated)
+    cycle = int(np.clip(max(s.cycle for s in isolated), min_cycle, max_cycle))
+    candidates = sorted({min(cycle + k * cycle_step, max(max_cycle, cycle)) for k in range(cycle_candidates)})
+    if len(candidates) > 1:
+        # total delay of the subgraph at every candidate, each cross evaluating all candidates in one call
+        delay = sum(cycler.cycle_delays(c, i, p, candidates)[1] for c, i, p in zip(crosses, indicators, previous))
+        cycle = candidates[int(np.argmin(delay))]
+    previous_cycles = {p.cycle for p in previous if p is not None}
+    warm = all(p is not None for p in previous) and len(previous_cycles) == 1
+    if warm and abs(cycle - next(iter(previous_cycles))) <= cycle_tolerance:
+        cycle = previous_cycles.pop()
+    schemas = [cycler.solve(c, i, p, cycle=cycle) for c, i, p in zip(crosses, indicators, previous)]
+
+    chain_offsets = []
+    for chain, segments in zip(subgraph.chains, subgraph.chain_segments):
+        if len(chain) < 2:
+            chain_offsets.append(np.zeros(1))
+            continue
+        initial = [previous[i].phase_offset for i in chain] if warm else None
+        result = green_wave.optimize([crosses[i] for i in chain], segments, [schemas[i] for i in chain],
+                                     speeds=speed, initial_offsets=initial)
+        chain_offsets.append(result.offsets)
+
+    chain_of = {i: (k, j) for k, chain in enumerate(subgraph.chains) for j, i in enumerate(chain)}
+    links = [
+        (*chain_of[link.a], *chain_of[link.b], link.length / (speed / 3.6)) for link in subgraph.links
+    ]
+    prior = [np.array([previous[i].phase_offset for i in chain], dtype=np.float64) for chain in subgraph.chains] \
+        if warm else None
+    shifts, sweeps = reconcile(chain_offsets, links, cycle, prior)
+    for chain, offsets, shift in zip(subgraph.chains, chain_offsets, shifts):
+        for i, offset in zip(chain, offsets):
+            schemas[i] = dataclasses.replace(schemas[i], phase_offset=int(round(offset + shift)) % cycle)
+    return SubgraphPlan(schemas, cycle, sweeps)
+
+
+class NetworkOptimizer:
+    """
+    Network-level fixed-time optimization.
+
+    The signalized crosses are split once into subgraphs of coordinated crosses (see ``decompose``),
+    each optimized independently on a worker pool: a common cycle (the largest cycle any of its crosses
+    needs), splits at that cycle, two-way green waves along its chains and alignment of the chains.
+    Subgraphs sharing a cycle are then shifted so that offsets across cut links progress as well.
+
+    With ``cycle_candidates`` > 1, the common cycle is picked among that many cycles ``cycle_step`` seconds
+    apart, starting at the one the crosses need, as the one with the least total delay of the subgraph
+    (``CyclerSolver.cycle_delays``).
+
+    Passing the previous plan warm-starts every step: cycles within ``cycle_tolerance`` seconds of the
+    running one are kept, green-wave ties and reconciliation shifts are pulled towards the running
+    offsets, so a re-optimization on similar demand returns the same plan after one sweep.
+    """
+
+    def __init__(
+        self,
+        network: RoadNetwork,
+        cycler: CyclerSolver | None = None,
+        green_wave: GreenWaveSolver | None = None,
+        speed: float = 50.0,
+        coordination_distance: float = 800.0,
+        max_subgraph_size: int = 20,
+        cycle_tolerance: int = 5,
+        cycle_candidates: int = 3,
+        cycle_step: int = 5,
+        executor: str = "process",
+        max_workers: int | None = None,
+    ):
+        if executor not in ("serial", "thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.network = network
+        self.cycler = cycler or WebsterSolver()
+        self.green_wave = green_wave or GreenWaveSolver()
+        self.speed = speed
+        self.cycle_tolerance = cycle_tolerance
+        self.cycle_candidates = cycle_candidates
+        self.cycle_step = cycle_step
+        self.executor = executor
+        self.max_workers = max_workers
+        self.subgraphs, self.boundary = decompose(network, coordination_distance, max_subgraph_size)
+        self._indicators = SolveOrchestrator(network, executor="serial")
+        self._pool: Executor | None = None
+
+    def __enter__(self) -> "NetworkOptimizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _map(self, tasks: List[tuple]) -> List[SubgraphPlan]:
+        if self.executor == "serial":
+            return [_optimize_subgraph(*task, solvers=(self.cycler, self.green_wave)) for task in tasks]
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(self.max_workers, initializer=_init_worker,
+                                                 initargs=(self.cycler, self.green_wave))
+            else:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="network")
+        if self.executor == "process":
+            return list(self._pool.map(_optimize_subgraph, *zip(*tasks)))
+        solvers = [(self.cycler, self.green_wave)] * len(tasks)
+        return list(self._pool.map(_optimize_subgraph, *zip(*tasks), solvers))
+
+    def optimize(
+        self,
+        indicators: Iterable[Indicator] | IndicatorStore | Mapping[str | int, List[Indicator]],
+        previous: NetworkPlan | Mapping[str | int, CyclerSignalSchema] | None = None,
+    ) -> NetworkPlan:
+        """
+        Args:
+            indicators: VOLUME/SATURATION indicators of lanes or branches, or already grouped by cross id
+            previous: the running plan or schemas by cross id, used as warm start
+        """
+        if isinstance(previous, NetworkPlan):
+            previous = previous.schemas
+        previous = previous or {}
+        grouped = self._indicators.group_indicators(indicators)
+        tasks = [
+            (
+                subgraph,
+                [grouped.get(cross.id, []) for cross in subgraph.crosses],
+                [previous.get(cross.id) for cross in subgraph.crosses],
+                self.speed,
+                self.cycle_tolerance,
+                self.cycle_candidates,
+                self.cycle_step,
+            )
+            for subgraph in self.subgraphs
+        ]
+        plans = self._map(tasks) if tasks else []
+        shifts, iterations = self._reconcile_boundary(plans, previous)
+
+        schemas = {}
+        for subgraph, plan, shift in zip(self.subgraphs, plans, shifts):
+            for cross, schema in zip(subgraph.crosses, plan.schemas):
+                schemas[cross.id] = dataclasses.replace(schema, phase_offset=int(schema.phase_offset + shift) % plan.cycle)
+        return NetworkPlan(
+            schemas=schemas,
+            subgraphs=[[cross.id for cross in subgraph.crosses] for subgraph in self.subgraphs],
+            cycles=[plan.cycle for plan in plans],
+            iterations=iterations,
+        )
+
+    def _reconcile_boundary(self, plans: List[SubgraphPlan],
+                            previous: Mapping[str | int, CyclerSignalSchema]) -> Tuple[np.ndarray, int]:
+        """Shift subgraphs of equal cycle so that offsets progress across the cut links"""
+        shifts = np.zeros(len(plans), dtype=np.int64)
+        iterations = 0
+        for cycle in sorted({plan.cycle for plan in plans}):
+            members = [g for g, plan in enumerate(plans) if plan.cycle == cycle]
+            local = {g: k for k, g in enumerate(members)}
+            offsets = [np.array([s.phase_offset for s in plans[g].schemas], dtype=np.float64) for g in members]
+            links = [
+                (local[link.subgraph_a], link.a, local[link.subgraph_b], link.b, link.length / (self.speed / 3.6))
+                for link in self.boundary
+                if link.subgraph_a in local and link.subgraph_b in local
+            ]
+            prior = []
+            for g in members:
+                crosses = self.subgraphs[g].crosses
+                running = [previous.get(cross.id) for cross in crosses]
+                prior.append(np.array([s.phase_offset for s in running], dtype=np.float64)
+                             if all(s is not None and s.cycle == cycle for s in running) else None)
+            group_shifts, sweeps = reconcile(offsets, links, cycle, prior)
+            shifts[members] = group_shifts
+            iterations = max(iterations, sweeps)
+        return shifts, iterations
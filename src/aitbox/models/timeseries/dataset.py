@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : dataset.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Sliding (history, horizon) windows over a memory-mapped time x nodes x features array
+"""
+
+import numpy as np
+import torch
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
+
+
+class SlidingWindowDataset(Dataset):
+    """
+    Windows are never materialized: ``windows`` is a strided view of the memory-mapped array and a
+    batch is gathered with one fancy index into contiguous ``(B, history, N, F)`` and
+    ``(B, horizon, N, F)`` tensors.
+
+    ``__getitem__`` accepts an int or an array of window indices; ``loader`` wires the batched
+    form into a DataLoader usable by ``Trainer.fit``.
+    """
+
+    def __init__(
+        self,
+        data: str | np.ndarray,
+        history: int,
+        horizon: int,
+        stride: int = 1,
+        start: int = 0,
+        end: int | None = None,
+        target_features: list[int] | None = None,
+        dtype: torch.dtype = torch.float32,
+    ):
+        """ """
+        if isinstance(data, str):
+            data = np.load(data, mmap_mode="r")
+        if data.ndim == 2:
+            data = data[..., None]
+        if data.ndim != 3:
+            raise ValueError(f"Expected a (time, nodes, features) array, got shape {data.shape}")
+        if history <= 0 or horizon <= 0 or stride <= 0:
+            raise ValueError("history, horizon and stride must be positive")
+
+        self.data = data[start:end]
+        self.history = history
+        self.horizon = horizon
+        self.stride = stride
+        self.target_features = target_features
+        self.dtype = dtype
+
+        self.window = history + horizon
+        self.num_windows = max((len(self.data) - self.window) // stride + 1, 0)
+        self._history_offsets = np.arange(history)
+        self._horizon_offsets = np.arange(history, self.window)
+
+    @classmethod
+    def save(cls, path: str, data: np.ndarray, chunk_size: int = 4096) -> None:
+        """Write ``data`` to a ``.npy`` file chunk by chunk so it can be memory-mapped"""
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=data.dtype, shape=data.shape)
+        for i in range(0, len(data), chunk_size):
+            out[i:i + chunk_size] = data[i:i + chunk_size]
+        out.flush()
+        del out
+
+    @property
+    def windows(self) -> np.ndarray:
+        """Read-only ``(num_windows, history + horizon, N, F)`` view sharing memory with the file"""
+        s0, s1, s2 = self.data.strides
+        return np.lib.stride_tricks.as_strided(
+            self.data,
+            shape=(self.num_windows, self.window, *self.data.shape[1:]),
+            strides=(s0 * self.stride, s0, s1, s2),
+            writeable=False,
+        )
+
+    def __len__(self):
+        """ """
+        return self.num_windows
+
+    def __getitem__(self, index: int | list[int] | np.ndarray) -> tuple[torch.Tensor, torch.Tensor]:
+        """ """
+        if np.isscalar(index):
+            if not -self.num_windows <= index < self.num_windows:
+                raise IndexError(f"Window index {index} out of range")
+            index = index % self.num_windows
+        return self.gather(np.asarray(index))
+
+    def gather(self, index: np.ndarray) -> tuple[torch.Tensor, torch.Tensor]:
+        """ """
+        squeeze = index.ndim == 0
+        starts = np.atleast_1d(index)[:, None] * self.stride
+        x = self.data[starts + self._history_offsets]
+        y = self.data[starts + self._horizon_offsets]
+        if self.target_features is not None:
+            y = y[..., self.target_features]
+        x = torch.from_numpy(np.ascontiguousarray(x)).to(self.dtype)
+        y = torch.from_numpy(np.ascontiguousarray(y)).to(self.dtype)
+        if squeeze:
+            return x[0], y[0]
+        return x, y
+
+    def loader(self, batch_size: int, shuffle: bool = False, drop_last: bool = False, **kwargs) -> DataLoader:
+        """ """
+        sampler = RandomSampler(self) if shuffle else SequentialSampler(self)
+        return DataLoader(
+            self,
+            sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=drop_last),
+            batch_size=None,
+            **kwargs,
+        )
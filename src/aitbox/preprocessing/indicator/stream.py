@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : stream
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Windowed lane and branch indicators from detector and GPS event streams
+"""
+
+from typing import Callable, Dict, Hashable, List, Sequence
+
+import numpy as np
+
+from aitbox.schemas.indicator import IndicatorType
+from aitbox.schemas.indicator_store import TYPE_CODES, IndicatorColumns, IndicatorStore
+from aitbox.schemas.road_network import BranchType, RoadNetwork
+
+# accumulator planes
+_VOLUME, _OCCUPANCY, _TRAVERSALS, _DELAY = range(4)
+
+
+class IndicatorEngine:
+    """
+    Incremental VOLUME, OCCUPANCY, DELAY and QUEUE_LENGTH of every entry lane and entry branch.
+
+    Time is cut into bins of ``step`` seconds; a window is the last ``window / step`` bins, so
+    ``step == window`` gives tumbling windows and a smaller step sliding ones. Accumulators live in a
+    ring of ``window / step`` bins per lane and per branch, every event adds to its lane and its branch
+    in the bin of its time, and each time an event (or ``flush``) moves past a bin boundary the window
+    ending there is emitted as one ``IndicatorColumns`` batch timestamped with the window end.
+
+    - Detector ``on``/``off`` events give VOLUME (veh/h, counted at ``on``) and OCCUPANCY (occupied
+      share of the window, averaged over the lanes of a branch). An ``on`` adds the time left to the
+      end of its bin, an ``off`` removes it, and lanes still occupied at a boundary carry a full bin
+      into the next one, so each event is O(1).
+    - Matched GPS traversals, attributed to the bin of their exit time, give DELAY (mean of travel time
+      minus free-flow time, s) and QUEUE_LENGTH (average vehicles queued over the window by Little's
+      law: total delay / window, scaled up by the probe ``penetration`` rate).
+
+    Indicators are only emitted for sources that have seen the matching kind of event. Detector events
+    older than the current bin are dropped, traversals are accepted as long as their bin is in the ring;
+    both are counted in ``late``. Batches are appended to ``store`` (created for the network when not
+    given) and passed to ``callback``.
+    """
+
+    def __init__(
+        self,
+        network: RoadNetwork,
+        window: int = 300,
+        step: int | None = None,
+        penetration: float = 1.0,
+        store: IndicatorStore | None = None,
+        callback: Callable[[IndicatorColumns], None] | None = None,
+    ):
+        step = step or window
+        if window % step:
+            raise ValueError(f"window ({window}) must be a multiple of step ({step})")
+        self.window = window
+        self.step = step
+        self.num_bins = window // step
+        self.penetration = penetration
+        self.store = store if store is not None else IndicatorStore(network, freq=f"{window}s")
+        self.callback = callback
+
+        lane_ids, lane_branch, branch_ids = [], [], []
+        for cross in network.cross:
+            for branch in cross.branch:
+                if branch.type != BranchType.IN or not branch.lane:
+                    continue
+                for lane in branch.lane:
+                    lane_ids.append(lane.id)
+                    lane_branch.append(len(branch_ids))
+                branch_ids.append(branch.id)
+        self.num_lanes = len(lane_ids)
+        self.row_of: Dict[Hashable, int] = {lane_id: i for i, lane_id in enumerate(lane_ids)}
+        self.lane_branch = np.array(lane_branch, dtype=np.int64) + self.num_lanes  # row of each lane's branch
+        self.branch_lanes = np.bincount(lane_branch, minlength=len(branch_ids)).astype(np.float64)
+        self.source_code = self.store.encode_sources(lane_ids + branch_ids)
+
+        num_rows = self.num_lanes + len(branch_ids)
+        self._acc = np.zeros((4, num_rows, self.num_bins), dtype=np.float64)
+        self._active = np.zeros(self.num_lanes, dtype=np.int64)  # lanes currently occupied
+        self._detected = np.zeros(num_rows, dtype=bool)
+        self._probed = np.zeros(num_rows, dtype=bool)
+        self._bin: int | None = None  # current bin index
+        self._start = 0  # start of the first bin
+        self.late = 0
+
+    # ------------------------------------------------------------------ time
+
+    def _advance(self, t: float) -> List[IndicatorColumns]:
+        """Close every bin ending at or before ``t``, emitting the window ending at each"""
+        b = int(t // self.step)
+        if self._bin is None:
+            self._bin, self._start = b, b * self.step
+            return []
+        batches = []
+        while self._bin < b:
+            end = (self._bin + 1) * self.step
+            batches.append(self._emit(end))
+            self._bin += 1
+            slot = self._bin % self.num_bins
+            self._acc[:, :, slot] = 0.0
+            if self._active.any():
+                active = np.maximum(self._active, 0) * float(self.step)
+                self._acc[_OCCUPANCY, :self.num_lanes, slot] = active
+                np.add.at(self._acc[_OCCUPANCY, :, slot], self.lane_branch, active)
+        return batches
+
+    def flush(self, t: float) -> List[IndicatorColumns]:
+        """Emit every window ending at or before ``t`` without waiting for the next event"""
+        return self._advance(t)
+
+    def _emit(self, end: int) -> IndicatorColumns:
+        totals = self._acc.sum(axis=2)
+        covered = float(min(self.window, end - self._start))
+        num_lanes = self.num_lanes
+        occupancy = np.clip(totals[_OCCUPANCY], 0.0, None) / covered
+        occupancy[num_lanes:] /= self.branch_lanes
+        traversals = totals[_TRAVERSALS]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delay = totals[_DELAY] / traversals
+
+        parts = [
+            (IndicatorType.VOLUME, self._detected, totals[_VOLUME] * 3600.0 / covered),
+            (IndicatorType.OCCUPANCY, self._detected, occupancy),
+            (IndicatorType.DELAY, self._probed & (traversals > 0), delay),
+            (IndicatorType.QUEUE_LENGTH, self._probed, totals[_DELAY] / covered / self.penetration),
+        ]
+        columns = IndicatorColumns(
+            np.concatenate([np.full(mask.sum(), TYPE_CODES[t], dtype=np.int8) for t, mask, _ in parts]),
+            np.concatenate([self.source_code[mask] for _, mask, _ in parts]),
+            np.full(sum(int(mask.sum()) for _, mask, _ in parts), end, dtype=np.int64),
+            np.concatenate([values[mask] for _, mask, values in parts]),
+        )
+        self.store.append_columns(columns)
+        if self.callback is not None:
+            self.callback(columns)
+        return columns
+
+    # ------------------------------------------------------------------ single events
+
+    def on(self, lane_id: Hashable, t: float) -> List[IndicatorColumns]:
+        """A vehicle arrives on the detector of a lane"""
+        return self._detector(self.row_of[lane_id], t, 1)
+
+    def off(self, lane_id: Hashable, t: float) -> List[IndicatorColumns]:
+        """The detector of a lane is released"""
+        return self._detector(self.row_of[lane_id], t, -1)
+
+    def _detector(self, row: int, t: float, state: int) -> List[IndicatorColumns]:
+        batches = self._advance(t)
+        if int(t // self.step) < self._bin or (state < 0 and self._active[row] <= 0):
+            self.late += 1
+            return batches
+        slot, branch = self._bin % self.num_bins, self.lane_branch[row]
+        remaining = state * ((self._bin + 1) * self.step - t)
+        acc = self._acc
+        acc[_OCCUPANCY, row, slot] += remaining
+        acc[_OCCUPANCY, branch, slot] += remaining
+        if state > 0:
+            acc[_VOLUME, row, slot] += 1.0
+            acc[_VOLUME, branch, slot] += 1.0
+            self._detected[row] = self._detected[branch] = True
+        self._active[row] += state
+        return batches
+
+    def traversal(self, lane_id: Hashable, enter: float, exit: float,
+                  free_flow_time: float = 0.0) -> List[IndicatorColumns]:
+        """A matched probe vehicle entered the lane at ``enter`` and crossed its stop line at ``exit``"""
+        row = self.row_of[lane_id]
+        batches = self._advance(exit)
+        b = int(exit // self.step)
+        if b <= self._bin - self.num_bins:
+            self.late += 1
+            return batches
+        self.late += b < self._bin
+        slot, branch = b % self.num_bins, self.lane_branch[row]
+        delay = max(exit - enter - free_flow_time, 0.0)
+        acc = self._acc
+        acc[_TRAVERSALS, row, slot] += 1.0
+        acc[_TRAVERSALS, branch, slot] += 1.0
+        acc[_DELAY, row, slot] += delay
+        acc[_DELAY, branch, slot] += delay
+        self._probed[row] = self._probed[branch] = True
+        return batches
+
+    # ------------------------------------------------------------------ bulk events
+
+    def _rows(self, lane_ids: Sequence[Hashable]) -> np.ndarray:
+        row_of = self.row_of
+        return np.array([row_of[lane_id] for lane_id in lane_ids], dtype=np.int64)
+
+    def _bin_chunks(self, times: np.ndarray):
+        """Sort order of ``times`` and ``(bin, start, stop)`` runs of that order sharing a bin"""
+        order = np.argsort(times, kind="stable")
+        bins = (times[order] // self.step).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        stops = np.r_[starts[1:], len(bins)]
+        return order, [(int(bins[i]), i, j) for i, j in zip(starts, stops)]
+
+    def detector_events(self, lane_ids: Sequence[Hashable], times, states) -> List[IndicatorColumns]:
+        """Bulk detector events; ``states`` is True for on and False for off"""
+        rows = self._rows(lane_ids)
+        times = np.asarray(times, dtype=np.float64)
+        signs = np.where(np.asarray(states, dtype=bool), 1, -1)
+        order, chunks = self._bin_chunks(times)
+        batches = []
+        for b, i, j in chunks:
+            batches.extend(self._advance(b * self.step))
+            if b < self._bin:
+                self.late += j - i
+                continue
+            index = order[i:j]
+            self._apply_detector(rows[index], times[index], signs[index])
+        return batches
+
+    def detections(self, lane_ids: Sequence[Hashable], on_times, off_times) -> List[IndicatorColumns]:
+        """Bulk complete actuations, each an on and an off time of one lane"""
+        lane_ids = list(lane_ids)
+        n = len(lane_ids)
+        return self.detector_events(
+            lane_ids + lane_ids, np.concatenate([np.asarray(on_times, dtype=np.float64),
+                                                 np.asarray(off_times, dtype=np.float64)]),
+            np.r_[np.ones(n, dtype=bool), np.zeros(n, dtype=bool)],
+        )
+
+    def _apply_detector(self, rows: np.ndarray, times: np.ndarray, signs: np.ndarray) -> None:
+        slot = self._bin % self.num_bins
+        remaining = signs * ((self._bin + 1) * self.step - times)
+        on = signs > 0
+        both = np.concatenate([rows, self.lane_branch[rows]])
+        np.add.at(self._acc[_OCCUPANCY, :, slot], both, np.r_[remaining, remaining])
+        np.add.at(self._acc[_VOLUME, :, slot], both, np.r_[on, on].astype(np.float64))
+        np.add.at(self._active, rows, signs)
+        np.maximum(self._active, 0, out=self._active)
+        self._detected[both[np.r_[on, on]]] = True
+
+    def traversals(self, lane_ids: Sequence[Hashable], enter, exit, free_flow_time=0.0) -> List[IndicatorColumns]:
+        """Bulk matched probe traversals"""
+        rows = self._rows(lane_ids)
+        exit = np.asarray(exit, dtype=np.float64)
+        delay = np.maximum(exit - np.asarray(enter, dtype=np.float64) - free_flow_time, 0.0)
+        order, chunks = self._bin_chunks(exit)
+        batches = []
+        for b, i, j in chunks:
+            batches.extend(self._advance(b * self.step))
+            if b <= self._bin - self.num_bins:
+                self.late += j - i
+                continue
+            self.late += (j - i) * (b < self._bin)
+            index = order[i:j]
+            both = np.concatenate([rows[index], self.lane_branch[rows[index]]])
+            slot = b % self.num_bins
+            np.add.at(self._acc[_TRAVERSALS, :, slot], both, 1.0)
+            np.add.at(self._acc[_DELAY, :, slot], both, np.r_[delay[index], delay[index]])
+            self._probed[both] = True
+        return batches
@@ -13,11 +13,13 @@ from __future__ import annotations
 import numpy as np
 from typing import Any
 
+from aitbox.schemas.road_network import RoadNetwork
+
 _NATIVE_MODULE_NAME = "aitbox.preprocessing.track.map_match"
 
 
 def map_match(
-    road_network: dict[str, Any],
+    road_network: dict[str, Any] | RoadNetwork,
     tracks: list[np.ndarray],
     *,
     track_ids: list[str] | None = None,
@@ -28,6 +30,8 @@ def map_match(
 ) -> list[dict[str, Any] | None]:
     import importlib
 
+    if isinstance(road_network, RoadNetwork):
+        road_network = road_network.match_network
     native = importlib.import_module(_NATIVE_MODULE_NAME)
     return native.map_match(
         road_network=road_network,
@@ -8,11 +8,11 @@ Created     : 2026/1/17
 Description :
 """
 
+import itertools
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional
-
-import pandas as pd
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence
 
 from aitbox.schemas.road_network import Lane, Branch, Cross
 
@@ -53,7 +53,22 @@ class IndicatorType(str, Enum):
     STOP_COUNT = "stop_count"  # 停车次数
 
 
-@dataclass
+@lru_cache(maxsize=256)
+def parse_freq(freq: str):
+    """
+    ``freq`` as a pandas offset, or None if pandas cannot parse it.
+
+    Cached per string and importing pandas only on first use, so indicators can be created without it.
+    """
+    import pandas as pd
+
+    try:
+        return pd.tseries.frequencies.to_offset(freq)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
 class Indicator:
     """ """
     type: IndicatorType
@@ -63,9 +78,54 @@ class Indicator:
     timestamp: None | str | int = None
     unit: None | str = None
 
-    def __post_init__(self):
+    @property
+    def offset(self):
         """ """
-        try:
-            pd.tseries.frequencies.to_offset(self.freq)
-        except Exception:
-            pass
+        return parse_freq(self.freq)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        types: IndicatorType | str | Sequence[IndicatorType | str],
+        source_ids: Sequence[str | int | None],
+        values: Iterable[Any],
+        freq: str | Sequence[str],
+        timestamps: Sequence[None | str | int] | None = None,
+        units: None | str | Sequence[None | str] = None,
+    ) -> List["Indicator"]:
+        """
+        Build indicators from aligned columns.
+
+        Scalar ``types``/``freq``/``units`` apply to every row. Each column is validated once: lengths must
+        match, type values must be ``IndicatorType`` members and every distinct frequency must parse.
+
+        Raises:
+            ValueError: on a length mismatch, an unknown type or an unparsable frequency
+        """
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        values = list(values)
+        n = len(values)
+
+        def column(data, name):
+            if data is None or isinstance(data, (str, IndicatorType)):
+                return itertools.repeat(data, n)
+            data = data.tolist() if hasattr(data, "tolist") else list(data)
+            if len(data) != n:
+                raise ValueError(f"{name} has {len(data)} entries, expected {n}")
+            return data
+
+        if isinstance(types, (str, IndicatorType)):
+            type_column = itertools.repeat(IndicatorType(types), n)
+        else:
+            type_column = column(types, "types")
+            lookup = {t: IndicatorType(t) for t in set(type_column)}
+            type_column = [lookup[t] for t in type_column]
+        freq_column = column(freq, "freq")
+        invalid = [f for f in ({freq} if isinstance(freq, str) else set(freq_column)) if parse_freq(f) is None]
+        if invalid:
+            raise ValueError(f"Invalid freq: {invalid}")
+        source_column = column(source_ids, "source_ids")
+        timestamp_column = column(timestamps, "timestamps")
+        unit_column = column(units, "units")
+        return list(map(cls, type_column, source_column, values, freq_column, timestamp_column, unit_column))
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : indicator_store
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Columnar indicator storage indexed by source and by time
+"""
+
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.road_network import RoadNetwork
+
+INDICATOR_TYPES: List[IndicatorType] = list(IndicatorType)
+TYPE_CODES: Dict[IndicatorType, int] = {t: i for i, t in enumerate(INDICATOR_TYPES)}
+NO_TIMESTAMP = np.iinfo(np.int64).min
+
+
+class ParentIndex(NamedTuple):
+    """Source codes grouped by the cross (or branch) they belong to"""
+    codes: Dict[Hashable, int]  # parent id -> parent code
+    order: np.ndarray  # source codes sorted by parent code, sources without a parent excluded
+    bounds: np.ndarray  # order[bounds[k]:bounds[k + 1]] are the sources of parent k
+
+
+class IndicatorColumns(NamedTuple):
+    """Selected rows as aligned columns"""
+    type_code: np.ndarray  # int8, index into INDICATOR_TYPES
+    source_code: np.ndarray  # int32, index into IndicatorStore.source_ids
+    timestamp: np.ndarray  # int64 seconds, NO_TIMESTAMP when missing
+    value: np.ndarray  # float64
+
+
+def to_seconds(timestamps) -> np.ndarray:
+    """Timestamps as int64 seconds since the epoch; ints pass through, strings/datetimes are parsed"""
+    array = np.asarray(timestamps)
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64)
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[s]").astype(np.int64)
+    result = np.full(array.shape, NO_TIMESTAMP, dtype=np.int64)
+    present = np.array([t is not None for t in array.ravel()], dtype=bool).reshape(array.shape)
+    if present.any():
+        values = array[present]
+        if all(isinstance(v, (int, np.integer)) for v in values):
+            result[present] = values.astype(np.int64)
+        else:
+            result[present] = values.astype("datetime64[s]").astype(np.int64)
+    return result
+
+
+class IndicatorStore:
+    """
+    Indicators held as columns (type code, source code, timestamp, value) instead of ``Indicator`` objects.
+
+    Appends go to the tail of the columns; the first query after an append sorts them by
+    ``(source, type, timestamp)`` and builds a CSR offset array over ``source * num_types + type``, so
+    the rows of a source (and type) are one contiguous slice. A separate argsort by timestamp serves
+    pure time-range queries. With a ``network`` attached, sources can also be selected by the cross or
+    branch they belong to, through a per-level index of source codes by parent built on first use.
+
+    Iterating the store yields ``Indicator`` objects for callers that still expect them.
+    """
+
+    def __init__(self, network: RoadNetwork | None = None, freq: str = "5min"):
+        self.freq = freq
+        self.source_ids: List[Hashable] = []
+        self._source_codes: Dict[Hashable, int] = {}
+        self._chunks: List[IndicatorColumns] = []
+        self._columns = IndicatorColumns(
+            np.empty(0, np.int8), np.empty(0, np.int32), np.empty(0, np.int64), np.empty(0, np.float64)
+        )
+        self._offsets: np.ndarray | None = None
+        self._time_order: np.ndarray | None = None
+        self._parents: Dict[Hashable, tuple] = {}
+        self._parent_index: Tuple[ParentIndex, ParentIndex] | None = None
+        if network is not None:
+            self.attach(network)
+
+    # ------------------------------------------------------------------ building
+
+    def attach(self, network: RoadNetwork) -> None:
+        """Register the cross and branch every cross, branch and lane id belongs to"""
+        for cross in network.cross:
+            self._parents[cross.id] = (cross.id, None)
+            for branch in cross.branch:
+                self._parents[branch.id] = (cross.id, branch.id)
+                for lane in branch.lane:
+                    self._parents[lane.id] = (cross.id, branch.id)
+        self._parent_index = None
+
+    def encode_sources(self, source_ids: Iterable[Hashable]) -> np.ndarray:
+        """Codes of the source ids, registering unseen ones"""
+        codes = self._source_codes
+        result = []
+        for source_id in source_ids:
+            code = codes.get(source_id)
+            if code is None:
+                code = codes[source_id] = len(self.source_ids)
+                self.source_ids.append(source_id)
+                self._parent_index = None
+            result.append(code)
+        return np.array(result, dtype=np.int32)
+
+    def source_codes(self, source_ids: Iterable[Hashable]) -> np.ndarray:
+        """Codes of known source ids, unknown ids are dropped"""
+        codes = self._source_codes
+        return np.array([codes[s] for s in source_ids if s in codes], dtype=np.int32)
+
+    def append(self, types, source_ids, timestamps, values) -> None:
+        """
+        Bulk append of aligned columns.
+
+        Args:
+            types: an ``IndicatorType`` for all rows, or one per row
+            source_ids: source id per row
+            timestamps: int seconds, datetime64 or strings, one per row
+            values: numeric value per row
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        n = len(values)
+        if isinstance(types, (IndicatorType, str)):
+            type_code = np.full(n, TYPE_CODES[IndicatorType(types)], dtype=np.int8)
+        else:
+            type_code = np.array([TYPE_CODES[IndicatorType(t)] for t in types], dtype=np.int8)
+        source_code = self.encode_sources(source_ids)
+        timestamp = np.broadcast_to(to_seconds(timestamps), (n,)).copy()
+        if not len(type_code) == len(source_code) == n:
+            raise ValueError("types, source_ids, timestamps and values must have the same length")
+        self._chunks.append(IndicatorColumns(type_code, source_code, timestamp, values))
+        self._offsets = self._time_order = None
+
+    def append_columns(self, columns: IndicatorColumns) -> None:
+        """Append rows already encoded against this store, e.g. batches from a streaming producer"""
+        self._chunks.append(IndicatorColumns(
+            np.asarray(columns.type_code, dtype=np.int8),
+            np.asarray(columns.source_code, dtype=np.int32),
+            np.asarray(columns.timestamp, dtype=np.int64),
+            np.asarray(columns.value, dtype=np.float64),
+        ))
+        self._offsets = self._time_order = None
+
+    def extend(self, indicators: Iterable[Indicator]) -> None:
+        indicators = list(indicators)
+        self.append(
+            [i.type for i in indicators],
+            [i.source_id for i in indicators],
+            [i.timestamp for i in indicators],
+            [i.value for i in indicators],
+        )
+
+    @classmethod
+    def from_indicators(cls, indicators: Iterable[Indicator], network: RoadNetwork | None = None) -> "IndicatorStore":
+        store = cls(network)
+        store.extend(indicators)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._columns.value) + sum(len(chunk.value) for chunk in self._chunks)
+
+    # ------------------------------------------------------------------ indexes
+
+    @property
+    def columns(self) -> IndicatorColumns:
+        """All rows sorted by (source, type, timestamp)"""
+        self._build()
+        return self._columns
+
+    def _build(self) -> None:
+        if self._chunks:
+            self._columns = IndicatorColumns(*(
+                np.concatenate([self._columns[k]] + [chunk[k] for chunk in self._chunks]) for k in range(4)
+            ))
+            self._chunks = []
+        if self._offsets is None:
+            columns = self._columns
+            key = columns.source_code.astype(np.int64) * len(INDICATOR_TYPES) + columns.type_code
+            order = np.lexsort((columns.timestamp, key))
+            self._columns = IndicatorColumns(*(c[order] for c in columns))
+            num_keys = len(self.source_ids) * len(INDICATOR_TYPES)
+            self._offsets = np.searchsorted(key[order], np.arange(num_keys + 1))
+            self._time_order = None
+
+    @property
+    def time_order(self) -> np.ndarray:
+        """Row positions sorted by timestamp"""
+        self._build()
+        if self._time_order is None:
+            self._time_order = np.argsort(self._columns.timestamp, kind="stable")
+        return self._time_order
+
+    @property
+    def parent_index(self) -> Tuple[ParentIndex, ParentIndex]:
+        """Sources by cross and by branch, rebuilt only after new sources or a new network"""
+        if self._parent_index is None:
+            no_parent = (None, None)
+            parents = [self._parents.get(s, no_parent) for s in self.source_ids]
+            levels = []
+            for level in (0, 1):
+                ids = [p[level] for p in parents]
+                codes = {parent: i for i, parent in enumerate(dict.fromkeys(p for p in ids if p is not None))}
+                parent_code = np.array([codes.get(p, -1) if p is not None else -1 for p in ids], dtype=np.int64)
+                order = np.argsort(parent_code, kind="stable")
+                bounds = np.searchsorted(parent_code[order], np.arange(len(codes) + 1))
+                levels.append(ParentIndex(codes, order, bounds))
+            self._parent_index = tuple(levels)
+        return self._parent_index
+
+    # ------------------------------------------------------------------ queries
+
+    def _source_filter(self, sources, cross, branch, lane) -> np.ndarray | None:
+        if sources is None and cross is None and branch is None and lane is None:
+            return None
+        wanted = []
+        if sources is not None:
+            wanted.append(self.source_codes(_as_list(sources)))
+        if lane is not None:
+            wanted.append(self.source_codes(_as_list(lane)))
+        for level, ids in ((0, cross), (1, branch)):
+            if ids is None:
+                continue
+            index = self.parent_index[level]
+            parents = np.array([index.codes[i] for i in _as_list(ids) if i in index.codes], dtype=np.int64)
+            wanted.append(index.order[_ranges(index.bounds[parents], index.bounds[parents + 1])])
+        return np.unique(np.concatenate(wanted)).astype(np.int32)
+
+    def select(
+        self,
+        types: IndicatorType | Sequence[IndicatorType] | None = None,
+        sources=None,
+        cross=None,
+        branch=None,
+        lane=None,
+        start=None,
+        end=None,
+    ) -> np.ndarray:
+        """
+        Row positions into ``columns`` matching every given filter, ordered by (source, type, timestamp).
+
+        ``cross`` and ``branch`` select the cross/branch itself and everything below it (needs an attached
+        network). ``start`` is inclusive, ``end`` exclusive.
+        """
+        self._build()
+        num_types = len(INDICATOR_TYPES)
+        source_codes = self._source_filter(sources, cross, branch, lane)
+        if types is not None:
+            type_codes = np.array([TYPE_CODES[IndicatorType(t)] for t in _as_list(types)], dtype=np.int64)
+        else:
+            type_codes = None
+
+        if source_codes is None and type_codes is None:
+            rows = self._time_range_rows(start, end)
+            return np.sort(rows) if rows is not None else np.arange(len(self._columns.value))
+
+        if source_codes is None:
+            source_codes = np.arange(len(self.source_ids))
+        if type_codes is None:
+            # all types of a source are one contiguous block of keys
+            lo = self._offsets[source_codes.astype(np.int64) * num_types]
+            hi = self._offsets[(source_codes.astype(np.int64) + 1) * num_types]
+        else:
+            keys = (source_codes.astype(np.int64)[:, None] * num_types + type_codes[None, :]).ravel()
+            keys.sort()
+            lo, hi = self._offsets[keys], self._offsets[keys + 1]
+        rows = _ranges(lo, hi)
+        if start is not None or end is not None:
+            timestamp = self._columns.timestamp[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                mask &= timestamp >= to_seconds(start)
+            if end is not None:
+                mask &= timestamp < to_seconds(end)
+            rows = rows[mask]
+        return rows
+
+    def _time_range_rows(self, start, end) -> np.ndarray | None:
+        if start is None and end is None:
+            return None
+        order = self.time_order
+        timestamp = self._columns.timestamp[order]
+        lo = 0 if start is None else np.searchsorted(timestamp, to_seconds(start), side="left")
+        hi = len(order) if end is None else np.searchsorted(timestamp, to_seconds(end), side="left")
+        return order[lo:hi]
+
+    def take(self, rows: np.ndarray) -> IndicatorColumns:
+        self._build()
+        return IndicatorColumns(*(c[rows] for c in self._columns))
+
+    def latest(self, indicator_type: IndicatorType, source_ids: Sequence[Hashable], before=None) -> np.ndarray:
+        """Most recent value of a type per source id (NaN when none), optionally strictly before a time"""
+        self._build()
+        codes = np.array([self._source_codes.get(s, -1) for s in source_ids], dtype=np.int64)
+        result = np.full(len(codes), np.nan)
+        known = codes >= 0
+        keys = codes[known] * len(INDICATOR_TYPES) + TYPE_CODES[IndicatorType(indicator_type)]
+        lo, hi = self._offsets[keys], self._offsets[keys + 1]
+        if before is not None:
+            # per-key binary search of the time bound inside each sorted block
+            timestamp = self._columns.timestamp
+            bound = to_seconds(before)
+            hi = np.array([l + np.searchsorted(timestamp[l:h], bound, side="left") for l, h in zip(lo, hi)],
+                          dtype=np.int64).reshape(lo.shape)
+        present = hi > lo
+        values = np.full(len(keys), np.nan)
+        values[present] = self._columns.value[hi[present] - 1]
+        result[known] = values
+        return result
+
+    def subset(self, rows: np.ndarray) -> "IndicatorStore":
+        """
+        New store with the given rows. Its sources are re-encoded to the ones present in the rows, so its
+        index stays proportional to the rows taken rather than to every source of this store.
+        """
+        columns = self.take(np.asarray(rows, dtype=np.int64))
+        used, local = np.unique(columns.source_code, return_inverse=True)
+        store = IndicatorStore(freq=self.freq)
+        store.source_ids = [self.source_ids[code] for code in used.tolist()]
+        store._source_codes = {source_id: i for i, source_id in enumerate(store.source_ids)}
+        store._parents = self._parents
+        store._columns = columns._replace(source_code=local.astype(np.int32).reshape(-1))
+        store._offsets = None
+        return store
+
+    def split(self, source_groups: Mapping[Hashable, Hashable]) -> Dict[Hashable, "IndicatorStore"]:
+        """Partition rows by the group of their source, e.g. source id -> cross id; unmapped sources are dropped"""
+        self._build()
+        group_keys = list(dict.fromkeys(source_groups.values()))
+        group_codes = {g: i for i, g in enumerate(group_keys)}
+        per_source = np.array(
+            [group_codes.get(source_groups.get(s), -1) if s in source_groups else -1 for s in self.source_ids],
+            dtype=np.int64,
+        )
+        row_group = per_source[self._columns.source_code] if len(per_source) else np.empty(0, np.int64)
+        order = np.argsort(row_group, kind="stable")
+        bounds = np.searchsorted(row_group[order], np.arange(len(group_keys) + 1))
+        return {
+            group: self.subset(order[bounds[i]:bounds[i + 1]])
+            for i, group in enumerate(group_keys)
+            if bounds[i + 1] > bounds[i]
+        }
+
+    # ------------------------------------------------------------------ compatibility
+
+    def to_indicators(self, rows: np.ndarray | None = None) -> List[Indicator]:
+        columns = self.columns if rows is None else self.take(rows)
+        timestamp = columns.timestamp.astype(object)
+        timestamp[columns.timestamp == NO_TIMESTAMP] = None
+        return Indicator.from_arrays(
+            [INDICATOR_TYPES[t] for t in columns.type_code.tolist()],
+            [self.source_ids[s] for s in columns.source_code.tolist()],
+            columns.value,
+            self.freq,
+            timestamp,
+        )
+
+    def __iter__(self) -> Iterator[Indicator]:
+        return iter(self.to_indicators())
+
+
+def _as_list(value) -> list:
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return list(value)
+    return [value]
+
+
+def _ranges(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Concatenation of ``arange(lo[i], hi[i])`` without a Python loop"""
+    lengths = np.maximum(hi - lo, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    starts = np.repeat(lo - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return starts + np.arange(total)
@@ -8,22 +8,244 @@ Created     : 2026-01-10
 Description : Road network domain model
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, IntFlag, auto
-from typing import List, Union
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Tuple, Union
 
+import numpy as np
+import shapely
+from shapely import STRtree
 from shapely.geometry import LineString, Point
+from shapely.geometry.base import BaseGeometry
 
 
 # =========================
 # Road Network
 # =========================
 
+class _TrackedList(list):
+    """List calling ``on_change`` after every in-place mutation"""
+
+    def __init__(self, iterable=(), on_change: Callable[[], None] | None = None):
+        super().__init__(iterable)
+        self.on_change = on_change
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _notifying(method):
+    def wrapper(self, *args):
+        result = method(self, *args)
+        if self.on_change is not None:
+            self.on_change()
+        return result
+
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(_TrackedList, _name, _notifying(getattr(list, _name)))
+
+
 @dataclass
 class RoadNetwork:
-    """Road network"""
+    """
+    Road network
+
+    ``index`` (an id / adjacency / spatial index) and ``match_network`` (the map-matching input) are built
+    on first use. They are dropped whenever ``cross`` or ``road_segment`` is reassigned or mutated in
+    place; changes inside a cross or branch (e.g. appending a lane) are not tracked, call ``invalidate``
+    after them.
+
+    A network built by ``road_network_loader`` keeps its column tables in ``tables`` until the first such
+    change, so the index can map branch and lane ids without creating the lazy ``Branch``/``Lane`` objects.
+    """
     cross: List["Cross"]
     road_segment: List["RoadSegment"]
+    tables: Any = field(default=None, init=False, repr=False, compare=False)  # NetworkTables of the loader
+    _index: Union["RoadNetworkIndex", None] = field(default=None, init=False, repr=False, compare=False)
+    _match_network: Dict[str, list] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """ """
+        self.cross = self.cross
+        self.road_segment = self.road_segment
+
+    def __setattr__(self, name, value):
+        if name in ("cross", "road_segment"):
+            value = _TrackedList(value, self.invalidate)
+            self.invalidate()
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        return {"cross": list(self.cross), "road_segment": list(self.road_segment)}
+
+    def __setstate__(self, state):
+        self.cross = state["cross"]
+        self.road_segment = state["road_segment"]
+
+    def invalidate(self) -> None:
+        """Drop the index, the matching network and the loader tables; the first two are rebuilt on next use"""
+        object.__setattr__(self, "tables", None)
+        object.__setattr__(self, "_index", None)
+        object.__setattr__(self, "_match_network", None)
+
+    @property
+    def index(self) -> "RoadNetworkIndex":
+        """ """
+        if self._index is None:
+            object.__setattr__(self, "_index", RoadNetworkIndex(self))
+        return self._index
+
+    @property
+    def match_network(self) -> Dict[str, list]:
+        """
+        The network in the ``{"nodes": [...], "edges": [...]}`` format of ``map_match``: crosses become
+        nodes, road segments become edges. Coordinates are read in bulk with shapely's array functions.
+        """
+        if self._match_network is None:
+            object.__setattr__(self, "_match_network", _to_match_network(self.cross, self.road_segment))
+        return self._match_network
+
+
+def _to_match_network(crosses: List["Cross"], segments: List["RoadSegment"]) -> Dict[str, list]:
+    locations = np.array([cross.location for cross in crosses], dtype=object)
+    xs, ys = shapely.get_x(locations).tolist(), shapely.get_y(locations).tolist()
+    nodes = [
+        {"id": str(cross.id), "name": str(cross.name or ""), "x": x, "y": y}
+        for cross, x, y in zip(crosses, xs, ys)
+    ]
+
+    geoms = np.array([segment.geom for segment in segments], dtype=object)
+    coords, owner = shapely.get_coordinates(geoms, return_index=True)
+    bounds = np.searchsorted(owner, np.arange(len(segments) + 1)).tolist()
+    coords = coords.tolist()
+    edges = [
+        {
+            "id": str(segment.id),
+            "name": str(segment.name or ""),
+            "length": float(segment.length),
+            "start_node_id": str(segment.start_cross_id),
+            "end_node_id": str(segment.end_cross_id),
+            "geom": coords[bounds[i]:bounds[i + 1]],
+        }
+        for i, segment in enumerate(segments)
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+class RoadNetworkIndex:
+    """
+    Lookups over a ``RoadNetwork``: objects by id, the cross of every branch and lane, segments per cross
+    and per branch, and STRtrees over cross locations and branch geometries (built on first spatial query).
+
+    The id maps are read from the loader tables when the network has them, so building the index does not
+    touch the lazy branch and lane lists; ``branch`` and ``lane`` (id -> object) load them on first access.
+    """
+
+    def __init__(self, network: RoadNetwork):
+        self.network = network
+        self.cross: Dict[str | int, Cross] = {cross.id: cross for cross in network.cross}
+        self.segment: Dict[str | int, RoadSegment] = {}
+        self.branch_cross: Dict[str | int, str | int] = {}  # branch id -> cross id
+        self.lane_branch: Dict[str | int, str | int] = {}  # lane id -> branch id
+        tables = network.tables
+        if tables is not None:
+            branch_ids = tables.branch["id"]
+            branch_owner = np.repeat(np.arange(len(tables.cross["id"])), np.diff(tables.branch_offsets))
+            lane_owner = np.repeat(np.arange(len(branch_ids)), np.diff(tables.lane_offsets))
+            self.branch_cross = dict(zip(branch_ids.tolist(), tables.cross["id"][branch_owner].tolist()))
+            self.lane_branch = dict(zip(tables.lane["id"].tolist(), branch_ids[lane_owner].tolist()))
+        else:
+            for cross in network.cross:
+                for branch in cross.branch:
+                    self.branch_cross[branch.id] = cross.id
+                    for lane in branch.lane:
+                        self.lane_branch[lane.id] = branch.id
+        self.cross_segments: Dict[str | int, List[RoadSegment]] = {cross_id: [] for cross_id in self.cross}
+        self.branch_segments: Dict[str | int, List[RoadSegment]] = {branch_id: [] for branch_id in self.branch_cross}
+        for segment in network.road_segment:
+            self.segment[segment.id] = segment
+            for cross_id in {segment.start_cross_id, segment.end_cross_id}:
+                self.cross_segments.setdefault(cross_id, []).append(segment)
+            for branch_id in {segment.start_branch_id, segment.end_branch_id}:
+                self.branch_segments.setdefault(branch_id, []).append(segment)
+
+    @cached_property
+    def branch(self) -> Dict[str | int, "Branch"]:
+        """ """
+        return {branch.id: branch for cross in self.network.cross for branch in cross.branch}
+
+    @cached_property
+    def lane(self) -> Dict[str | int, "Lane"]:
+        """ """
+        return {lane.id: lane for cross in self.network.cross for branch in cross.branch for lane in branch.lane}
+
+    def lane_cross(self, lane_id: str | int) -> str | int:
+        """ """
+        return self.branch_cross[self.lane_branch[lane_id]]
+
+    def source_cross(self, source_id: str | int) -> str | int | None:
+        """Cross a cross, branch or lane id belongs to"""
+        if source_id in self.cross:
+            return source_id
+        if source_id in self.branch_cross:
+            return self.branch_cross[source_id]
+        branch_id = self.lane_branch.get(source_id)
+        return None if branch_id is None else self.branch_cross[branch_id]
+
+    def segment_branches(self, segment_id: str | int) -> Tuple[Union["Branch", None], Union["Branch", None]]:
+        """Start and end branch of a segment"""
+        segment = self.segment[segment_id]
+        return self.branch.get(segment.start_branch_id), self.branch.get(segment.end_branch_id)
+
+    def neighbours(self, cross_id: str | int) -> List[str | int]:
+        """Crosses joined to a cross by a segment"""
+        result = {}
+        for segment in self.cross_segments.get(cross_id, []):
+            other = segment.end_cross_id if segment.start_cross_id == cross_id else segment.start_cross_id
+            if other != cross_id:
+                result[other] = None
+        return list(result)
+
+    # ---------------------------------------------------------------- spatial
+
+    @cached_property
+    def _cross_tree(self) -> Tuple[STRtree, List["Cross"]]:
+        crosses = [cross for cross in self.network.cross if cross.location is not None]
+        return STRtree([cross.location for cross in crosses]), crosses
+
+    @cached_property
+    def _branch_tree(self) -> Tuple[STRtree, List["Branch"]]:
+        branches = [branch for cross in self.network.cross for branch in cross.branch if branch.geom is not None]
+        return STRtree([branch.geom for branch in branches]), branches
+
+    @staticmethod
+    def _query(tree: Tuple[STRtree, list], geometry: BaseGeometry, distance: float) -> list:
+        strtree, items = tree
+        if distance > 0:
+            hits = strtree.query(geometry, predicate="dwithin", distance=distance)
+        else:
+            hits = strtree.query(geometry, predicate="intersects")
+        return [items[i] for i in np.sort(hits)]
+
+    def crosses_near(self, geometry: BaseGeometry, distance: float = 0.0) -> List["Cross"]:
+        """Crosses within ``distance`` of a geometry"""
+        return self._query(self._cross_tree, geometry, distance)
+
+    def branches_near(self, geometry: BaseGeometry, distance: float = 0.0) -> List["Branch"]:
+        """Branches whose geometry is within ``distance`` of a geometry"""
+        return self._query(self._branch_tree, geometry, distance)
+
+    def nearest_cross(self, geometry: BaseGeometry) -> Union["Cross", None]:
+        """ """
+        strtree, crosses = self._cross_tree
+        i = strtree.nearest(geometry)
+        return None if i is None else crosses[i]
 
 
 # =========================
@@ -36,7 +258,7 @@ class CrossType(str, Enum):
     SIGNAL = "signal"
 
 
-@dataclass
+@dataclass(slots=True)
 class Cross:
     """Intersection"""
     id: str | int
@@ -69,7 +291,7 @@ class DirectionType(str, Enum):
     EAST_SOUTH = "east_south"
 
 
-@dataclass
+@dataclass(slots=True)
 class Branch:
     """Intersection branch"""
     id: str | int
@@ -116,7 +338,7 @@ class LaneTurnType(IntFlag):
     ALL = STRAIGHT | LEFT | RIGHT | UTURN
 
 
-@dataclass
+@dataclass(slots=True)
 class Lane:
     """Lane"""
     id: str | int
@@ -133,7 +355,7 @@ class Lane:
 # Road Segment
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class RoadSegment:
     """Road segment between two intersections"""
     id: str | int
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : road_network_loader
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Bulk GeoParquet / GeoJSON loaders with lazily built branches and lanes
+"""
+
+import json
+from collections.abc import MutableSequence
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Type
+
+import numpy as np
+import shapely
+
+from aitbox.schemas.road_network import (
+    Branch,
+    BranchType,
+    Cross,
+    CrossType,
+    DirectionType,
+    Lane,
+    LaneTurnType,
+    LaneType,
+    RoadNetwork,
+    RoadSegment,
+)
+
+Columns = Dict[str, np.ndarray]
+
+# Expected columns per layer, besides ``geometry``; the ones with a default may be missing
+CROSS_COLUMNS = {"id": None, "name": "", "type": CrossType.NORMAL}
+BRANCH_COLUMNS = {"id": None, "cross_id": None, "name": "", "type": None, "direction": None}
+LANE_COLUMNS = {
+    "id": None, "branch_id": None, "seq_num": None, "group": 0, "broaden": False, "flow_type": BranchType.IN,
+    "turn_type": None, "lane_type": LaneType.REGULAR, "width": 3.5,
+}
+SEGMENT_COLUMNS = {
+    "id": None, "name": "", "length": None, "start_branch_id": None, "end_branch_id": None,
+    "start_cross_id": None, "end_cross_id": None,
+}
+
+
+class LazyList(MutableSequence):
+    """List whose items are produced by ``factory`` on first access; pickles as a plain list"""
+    __slots__ = ("_factory", "_items")
+
+    def __init__(self, factory: Callable[[], list]):
+        self._factory = factory
+        self._items: list | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._items is not None
+
+    def _load(self) -> list:
+        if self._items is None:
+            self._items, self._factory = self._factory(), None
+        return self._items
+
+    def __getitem__(self, i):
+        return self._load()[i]
+
+    def __setitem__(self, i, value):
+        self._load()[i] = value
+
+    def __delitem__(self, i):
+        del self._load()[i]
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def insert(self, i, value) -> None:
+        self._load().insert(i, value)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, LazyList)):
+            return self._load() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._load())
+
+    def __reduce__(self):
+        return list, (self._load(),)
+
+
+class NetworkTables:
+    """
+    Columnar backing store of crosses, branches and lanes.
+
+    Branch rows are grouped by cross and lane rows by branch, with CSR offsets, so the branches of the
+    i-th cross are rows ``branch_offsets[i]:branch_offsets[i + 1]``. ``Branch`` and ``Lane`` objects are
+    only created when ``branches`` / ``lanes`` are called, which the ``LazyList`` of a cross or branch
+    does on first access.
+    """
+
+    def __init__(self, cross: Columns, branch: Columns, lane: Columns):
+        self.cross = cross
+        cross_of_branch = _positions(cross["id"], branch["cross_id"], "branch.cross_id")
+        order = np.argsort(cross_of_branch, kind="stable")
+        self.branch = {name: column[order] for name, column in branch.items()}
+        self.branch_offsets = np.searchsorted(cross_of_branch[order], np.arange(len(cross["id"]) + 1))
+
+        branch_of_lane = _positions(self.branch["id"], lane["branch_id"], "lane.branch_id")
+        order = np.lexsort((lane["seq_num"], branch_of_lane))
+        self.lane = {name: column[order] for name, column in lane.items()}
+        self.lane_offsets = np.searchsorted(branch_of_lane[order], np.arange(len(self.branch["id"]) + 1))
+
+    def crosses(self) -> List[Cross]:
+        c = self.cross
+        return [
+            Cross(cross_id, name, cross_type, location, LazyList(partial(self.branches, i)))
+            for i, (cross_id, name, cross_type, location) in enumerate(
+                zip(c["id"].tolist(), c["name"].tolist(), c["type"].tolist(), c["geometry"].tolist())
+            )
+        ]
+
+    def branches(self, i: int) -> List[Branch]:
+        """Branches of the i-th cross"""
+        lo, hi = int(self.branch_offsets[i]), int(self.branch_offsets[i + 1])
+        b = {name: column[lo:hi].tolist() for name, column in self.branch.items()}
+        return [
+            Branch(branch_id, name, branch_type, direction, geom, LazyList(partial(self.lanes, lo + k)))
+            for k, (branch_id, name, branch_type, direction, geom) in enumerate(
+                zip(b["id"], b["name"], b["type"], b["direction"], b["geometry"])
+            )
+        ]
+
+    def lanes(self, j: int) -> List[Lane]:
+        """Lanes of the j-th branch"""
+        lo, hi = int(self.lane_offsets[j]), int(self.lane_offsets[j + 1])
+        if lo == hi:
+            return []
+        c = {name: self.lane[name][lo:hi].tolist() for name in LANE_COLUMNS if name != "branch_id"}
+        return [
+            Lane(*row)
+            for row in zip(c["id"], c["seq_num"], c["group"], c["broaden"], c["flow_type"], c["turn_type"],
+                           c["lane_type"], c["width"])
+        ]
+
+
+def build_road_network(cross: Columns, branch: Columns, lane: Columns, road_segment: Columns | None = None
+                       ) -> RoadNetwork:
+    """
+    ``RoadNetwork`` from column arrays per layer, geometries already decoded into a ``geometry`` column.
+
+    Crosses and road segments are created at once; branches and lanes stay in a ``NetworkTables`` store
+    until a cross's ``branch`` (or a branch's ``lane``) list is first touched. The store is kept as the
+    network's ``tables`` so that ``network.index`` can be built from its columns.
+    """
+    cross = _normalize(cross, CROSS_COLUMNS, {"type": CrossType}, "cross")
+    branch = _normalize(branch, BRANCH_COLUMNS, {"type": BranchType, "direction": DirectionType}, "branch")
+    lane = _normalize(lane, LANE_COLUMNS, {"flow_type": BranchType, "turn_type": LaneTurnType,
+                                           "lane_type": LaneType}, "lane", geometry=False)
+    lane["seq_num"] = lane["seq_num"].astype(np.int64)
+    lane["group"] = lane["group"].astype(np.int64)
+    lane["broaden"] = lane["broaden"].astype(bool)
+    lane["width"] = lane["width"].astype(np.float64)
+    tables = NetworkTables(cross, branch, lane)
+
+    segments = []
+    if road_segment is not None and len(next(iter(road_segment.values()), ())):
+        if "length" not in road_segment:
+            road_segment = {**road_segment, "length": shapely.length(road_segment["geometry"])}
+        s = _normalize(road_segment, SEGMENT_COLUMNS, {}, "road_segment")
+        segments = [
+            RoadSegment(*row)
+            for row in zip(s["id"].tolist(), s["name"].tolist(), s["geometry"].tolist(),
+                           s["length"].astype(np.float64).tolist(), s["start_branch_id"].tolist(),
+                           s["end_branch_id"].tolist(), s["start_cross_id"].tolist(), s["end_cross_id"].tolist())
+        ]
+    network = RoadNetwork(tables.crosses(), segments)
+    network.tables = tables
+    return network
+
+
+def read_geoparquet(cross: str | Path, branch: str | Path, lane: str | Path,
+                    road_segment: str | Path | None = None) -> RoadNetwork:
+    """
+    Load a road network from one GeoParquet file per layer (WKB geometry encoding).
+
+    Columns follow the schema fields, plus ``cross_id`` on branches and ``branch_id`` on lanes; the
+    geometry column (``location`` of a cross, ``geom`` of a branch or segment) is the file's primary
+    geometry column. The lane file may be plain Parquet.
+    """
+    layers = [_read_parquet(path) for path in (cross, branch, lane)]
+    return build_road_network(*layers, _read_parquet(road_segment) if road_segment is not None else None)
+
+
+def read_geojson(cross: str | Path | Mapping, branch: str | Path | Mapping, lane: str | Path | Mapping,
+                 road_segment: str | Path | Mapping | None = None) -> RoadNetwork:
+    """
+    Load a road network from one GeoJSON FeatureCollection (path or parsed dict) per layer.
+
+    Properties follow the same columns as ``read_geoparquet``; lane features may have a null geometry.
+    """
+    layers = [_read_geojson(source) for source in (cross, branch, lane)]
+    return build_road_network(*layers, _read_geojson(road_segment) if road_segment is not None else None)
+
+
+# ---------------------------------------------------------------------- readers
+
+def _read_parquet(path: str | Path) -> Columns:
+    import polars as pl
+
+    geometry_column, encoding = "geometry", "WKB"
+    geo = pl.read_parquet_metadata(path).get("geo")
+    if geo:
+        geo = json.loads(geo)
+        geometry_column = geo.get("primary_column", geometry_column)
+        encoding = geo.get("columns", {}).get(geometry_column, {}).get("encoding", encoding)
+    if encoding.upper() != "WKB":
+        raise ValueError(f"Unsupported GeoParquet geometry encoding: {encoding}")
+
+    frame = pl.read_parquet(path)
+    columns = {name: frame[name].to_numpy() for name in frame.columns if name != geometry_column}
+    if geometry_column in frame.columns:
+        columns["geometry"] = shapely.from_wkb(frame[geometry_column].to_numpy())
+    return columns
+
+
+def _read_geojson(source: str | Path | Mapping) -> Columns:
+    if not isinstance(source, Mapping):
+        with open(source, encoding="utf-8") as f:
+            source = json.load(f)
+    features = source["features"]
+    properties = [feature.get("properties") or {} for feature in features]
+    names = list(dict.fromkeys(name for p in properties for name in p))
+    columns = {name: _array([p.get(name) for p in properties]) for name in names}
+    geometries = [feature.get("geometry") for feature in features]
+    if any(g is not None for g in geometries):
+        columns["geometry"] = _geometries_from_geojson(geometries)
+    return columns
+
+
+def _geometries_from_geojson(geometries: List[dict | None]) -> np.ndarray:
+    """Points and LineStrings built with one vectorized shapely call per geometry type"""
+    result = np.full(len(geometries), None, dtype=object)
+    by_type: Dict[str, List[int]] = {}
+    for i, geometry in enumerate(geometries):
+        if geometry is not None:
+            by_type.setdefault(geometry["type"], []).append(i)
+    for geometry_type, rows in by_type.items():
+        coordinates = [geometries[i]["coordinates"] for i in rows]
+        if geometry_type == "Point":
+            result[rows] = shapely.points(np.array(coordinates, dtype=np.float64)[:, :2])
+        elif geometry_type == "LineString":
+            counts = np.array([len(c) for c in coordinates])
+            flat = np.array([xy[:2] for c in coordinates for xy in c], dtype=np.float64)
+            result[rows] = shapely.linestrings(flat, indices=np.repeat(np.arange(len(rows)), counts))
+        else:
+            raise ValueError(f"Unsupported geometry type: {geometry_type}")
+    return result
+
+
+# ---------------------------------------------------------------------- columns
+
+def _array(values: list) -> np.ndarray:
+    array = np.array(values)
+    if array.dtype.kind in "US":
+        return np.array(values, dtype=object)
+    return array
+
+
+def _normalize(columns: Columns, expected: Dict[str, Any], enums: Dict[str, Type[Enum]], layer: str,
+               geometry: bool = True) -> Columns:
+    """Fill defaults, check required columns and convert enum columns"""
+    columns = dict(columns)
+    n = len(next(iter(columns.values()), ()))
+    for name, default in expected.items():
+        if name not in columns:
+            if default is None:
+                raise ValueError(f"{layer} is missing column {name!r}")
+            columns[name] = np.empty(n, dtype=object)
+            columns[name][:] = default  # np.full would treat str enums as strings
+    if geometry and "geometry" not in columns:
+        raise ValueError(f"{layer} has no geometry column")
+    for name, enum in enums.items():
+        columns[name] = _enum_column(columns[name], enum)
+    for name in ("id", "name") + tuple(k for k in expected if k.endswith("_id")):
+        if name in columns:
+            columns[name] = np.asarray(columns[name], dtype=object)
+    return columns
+
+
+def _enum_column(values: np.ndarray, enum: Type[Enum]) -> np.ndarray:
+    """Enum members for a column of values or member names, converting each distinct value once"""
+    values = np.asarray(values, dtype=object)
+    lookup = {}
+    for value in dict.fromkeys(values.tolist()):
+        if isinstance(value, enum):
+            lookup[value] = value
+        elif isinstance(value, str) and value in enum.__members__:
+            lookup[value] = enum[value]
+        else:
+            lookup[value] = enum(value)
+    result = np.empty(len(values), dtype=object)
+    result[:] = [lookup[v] for v in values.tolist()]
+    return result
+
+
+def _positions(ids: np.ndarray, keys: np.ndarray, name: str) -> np.ndarray:
+    """Position of every key in ``ids``"""
+    import pandas as pd
+
+    positions = pd.Index(ids).get_indexer(keys)
+    if (positions < 0).any():
+        missing = np.asarray(keys, dtype=object)[positions < 0][:5].tolist()
+        raise ValueError(f"{name} references unknown ids: {missing}")
+    return positions
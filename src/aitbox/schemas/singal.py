@@ -23,7 +23,7 @@ class SignalSchemaType(str, Enum):
     ADAPTIVE = "adaptive"  # 自适应
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalSchema:
     type: SignalSchemaType
     rings: List["Ring"]  # 相位结构：决定了交叉口相位的结构以多环的形式组织。
@@ -31,48 +31,39 @@ class SignalSchema:
     running_time: List[int]  # 每个环上每个相位运行的时间（s）
 
 
-@dataclass
+@dataclass(slots=True)
 class ActuatedSignalSchema(SignalSchema):
     """Actuatedsignalschema """
 
-    def __init__(self):
-        super().__init__()
-
     max_break_gap: float  # 最大切断间隔
     start_green: int  # 相位初始绿灯时间
 
 
-@dataclass
+@dataclass(slots=True)
 class AdaptiveSignalSchema(SignalSchema):
-    """Actuatedsignalschema """
+    """Adaptivesignalschema """
 
-    def __init__(self):
-        super().__init__()
 
-
-@dataclass
+@dataclass(slots=True)
 class CyclerSignalSchema(SignalSchema):
     """Cyclersignalschema """
 
-    def __init__(self):
-        super().__init__()
-
     cycle: int  # 信号周期
     min_cycle: int  # 方案的最小周期
     max_cycle: int  # 方案的最大周期
     phase_offset: int  # 相位差
 
 
-@dataclass
+@dataclass(slots=True)
 class Ring:
     phases: List["Phase"]
 
-@dataclass
+@dataclass(slots=True)
 class Phase:
     id: str | int
     type: PhaseType  # 相位类型
 
-@dataclass
+@dataclass(slots=True)
 class CyclerPhase(Phase):
     green: int  # 绿灯时间
     min_green: int  # 最小绿
@@ -84,7 +75,7 @@ class CyclerPhase(Phase):
     barrier_id: int  # 屏障区编号
 
 
-@dataclass
+@dataclass(slots=True)
 class ActuatedPhase(Phase):
     min_green: int  # 初始绿灯时间
     green_extend_unit: int  # 绿灯单位延长时间
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : __init__.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description :
+"""
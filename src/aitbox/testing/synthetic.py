@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : synthetic
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description : Synthetic crosses and signal schemas for the signal model tests and benchmarks
+"""
+
+from shapely.geometry import LineString, Point
+
+from aitbox.schemas.road_network import (
+    Branch,
+    BranchType,
+    Cross,
+    CrossType,
+    DirectionType,
+    Lane,
+    LaneTurnType,
+)
+from aitbox.schemas.singal import CyclerPhase, PhaseType, Ring
+
+DIRECTIONS = (DirectionType.NORTH, DirectionType.EAST, DirectionType.SOUTH, DirectionType.WEST)
+OFFSETS = {
+    DirectionType.NORTH: (0, 1),
+    DirectionType.EAST: (1, 0),
+    DirectionType.SOUTH: (0, -1),
+    DirectionType.WEST: (-1, 0),
+}
+TURNS = (LaneTurnType.LEFT, LaneTurnType.STRAIGHT, LaneTurnType.STRAIGHT_RIGHT)
+
+
+def make_cross(cross_id="c1", x=0.0, y=0.0, cross_type=CrossType.SIGNAL, turns=TURNS) -> Cross:
+    """Four-arm cross with one entry and one exit branch per direction"""
+    branches = []
+    for direction in DIRECTIONS:
+        dx, dy = OFFSETS[direction]
+        geom = LineString([(x + dx * 100, y + dy * 100), (x, y)])
+        lanes = [
+            Lane(f"{cross_id}_{direction.value}_{i}", i, 0, False, BranchType.IN, turn)
+            for i, turn in enumerate(turns)
+        ]
+        branches.append(Branch(f"{cross_id}_{direction.value}_in", direction.value, BranchType.IN, direction,
+                               geom, lanes))
+        branches.append(Branch(f"{cross_id}_{direction.value}_out", direction.value, BranchType.OUT, direction,
+                               LineString(list(geom.coords)[::-1]), []))
+    return Cross(cross_id, cross_id, cross_type, Point(x, y), branches)
+
+
+def make_phases(num_phases=4, green=20, min_green=10, max_green=60) -> list:
+    """Single-ring phases, two per barrier"""
+    return [
+        CyclerPhase(i, PhaseType.NORMAL, green, min_green, max_green, 3, 3, 2, 3, i // 2)
+        for i in range(num_phases)
+    ]
+
+
+def make_rings(num_phases=4, **kwargs) -> list:
+    """One ring of ``make_phases``"""
+    return [Ring(make_phases(num_phases, **kwargs))]
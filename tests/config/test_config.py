@@ -8,9 +8,11 @@ Created     : 2025-12-27
 Description :
 """
 import pytest
+import yaml
 
-from aitbox.config.config import set_yaml_path
-from tests.config.machine import GPUInfo
+import aitbox.config.config as config_module
+from aitbox.config.config import LazyConfig, get_cfg, set_yaml_path
+from tests.config.machine import CPUInfo, GPUInfo, Machine
 
 
 @pytest.fixture(scope="function")
@@ -54,3 +56,127 @@ def test_gpu_info_init_override(config):
     """
     gpu = GPUInfo("ascend")
     assert gpu.name == "ascend"
+
+
+def test_config_lazy(config):
+    """
+    加载时不实例化任何节点, 访问时才构建, 且每个节点只构建一次
+    """
+    assert isinstance(config, LazyConfig)
+    assert not config._built
+
+    gpu = GPUInfo()
+    assert config._built[("gpu",)].name == gpu.name == "kunlun"
+    assert () not in config._built
+
+    assert config.gpu is config.node("gpu")
+    assert isinstance(config.root, Machine)
+    assert config.root.name == "HP"
+
+
+def test_find_by_type(config):
+    """
+    ConfigBase 按类型从索引中取 yaml 节点, 与递归查找的结果一致
+    """
+    assert config.find(CPUInfo) is config.cpu
+    assert config.find(Machine) is config.root
+    assert config.find(int) is None
+    assert CPUInfo().name == "apple"
+    assert CPUInfo().num == 1
+
+
+def test_dict_root(tmp_path):
+    """
+    根节点不是 _target_ 时, 按 key 只构建对应的子树
+    """
+    path = tmp_path / "machines.yaml"
+    path.write_text(yaml.safe_dump({
+        "machines": [
+            {"_target_": "tests.config.machine.CPUInfo", "name": "arm", "num": 8},
+            {"_target_": "tests.config.machine.GPUInfo", "name": "kunlun", "_partial_": True},
+        ],
+        "other": {"values": [1, 2]},
+    }), encoding="utf-8")
+    config = get_cfg(str(path))
+    assert config["other"] == {"values": [1, 2]}
+    assert ("machines",) not in config._built
+
+    cpu, gpu = config["machines"]
+    assert cpu.num == 8
+    assert gpu(cuda=False).cuda is False
+    assert config.root["machines"][0] is cpu
+
+
+def test_container_protocol(config, tmp_path):
+    """
+    in / len / 迭代与实例化后的根节点一致; 根节点为 dict 或 list 时不构建未访问的子树
+    """
+    assert isinstance(config.root, Machine) and not isinstance(config, Machine)
+
+    path = tmp_path / "machines.yaml"
+    path.write_text(yaml.safe_dump({
+        "machines": [{"_target_": "tests.config.machine.CPUInfo", "name": "arm"}],
+        "other": {"values": [1, 2]},
+    }), encoding="utf-8")
+    config = get_cfg(str(path))
+    assert "machines" in config and "missing" not in config
+    assert len(config) == 2 and list(config) == ["machines", "other"]
+    assert not config._built
+    with pytest.raises(KeyError):
+        config["missing"]
+
+    path = tmp_path / "list.yaml"
+    path.write_text(yaml.safe_dump([{"_target_": "tests.config.machine.CPUInfo", "name": "arm"}, 3]), encoding="utf-8")
+    config = get_cfg(str(path))
+    assert len(config) == 2 and 3 in config
+    assert config[-1] == 3 and config[0] is config.node(0)
+    assert [type(item) for item in config] == [CPUInfo, int]
+
+
+def test_same_type_nodes(tmp_path):
+    """
+    构建某个节点时创建的同类对象不取其它同类节点的值
+    """
+    path = tmp_path / "cpus.yaml"
+    path.write_text(yaml.safe_dump({
+        "machines": [
+            {"_target_": "tests.config.machine.CPUInfo", "name": "arm", "num": 8},
+            {"_target_": "tests.config.machine.CPUInfo", "name": "x86"},
+        ],
+    }), encoding="utf-8")
+    config = set_yaml_path(str(path))
+    try:
+        arm, x86 = config["machines"]
+        assert (arm.name, arm.num) == ("arm", 8)
+        assert (x86.name, x86.num) == ("x86", 1)
+        # 根节点为 dict 时其下的节点同样提供 ConfigBase 默认值
+        assert CPUInfo().num == 8
+    finally:
+        config_module.GLOBAL_CONFIG = None
+
+
+def test_dict_semantics(tmp_path):
+    """
+    get / == 与实例化后的根节点一致
+    """
+    path = tmp_path / "plain.yaml"
+    path.write_text(yaml.safe_dump({"other": {"values": [1, 2]}}), encoding="utf-8")
+    config = get_cfg(str(path))
+    assert config.get("missing", 5) == 5 and config.get("missing") is None
+    assert config.get("other") == {"values": [1, 2]}
+    assert config == {"other": {"values": [1, 2]}} and config == get_cfg(str(path))
+    assert config != {"other": {}}
+
+
+def test_not_recursive(tmp_path):
+    """
+    _recursive_: False 的节点整体交给 hydra, 其下的 _target_ 保持为普通 dict
+    """
+    cpu = {"_target_": "tests.config.machine.CPUInfo", "name": "arm", "num": 8}
+    path = tmp_path / "not_recursive.yaml"
+    path.write_text(yaml.safe_dump({
+        "spec": {"_target_": "builtins.dict", "_recursive_": False, "cpu": cpu},
+    }), encoding="utf-8")
+    config = get_cfg(str(path))
+    assert config["spec"] == {"cpu": cpu}
+    assert config.find(CPUInfo) is None
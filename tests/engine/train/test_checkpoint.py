@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_checkpoint.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description :
+"""
+
+import os
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from aitbox.engine.train.callbacks.checkpoint import CheckpointCallback
+from aitbox.engine.train.trainer import Trainer
+from tests.engine.train.test_trainer import Model, TrainModel
+
+
+def _fit(callback, epochs=2):
+    """ """
+    torch.manual_seed(0)
+    dataset = TensorDataset(torch.randn(32, 10), torch.randn(32, 1))
+    dataloader = DataLoader(dataset, batch_size=8, shuffle=True)
+    trainer = Trainer(
+        model=TrainModel(Model(in_dim=10, hidden_dim=16, out_dim=1)),
+        device=torch.device("cpu"),
+        callbacks=[callback],
+    )
+    trainer.fit(train_loader=dataloader, epochs=epochs)
+    return trainer
+
+
+def test_checkpoint_top_k(tmp_path):
+    """ """
+    _fit(CheckpointCallback(str(tmp_path), every_n_epochs=None, every_n_steps=1, top_k=3))
+
+    files = sorted(os.listdir(tmp_path))
+    assert files == ["epoch0002-step00000006.pt", "epoch0002-step00000007.pt", "epoch0002-step00000008.pt"]
+
+
+def test_checkpoint_resume_mid_epoch(tmp_path):
+    """ """
+    full = _fit(CheckpointCallback(str(tmp_path), every_n_steps=3, top_k=10))
+    assert os.path.exists(tmp_path / "epoch0001-step00000003.pt")
+
+    resumed = _fit(CheckpointCallback(
+        str(tmp_path / "resumed"), resume_from=str(tmp_path / "epoch0001-step00000003.pt")
+    ))
+
+    assert resumed.result_data.acc_batch_idx == full.result_data.acc_batch_idx
+    assert resumed.result_data.train_loss_list == full.result_data.train_loss_list
+    for p, q in zip(full.model.parameters(), resumed.model.parameters()):
+        assert torch.equal(p, q)
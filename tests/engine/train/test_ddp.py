@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_ddp.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description :
+"""
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from aitbox.engine.train.callbacks.ddp import DDPCallback
+from aitbox.engine.train.distributed import launch
+from aitbox.engine.train.trainer import Trainer
+from tests.engine.train.test_trainer import Model, TrainModel
+
+
+def _train(rank, world_size, save_dir):
+    """ """
+    torch.manual_seed(0)
+    dataset = TensorDataset(torch.randn(64, 10), torch.randn(64, 1))
+    dataloader = DataLoader(dataset, batch_size=8, shuffle=True)
+    trainer = Trainer(
+        model=TrainModel(Model(in_dim=10, hidden_dim=16, out_dim=1)),
+        device=torch.device("cpu"),
+        callbacks=[DDPCallback(bucket_cap_mb=1)],
+    )
+    trainer.fit(train_loader=dataloader, epochs=2, grad_accumulate_step=2)
+    assert len(trainer.train_loader_info.loader) == 64 // 8 // world_size
+    torch.save(
+        {
+            "params": [p.detach() for p in trainer.model.model.module.parameters()],
+            "train_loss": trainer.result_data.train_loss_list,
+        },
+        f"{save_dir}/rank{rank}.pt",
+    )
+
+
+def test_ddp_gloo(tmp_path):
+    """ """
+    launch(_train, 2, str(tmp_path))
+
+    rank0 = torch.load(tmp_path / "rank0.pt")
+    rank1 = torch.load(tmp_path / "rank1.pt")
+    assert rank0["train_loss"] == rank1["train_loss"]
+    for p, q in zip(rank0["params"], rank1["params"]):
+        assert torch.equal(p, q)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_profiler.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026-10-19
+Description :
+"""
+
+import os
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from aitbox.engine.train.callbacks.profiler import PHASES, ProfilerCallback
+from aitbox.engine.train.trainer import Trainer
+from tests.engine.train.test_trainer import Model, TrainModel
+
+
+def _fit(profiler, epochs=2):
+    """ """
+    dataset = TensorDataset(torch.randn(64, 10), torch.randn(64, 1))
+    dataloader = DataLoader(dataset, batch_size=8)
+    trainer = Trainer(
+        model=TrainModel(Model(in_dim=10, hidden_dim=16, out_dim=1)),
+        device=torch.device("cpu"),
+        callbacks=[profiler],
+    )
+    trainer.fit(train_loader=dataloader, epochs=epochs)
+    return trainer
+
+
+def test_profiler_phase_timing():
+    """ """
+    profiler = ProfilerCallback(verbose=False)
+    _fit(profiler)
+
+    assert len(profiler.history) == 2
+    stats = profiler.history[-1]
+    assert stats["num_batches"] == 8
+    assert stats["num_samples"] == 64
+    assert stats["throughput"] > 0
+    assert 0 <= stats["data_wait_ratio"] <= 1
+    for phase in PHASES:
+        assert stats[f"{phase}_ms"] >= 0
+
+
+def test_profiler_chrome_trace(tmp_path):
+    """ """
+    profiler = ProfilerCallback(
+        trace_dir=str(tmp_path), trace_start=2, trace_warmup=1, trace_active=2, verbose=False
+    )
+    _fit(profiler, epochs=1)
+
+    traces = [f for f in os.listdir(tmp_path) if f.endswith(".json")]
+    assert len(traces) == 1
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_green_wave
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from shapely.geometry import LineString
+
+from aitbox.models.signal.arterial.green_wave import GreenWaveSolver, travel_times
+from aitbox.schemas.road_network import RoadSegment
+from aitbox.schemas.singal import CyclerSignalSchema, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def make_corridor(lengths, green=10):
+    """Crosses joined by segments of the given lengths, each with four phases of ``green`` seconds"""
+    crosses = [make_cross(f"c{i}", x=i * 500.0) for i in range(len(lengths) + 1)]
+    segments = [
+        RoadSegment(f"s{i}", f"s{i}", LineString([(i * 500.0, 0), ((i + 1) * 500.0, 0)]), length,
+                    f"c{i}_east_out", f"c{i + 1}_west_in", f"c{i}", f"c{i + 1}")
+        for i, length in enumerate(lengths)
+    ]
+    cycle = 4 * (green + 5)
+    schemas = [
+        CyclerSignalSchema(SignalSchemaType.CYCLER, make_rings(green=green), [0], [0], cycle, 30, 180, 0)
+        for _ in crosses
+    ]
+    return crosses, segments, schemas
+
+
+def test_green_wave_half_cycle_spacing():
+    # 300 m at 36 km/h is 30 s, half the 60 s cycle: alternate offsets give full bands both ways
+    crosses, segments, schemas = make_corridor([300.0, 300.0])
+    result = GreenWaveSolver().optimize(crosses, segments, schemas, speeds=36.0)
+    assert result.bandwidth_out == 10 and result.bandwidth_in == 10
+    assert [s.phase_offset for s in result.schemas] == list(result.offsets) == [0, 30, 0]
+    assert schemas[1].phase_offset == 0
+
+
+def test_green_wave_matches_brute_force():
+    crosses, segments, schemas = make_corridor([170.0, 260.0], green=12)
+    solver = GreenWaveSolver()
+    result = solver.optimize(crosses, segments, schemas, speeds=40.0)
+
+    bins = schemas[0].cycle
+    travel = np.round(travel_times(crosses, segments, 40.0)).astype(np.int64)
+    green_start, green = np.zeros(3, dtype=np.int64), np.full(3, 12)
+    best = max(
+        sum(solver.bandwidths(np.array((0,) + offsets), green_start, green, travel, bins))
+        for offsets in itertools.product(range(bins), repeat=2)
+    )
+    assert result.bandwidth_out + result.bandwidth_in == best
+
+    # a warm start that is already optimal is kept
+    again = solver.optimize(crosses, segments, schemas, speeds=40.0, initial_offsets=result.offsets)
+    assert np.array_equal(again.offsets, result.offsets)
+
+
+@pytest.mark.parametrize("weights", [(1.0, 3.0), (3.0, 1.0)])
+def test_green_wave_weighted_matches_brute_force(weights):
+    # one-way bands score higher than any two-way split, including the inbound-only ones
+    crosses, segments, schemas = make_corridor([100.0, 350.0], green=12)
+    solver = GreenWaveSolver(weight_out=weights[0], weight_in=weights[1])
+    result = solver.optimize(crosses, segments, schemas, speeds=40.0)
+
+    bins = schemas[0].cycle
+    travel = np.round(travel_times(crosses, segments, 40.0)).astype(np.int64)
+    green_start, green = np.zeros(3, dtype=np.int64), np.full(3, 12)
+    best = max(
+        np.dot(weights, solver.bandwidths(np.array((0,) + offsets), green_start, green, travel, bins))
+        for offsets in itertools.product(range(bins), repeat=2)
+    )
+    assert np.dot(weights, (result.bandwidth_out, result.bandwidth_in)) == best == 36
+
+
+def test_green_wave_validation():
+    crosses, segments, schemas = make_corridor([300.0, 300.0])
+    with pytest.raises(ValueError):
+        GreenWaveSolver().solve(crosses, segments[:1], schemas)
+    schemas[2].cycle = 90
+    with pytest.raises(ValueError):
+        GreenWaveSolver().solve(crosses, segments, schemas)
@@ -1,6 +1,6 @@
 import numpy as np
 
-from aitbox.models.signal.isolated.cycler.webster import Webster
+from aitbox.models.signal.isolated.cycler.webster import Webster, WebsterStatus
 
 
 def test_webster_cycle():
@@ -8,4 +8,22 @@ def test_webster_cycle():
     l = np.array([5, 5, 5, 5])
     y = np.array([0.16, 0.17, 0.2, 0.15])
     cycle = webster_calc.get_cycle_by_webster(l, y)
-    print(f"cycle is {cycle}")
\ No newline at end of file
+    print(f"cycle is {cycle}")
+
+
+def test_webster_cycle_batch():
+    webster_calc = Webster(min_cycle=50, max_cycle=180)
+    l = [[5, 5, 5, 5], [4, 4, 4], [5, 5], [3, 3, 3, 3], []]
+    y = [[0.16, 0.17, 0.2, 0.15], [0.1, 0.1, 0.1], [0.5, 0.45], [0.3, 0.3, 0.3, 0.2], []]
+    result = webster_calc.get_cycle_by_webster_list(l, y)
+
+    assert result.cycle[0] == webster_calc.get_cycle_by_webster(np.array(l[0]), np.array(y[0]))
+    assert result.cycle[1] == webster_calc.get_cycle_by_webster(np.array(l[1]), np.array(y[1]))
+    assert result.cycle[2] == 180 and result.status[2] & WebsterStatus.NEAR_SATURATION
+    assert result.status[3] & WebsterStatus.OVERSATURATED
+    assert result.status[4] == WebsterStatus.EMPTY
+    assert result.status[0] == WebsterStatus.OK
+
+    assert len(result.green) == 13
+    np.testing.assert_allclose(result.green[:4].sum(), result.cycle[0] - 20)
+    np.testing.assert_allclose(result.green[:4] / result.green[:4].sum(), np.array(y[0]) / sum(y[0]))
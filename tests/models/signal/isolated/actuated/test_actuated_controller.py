@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_actuated_controller.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+
+from aitbox.models.signal.isolated.actuated.actuated_solver import ActuatedSolver
+from aitbox.models.signal.isolated.actuated.controller import ActuatedController, Termination, gap_breaks, green_end
+from aitbox.schemas.singal import ActuatedPhase, ActuatedSignalSchema, PhaseType, Ring, SignalSchemaType
+from aitbox.testing.synthetic import make_cross
+
+
+def make_schema(max_break_gap=3.0, running_phase=0):
+    phases = [ActuatedPhase(i, PhaseType.NORMAL, 10, 4, 40) for i in range(4)]
+    return ActuatedSignalSchema(SignalSchemaType.ACTUATED, [Ring(phases)], [running_phase], [0], max_break_gap, 8)
+
+
+def test_green_end():
+    times = np.array([9.0, 12.0, 14.0, 15.0, 17.0, 30.0])
+
+    def end(start, min_green, max_green, gap):
+        return green_end(times.tolist(), gap_breaks(times, gap), start, min_green, max_green, gap)
+
+    assert end(0.0, 10, 40, 3.0) == (12.0, Termination.GAP_OUT)
+    assert end(0.0, 10, 40, 3.5) == (20.5, Termination.GAP_OUT)
+    assert end(0.0, 10, 15, 3.5) == (15.0, Termination.MAX_OUT)
+    assert end(13.0, 1, 40, 3.0) == (20.0, Termination.GAP_OUT)
+    assert end(31.0, 10, 40, 3.0) == (41.0, Termination.GAP_OUT)
+
+
+def test_controller_replay():
+    cross = make_cross()
+    # 北进口直行车道每 2 秒一辆车，其余车道无车
+    actuations = {"c1_north_1": np.arange(0.0, 600.0, 2.0)}
+    controller = ActuatedController(transition=5.0)
+    timeline = controller.run_crosses([cross], [make_schema()], [actuations], horizon=600.0)[0]
+
+    assert list(timeline.phase[:4]) == [0, 1, 2, 3]
+    assert timeline.termination[0] == Termination.MAX_OUT and timeline.end[0] == 40.0
+    assert (timeline.end[1:4] - timeline.start[1:4] == 10).all()
+    assert np.allclose(timeline.start[1:], timeline.end[:-1] + 5.0)
+    assert timeline.end[-1] <= 600.0
+    assert timeline.state_at(47.0) == (1, 2.0)
+
+    # 无请求的相位被跳过，只剩有车的相位轮流运行
+    skip = ActuatedController(transition=5.0, recall=False)
+    timeline = skip.run_crosses([cross], [make_schema()], [actuations], horizon=600.0)[0]
+    assert set(timeline.phase.tolist()) == {0}
+
+
+def test_actuations_follow_rings():
+    """过车按环与屏障位置归入相位，与周期式求解器的车道-相位对应一致"""
+    cross = make_cross()
+    actuations = {"c1_east_0": np.array([1.0]), "c1_north_1": np.array([2.0])}
+    controller = ActuatedController()
+    # 两相位方案：南北、东西各一个相位，东进口左转归入第二相位
+    phases = [ActuatedPhase(i, PhaseType.NORMAL, 10, 4, 40) for i in range(2)]
+    schema = ActuatedSignalSchema(SignalSchemaType.ACTUATED, [Ring(phases)], [0], [0], 3.0, 8)
+    assert [times.tolist() for times in controller.phase_actuations(cross, schema, actuations)] == [[2.0], [1.0]]
+    assert [times.tolist() for times in controller.phase_actuations(cross, make_schema(), actuations)] == \
+        [[2.0], [], [], [1.0]]
+
+
+def test_actuated_solver():
+    cross = make_cross()
+    actuations = {"c1_north_1": np.arange(0.0, 600.0, 2.0)}
+    schema = make_schema()
+    result = ActuatedSolver().solve(cross, [], schema, actuations=actuations, now=47.0)
+    assert result.running_phase == [1] and result.running_time == [2]
+    assert schema.running_phase == [0]
+
+
+def replay(schema, phase_times, horizon, transition, recall):
+    """逐路口逐绿灯的参考回放"""
+    phases = schema.rings[0].phases
+    breaks = [gap_breaks(times, schema.max_break_gap) for times in phase_times]
+    last_end = [-np.inf] * len(phases)
+    p, start, records = schema.running_phase[0], 0.0, []
+    while start < horizon:
+        times = phase_times[p].tolist()
+        end, reason = green_end(times, breaks[p], start, phases[p].min_green, phases[p].max_green,
+                                schema.max_break_gap)
+        records.append((p, start, min(end, horizon), reason))
+        last_end[p], start = end, end + transition
+        following = [(p + k) % len(phases) for k in range(1, len(phases) + 1)]
+        requested = [q for q in following
+                     if np.any((phase_times[q] > last_end[q]) & (phase_times[q] <= start))]
+        p = following[0] if recall or not requested else requested[0]
+    return records
+
+
+def test_controller_matches_reference():
+    rng = np.random.default_rng(1)
+    schemas, merged = [], []
+    for c in range(20):
+        gap = float(rng.uniform(2.0, 4.0))
+        phases = [ActuatedPhase(i, PhaseType.NORMAL, int(rng.integers(5, 15)), 4, int(rng.integers(20, 60)))
+                  for i in range(int(rng.integers(2, 5)))]
+        schemas.append(ActuatedSignalSchema(SignalSchemaType.ACTUATED, [Ring(phases)],
+                                            [int(rng.integers(len(phases)))], [0], gap, 8))
+        rates = rng.uniform(0.0, 0.8, len(phases)) * (rng.random(len(phases)) < 0.7)
+        merged.append([np.sort(rng.uniform(0, 1800, rng.poisson(rate * 1800))) for rate in rates])
+
+    for recall in (True, False):
+        timelines = ActuatedController(transition=4.0, recall=recall).run(schemas, merged, horizon=1800.0)
+        for schema, phase_times, timeline in zip(schemas, merged, timelines):
+            expected = replay(schema, phase_times, 1800.0, 4.0, recall)
+            assert timeline.phase.tolist() == [r[0] for r in expected]
+            np.testing.assert_allclose(timeline.start, [r[1] for r in expected])
+            np.testing.assert_allclose(timeline.end, [r[2] for r in expected])
+            assert timeline.termination.tolist() == [r[3] for r in expected]
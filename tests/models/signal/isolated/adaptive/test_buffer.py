@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_buffer.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+import torch
+
+from aitbox.models.signal.isolated.adaptive.buffer import RingBuffer
+
+
+def _batch(start, n):
+    states = np.arange(start, start + n, dtype=np.float32)[:, None].repeat(4, axis=1)
+    actions = np.arange(start, start + n)
+    rewards = np.arange(start, start + n, dtype=np.float32)
+    return states, actions, rewards, states + 1, np.zeros(n, dtype=bool)
+
+
+def test_ring_buffer_wraps():
+    buffer = RingBuffer(capacity=10, seed=0)
+    buffer.add_batch(*_batch(0, 7))
+    assert buffer.size() == 7 and not buffer.is_full()
+
+    buffer.add_batch(*_batch(7, 6))
+    assert buffer.is_full()
+    assert sorted(buffer.actions.tolist()) == list(range(3, 13))
+
+    buffer.add_batch(*_batch(13, 25))
+    assert sorted(buffer.actions.tolist()) == list(range(28, 38))
+
+    buffer.add(np.full(4, 38.0), 38, 38.0, np.full(4, 39.0), True)
+    assert 28 not in buffer.actions and 38 in buffer.actions
+
+
+def test_ring_buffer_sample():
+    buffer = RingBuffer(capacity=100, seed=0)
+    buffer.add_batch(*_batch(0, 50))
+
+    states, actions, rewards, next_states, dones = buffer.sample(32)
+    assert states.shape == (32, 4) and rewards.shape == (32,) and dones.shape == (32,)
+    assert len(set(actions.tolist())) == 32
+    np.testing.assert_array_equal(states[:, 0], actions)
+    np.testing.assert_array_equal(next_states, states + 1)
+
+    again = RingBuffer(capacity=100, seed=0)
+    again.add_batch(*_batch(0, 50))
+    np.testing.assert_array_equal(again.sample(32)[1], actions)
+
+    assert len(buffer.sample(500)[0]) == 50
+
+
+def test_ring_buffer_tensor():
+    buffer = RingBuffer(capacity=100, seed=0, as_tensor=True)
+    buffer.add_batch(*_batch(0, 50))
+    batch = buffer.sample(8)
+    assert all(isinstance(x, torch.Tensor) for x in batch)
+    assert batch[4].dtype == torch.bool
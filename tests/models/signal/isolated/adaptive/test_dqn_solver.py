@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_dqn_solver.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+import pytest
+import torch
+
+from aitbox.models.signal.isolated.adaptive.dqn_solver import DQNSolver
+from aitbox.models.signal.isolated.adaptive.env import TrafficEnv
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.singal import SignalSchema, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def _learn(prioritized):
+    torch.manual_seed(0)
+    crosses = [make_cross(f"c{i}") for i in range(8)]
+    env = TrafficEnv.from_crosses(crosses, 400.0, episode_length=100, seed=0)
+    solver = DQNSolver(env.num_lanes, env.num_phases, hidden_dim=32, batch_size=32, sync_interval=4,
+                       prioritized=prioritized, seed=0)
+    history = solver.learn(env, iterations=4, steps_per_iteration=8, updates_per_iteration=4)
+    return crosses, solver, history
+
+
+def test_dqn_learn():
+    _, solver, history = _learn(prioritized=False)
+    assert len(history) == 4
+    assert solver.buffer.size() == 4 * 8 * 8
+    assert solver.epsilon < 1.0
+    # 回合只因时间上限截断，缓冲区中没有终止样本
+    assert not solver.buffer.dones[:solver.buffer.size()].any()
+    for online, target in zip(solver.train_model.model.parameters(), solver.train_model.target.parameters()):
+        assert torch.equal(online, target)
+
+
+def test_dqn_prioritized_and_solve_batch():
+    crosses, solver, _ = _learn(prioritized=True)
+    assert not np.allclose(solver.buffer.tree.get(np.arange(solver.buffer.size())), 1.0)
+
+    indicators = [Indicator(IndicatorType.QUEUE_LENGTH, "c0_north_1", 12.0, "5min")]
+    schemas = [SignalSchema(SignalSchemaType.ADAPTIVE, make_rings(2), [1], [15]) for _ in crosses]
+    result = solver.solve_batch(crosses, indicators, schemas)
+    assert all(r.running_phase[0] in (0, 1) for r in result)
+
+
+def test_dqn_truncated_target_bootstraps():
+    """dones 为 False 的样本（含截断）目标为 r + gamma * Q_target(s', argmax Q(s'))，终止样本只有 r"""
+    torch.manual_seed(0)
+    solver = DQNSolver(2, 2, hidden_dim=8)
+    model = solver.train_model
+    states, next_states = torch.rand(2, solver.state_dim), torch.rand(2, solver.state_dim)
+    states[:, -2:] = next_states[:, -2:] = 1.0  # 两个相位均有效
+    batch = {
+        "states": states, "actions": torch.zeros(2, dtype=torch.long), "rewards": torch.ones(2),
+        "next_states": next_states, "dones": torch.tensor([False, True]),
+    }
+    output = model.validate_step(batch)
+    with torch.no_grad():
+        q = model.model(batch["states"])[:, 0]
+        next_q = model.target(batch["next_states"]).gather(
+            1, model.model(batch["next_states"]).argmax(dim=1, keepdim=True)).squeeze(1)
+    expected = torch.stack([1 + model.gamma * next_q[0], torch.tensor(1.0)])
+    torch.testing.assert_close(q - output.prediction, expected)
+
+
+def test_observation_rejects_extra_phases():
+    crosses = [make_cross()]
+    solver = DQNSolver(12, 2, hidden_dim=8)
+    with pytest.raises(ValueError):
+        solver.solve_batch(crosses, [], [SignalSchema(SignalSchemaType.ADAPTIVE, make_rings(4), [0], [0])])
+    with pytest.raises(ValueError):
+        solver.solve_batch(crosses, [], [SignalSchema(SignalSchemaType.ADAPTIVE, make_rings(2), [3], [0])])
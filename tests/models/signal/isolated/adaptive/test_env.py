@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_env.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+
+from aitbox.models.signal.isolated.adaptive.env import TrafficEnv
+from aitbox.models.signal.isolated.cycler.webster_solver import WebsterSolver
+from aitbox.models.signal.isolated.movement import phase_lane_mask
+from aitbox.schemas.indicator import IndicatorType
+from aitbox.schemas.singal import SignalSchema, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def test_phase_lane_mask():
+    mask = phase_lane_mask(make_cross())
+    assert mask.shape == (4, 12)
+    # NS through serves the through and through-right lanes of the north and south approaches
+    assert mask[0].sum() == 4 and mask[1].sum() == 2
+    assert not (mask[0] & mask[2]).any()
+
+
+def test_env_mask_follows_rings():
+    """环境与周期式求解器共用按环与屏障的车道-相位对应，少相位方案也放行所有进口车道"""
+    cross = make_cross()
+    schemas = [SignalSchema(SignalSchemaType.ADAPTIVE, make_rings(n), [0], [0]) for n in (2, 3, 4)]
+    env = TrafficEnv.from_crosses([cross] * 3, 600.0, schemas)
+    for i, schema in enumerate(schemas):
+        n = len(schema.rings[0].phases)
+        expected = WebsterSolver().lane_phase_mapping(cross, schema.rings).mask
+        np.testing.assert_array_equal(env.phase_lane_mask[i, :n], expected)
+        assert env.phase_lane_mask[i].any(axis=0).all()
+
+
+def test_env_step():
+    crosses = [make_cross(f"c{i}") for i in range(3)]
+    schema = SignalSchema(SignalSchemaType.ADAPTIVE, make_rings(), [0], [0])
+    env = TrafficEnv.from_crosses(crosses, 600.0, [schema] * 3, step_length=5, episode_length=60, seed=0)
+    obs = env.reset()
+    assert obs.shape == (3, env.observation_dim)
+    assert env.min_green[0, 0] == 10 and env.transition[0, 0] == 5
+
+    total = np.zeros(3)
+    for t in range(12):
+        obs, rewards, terminated, truncated, info = env.step(np.full(3, (t // 4) % 4))
+        total += rewards
+        assert info["indicators"][IndicatorType.QUEUE_LENGTH].shape == (3, 12)
+    assert truncated.all() and not terminated.any() and (total < 0).all()
+    assert info["final_observation"].shape == obs.shape
+    assert np.all(obs[:, :12] == 0)
+
+    env.step(np.zeros(3))
+    indicators = env.indicators(0)
+    assert {i.type for i in indicators} == {IndicatorType.QUEUE_LENGTH, IndicatorType.DELAY}
+    assert indicators[0].source_id == "c0_north_0"
+
+
+def test_env_discharge():
+    env = TrafficEnv.from_crosses([make_cross()], 360.0, step_length=10, stochastic=False)
+    env.reset()
+    _, _, _, _, info = env.step(np.array([0]))
+    queue = info["indicators"][IndicatorType.QUEUE_LENGTH][0]
+    served = env.phase_lane_mask[0, 0]
+    np.testing.assert_allclose(queue[served], 0.0)
+    np.testing.assert_allclose(queue[~served], 1.0)
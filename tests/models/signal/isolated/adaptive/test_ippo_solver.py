@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_ippo_solver.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+import torch
+
+from aitbox.models.signal.isolated.adaptive.env import TrafficEnv
+from aitbox.models.signal.isolated.adaptive.ippo_solver import IPPOSolver, RolloutBuffer
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.singal import SignalSchema, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def test_gae():
+    buffer = RolloutBuffer(3, 2, 1, 2)
+    for t in range(3):
+        buffer.add(torch.zeros(2, 1), torch.ones(2, 2, dtype=torch.bool), torch.zeros(2, dtype=torch.long),
+                   torch.zeros(2), np.ones(2), np.array([False, t == 1]), torch.zeros(2))
+    buffer.compute_gae(torch.ones(2), gamma=0.5, gae_lambda=1.0)
+    np.testing.assert_allclose(buffer.returns[:, 0], [1.875, 1.75, 1.5])
+    np.testing.assert_allclose(buffer.returns[:, 1], [1.5, 1.0, 1.5])
+
+
+def test_gae_truncation():
+    """截断处用截断时刻观测的价值自举，而不是新回合第一个观测的价值"""
+    buffer = RolloutBuffer(3, 1, 1, 2)
+    for t in range(3):
+        buffer.add(torch.zeros(1, 1), torch.ones(1, 2, dtype=torch.bool), torch.zeros(1, dtype=torch.long),
+                   torch.zeros(1), np.ones(1), np.zeros(1, dtype=bool), torch.full((1,), float(t)),
+                   np.array([t == 1]), torch.full((1,), 4.0))
+    buffer.compute_gae(torch.ones(1), gamma=0.5, gae_lambda=1.0)
+    np.testing.assert_allclose(buffer.returns[:, 0], [1.5 + 0.25 * 4, 1 + 0.5 * 4, 1.5])
+
+
+def test_ippo_learn_and_solve_batch():
+    torch.manual_seed(0)
+    crosses = [make_cross(f"c{i}") for i in range(8)]
+    env = TrafficEnv.from_crosses(crosses, 400.0, episode_length=200, seed=0)
+    solver = IPPOSolver(env.num_lanes, env.num_phases, hidden_dim=32)
+    history = solver.learn(env, iterations=2, rollout_steps=16, ppo_epochs=2, batch_size=32)
+    assert len(history) == 2
+    assert solver.train_model.optimizer.state
+
+    indicators = [Indicator(IndicatorType.QUEUE_LENGTH, "c0_north_1", 12.0, "5min")]
+    schemas = [SignalSchema(SignalSchemaType.ADAPTIVE, make_rings(2), [1], [15]) for _ in crosses]
+    result = solver.solve_batch(crosses, indicators, schemas)
+    assert len(result) == len(crosses)
+    assert all(r.running_phase[0] in (0, 1) for r in result)
+    assert schemas[0].running_phase == [1]
+
+    single = solver.solve(crosses[0], indicators)
+    assert single.type == SignalSchemaType.ADAPTIVE
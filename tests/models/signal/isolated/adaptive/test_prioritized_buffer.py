@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_prioritized_buffer.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+
+from aitbox.models.signal.isolated.adaptive.prioritized_buffer import PrioritizedBuffer, SumTree
+
+
+def test_sum_tree():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 2.0, 3.0, 4.0, 0.5]))
+    assert tree.total == 10.5 and tree.min == 0.5
+    np.testing.assert_array_equal(tree.find(np.array([0.5, 1.5, 3.5, 9.9, 10.2])), [0, 1, 2, 3, 4])
+
+    tree.update(np.array([2, 2]), np.array([0.0, 0.0]))
+    assert tree.total == 7.5
+    assert 2 not in tree.find(np.linspace(0, 7.49, 100))
+
+
+def test_prioritized_buffer():
+    buffer = PrioritizedBuffer(capacity=1000, seed=0, alpha=1.0, beta=1.0)
+    n = 500
+    buffer.add_batch(np.random.rand(n, 4), np.arange(n), np.zeros(n), np.random.rand(n, 4), np.zeros(n))
+    assert np.isclose(buffer.tree.total, n)
+
+    td_errors = np.full(n, 0.1)
+    td_errors[7] = 100.0
+    buffer.update_priorities(np.arange(n), td_errors)
+
+    states, actions, rewards, next_states, dones, weights, indices = buffer.sample(64)
+    np.testing.assert_array_equal(actions, indices)
+    assert (indices == 7).sum() > 32
+    assert weights[indices == 7].max() < weights[indices != 7].min()
+    assert np.isclose(weights.max(), 1.0)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_cycler_solver.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+import pytest
+
+from aitbox.models.signal.isolated.cycler.simple_solver import SimpleSolver
+from aitbox.models.signal.isolated.cycler.webster_solver import WebsterSolver
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.models.signal.isolated.movement import phase_lane_mask
+from aitbox.schemas.singal import CyclerPhase, CyclerSignalSchema, PhaseType, Ring, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def lane_volumes(cross_id="c1"):
+    """每个方向的车道流量：左转、直行、直右"""
+    volumes = {"north": (180, 450, 450), "south": (180, 450, 450), "east": (90, 360, 360), "west": (90, 360, 360)}
+    return [
+        Indicator(IndicatorType.VOLUME, f"{cross_id}_{direction}_{i}", value, "15min")
+        for direction, values in volumes.items() for i, value in enumerate(values)
+    ]
+
+
+def test_webster_solver():
+    cross = make_cross()
+    schema = CyclerSignalSchema(SignalSchemaType.CYCLER, make_rings(), [0], [0], 100, 50, 180, 7)
+    solver = WebsterSolver()
+    result = solver.solve(cross, lane_volumes(), schema)
+
+    # ΣL = 4 * (3 + 2) = 20, ΣY = 0.25 + 0.1 + 0.2 + 0.05 = 0.6, C = 1.5 * 20 / 0.4 = 75
+    # 按流量比分配为 [23, 9, 18, 5]，抬到最小绿后多出的 6 秒按流量比从相位 0、2 中扣回
+    greens = [phase.green for phase in result.rings[0].phases]
+    assert greens == [19, 10, 16, 10]
+    assert result.cycle == sum(greens) + 4 * 5 == 75
+    assert (result.min_cycle, result.max_cycle, result.phase_offset) == (50, 180, 7)
+    assert result.type == SignalSchemaType.CYCLER
+    assert schema.rings[0].phases[0].green == 20
+
+
+def test_branch_indicators_and_cache():
+    cross = make_cross()
+    solver = WebsterSolver()
+    # 北进口整体 1350 veh/h 均分到 3 条车道，车道级 SATURATION 覆盖进口道流量
+    indicators = [
+        Indicator(IndicatorType.VOLUME, "c1_north_in", 1350, "15min"),
+        Indicator(IndicatorType.SATURATION, "c1_north_0", 0.05, "15min"),
+        Indicator(IndicatorType.VOLUME, "other_lane", 9999, "15min"),
+    ]
+    mapping = solver.lane_phase_mapping(cross, 4)
+    y = solver.flow_ratios(mapping, indicators)
+    assert np.allclose(y[:3], [0.05, 0.25, 0.25]) and not y[3:].any()
+    assert np.allclose(solver.critical_flow_ratios(mapping.mask, y), [0.25, 0.05, 0, 0])
+
+    result = solver.solve(cross, indicators)
+    assert solver.lane_phase_mapping(cross, 4) is mapping
+    assert all(10 <= phase.green <= 60 for phase in result.rings[0].phases)
+    assert result.running_phase == [0]
+
+
+def test_simple_solver_keeps_cycle():
+    cross = make_cross()
+    schema = CyclerSignalSchema(SignalSchemaType.CYCLER, make_rings(max_green=40), [1], [12], 120, 60, 150, 0)
+    result = SimpleSolver().solve(cross, lane_volumes(), schema)
+
+    # 有效绿灯 100 秒按 0.25 : 0.1 : 0.2 : 0.05 分配，第一相位被最大绿截断
+    greens = [phase.green for phase in result.rings[0].phases]
+    assert greens == [40, 17, 33, 10]
+    assert result.running_phase == [1] and result.running_time == [12]
+
+
+def test_min_green_widens_cycle():
+    """最小绿之和超过计算周期时无法压缩，周期放宽为环长"""
+    schema = CyclerSignalSchema(SignalSchemaType.CYCLER, make_rings(), [0], [0], 100, 50, 180, 0)
+    indicators = [Indicator(IndicatorType.VOLUME, f"c1_{d}_{i}", 50, "15min")
+                  for d in ("north", "south", "east", "west") for i in range(3)]
+    result = WebsterSolver().solve(make_cross(), indicators, schema)
+    assert [phase.green for phase in result.rings[0].phases] == [10, 10, 10, 10]
+    assert result.cycle == 60 > schema.min_cycle
+
+
+def test_ring_barrier_mapping():
+    """相位按所在环与屏障位置对应流向，而不是按展平序号；屏障区相位不足时最后一个相位放行该轴剩余流向"""
+    cross = make_cross()
+    ns_through, ns_left, ew_through, ew_left = phase_lane_mask(cross, 4)
+    ns, ew = ns_through | ns_left, ew_through | ew_left
+
+    def phase(i, barrier):
+        return CyclerPhase(i, PhaseType.NORMAL, 20, 10, 60, 0, 3, 2, 3, barrier)
+
+    solver = WebsterSolver()
+    two_phase = solver.lane_phase_mapping(cross, [Ring([phase(0, 0), phase(1, 1)])])
+    np.testing.assert_array_equal(two_phase.mask, [ns, ew])
+
+    dual = solver.lane_phase_mapping(cross, [Ring([phase(0, 0), phase(1, 0), phase(2, 1)]),
+                                             Ring([phase(3, 0), phase(4, 1)])])
+    np.testing.assert_array_equal(dual.mask, [ns_through, ns_left, ew, ns, ew])
+
+    result = solver.solve(cross, lane_volumes(), CyclerSignalSchema(
+        SignalSchemaType.CYCLER, [Ring([phase(0, 0), phase(1, 1)])], [0], [0], 100, 50, 180, 0))
+    assert result.rings[0].phases[1].green_flash == 0 and result.rings[0].phases[1].barrier_id == 1
+
+
+@pytest.mark.parametrize("num_phases", [2, 3])
+def test_few_phases_serve_every_lane(num_phases):
+    """相位数少于默认流向数时，每个进口车道仍至少由一个相位放行"""
+    cross = make_cross()
+    solver = WebsterSolver(num_phases=num_phases)
+    result = solver.solve(cross, lane_volumes())
+    mapping = solver.lane_phase_mapping(cross, result.rings)
+    assert mapping.mask.shape == (num_phases, 12) and mapping.mask.any(axis=0).all()
+    assert phase_lane_mask(cross, num_phases).any(axis=0).all()
+    assert solver.critical_flow_ratios(mapping.mask, solver.flow_ratios(mapping, lane_volumes())).all()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_evaluator.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+import pytest
+
+from aitbox.models.signal.isolated.cycler.evaluator import (
+    PlanTimings,
+    average_delay,
+    evaluate,
+    plan_timings,
+    to_indicators,
+)
+from aitbox.models.signal.isolated.cycler.webster_solver import WebsterSolver
+from aitbox.schemas.indicator import IndicatorType
+from aitbox.testing.synthetic import make_cross
+from tests.models.signal.isolated.cycler.test_cycler_solver import lane_volumes
+
+
+def test_single_phase_matches_formulas():
+    """C = 100, g = 40, s = 1800, q = 500 与手算一致"""
+    timings = PlanTimings(np.array([100.0]), np.array([[40.0]]))
+    result = evaluate(timings, np.array([500.0]), 1800.0)
+    x = 500 / 720
+    d1 = 0.5 * 100 * 0.6 ** 2 / (1 - 0.4 * x)
+    d2 = 900 * 0.25 * ((x - 1) + np.sqrt((x - 1) ** 2 + 8 * 0.5 * x / (720 * 0.25)))
+    assert result.capacity[0, 0] == pytest.approx(720)
+    assert result.degree_of_saturation[0, 0] == pytest.approx(x)
+    assert result.delay[0, 0] == pytest.approx(d1 + d2)
+    assert result.residual_queue[0, 0] == 0
+
+    webster = evaluate(timings, np.array([500.0]), 1800.0, model="webster")
+    q = 500 / 3600
+    expected = 100 * 0.36 / (2 * (1 - 0.4 * x)) + x ** 2 / (2 * q * (1 - x)) \
+        - 0.65 * (100 / q ** 2) ** (1 / 3) * x ** 4
+    assert webster.delay[0, 0] == pytest.approx(expected)
+
+    oversaturated = evaluate(timings, np.array([900.0]), 1800.0)
+    assert oversaturated.residual_queue[0, 0] == pytest.approx(180 * 0.25)
+    assert np.isinf(evaluate(timings, np.array([900.0]), model="webster").delay[0, 0])
+
+
+def test_candidates_and_scenarios_broadcast():
+    """ """
+    cross = make_cross("c1")
+    solver = WebsterSolver()
+    plans = [solver.solve(cross, lane_volumes(), cycle=cycle) for cycle in (80, 100, 120, 140)]
+    result = solver.evaluate(cross, lane_volumes(), plans)
+    assert result.delay.shape == (4, 4)
+
+    timings = plan_timings(plans)
+    demand = np.linspace(0.5, 1.0, 6)[:, None, None] * 450.0 * np.ones(4)
+    scenarios = evaluate(timings, demand)
+    assert scenarios.delay.shape == (6, 4, 4)
+    for s in range(6):
+        single = evaluate(timings, demand[s, 0])
+        assert np.allclose(scenarios.delay[s], single.delay)
+    assert average_delay(scenarios, demand).shape == (6, 4)
+
+    indicators = to_indicators(result, ["p0", "p1", "p2", "p3"], "15min", 0, plan=2)
+    assert [i.type for i in indicators[::4]] == [
+        IndicatorType.DELAY, IndicatorType.CAPACITY, IndicatorType.DEGREE_OF_SATURATION,
+    ]
+    assert indicators[4].value == pytest.approx(result.capacity[2, 0])
+
+
+def test_candidate_cycles_ranked_by_delay():
+    """候选周期按路口总延误排序，Webster 周期的倍数作为候选"""
+    cross = make_cross("c1")
+    solver = WebsterSolver()
+    cycles = [60, 75, 90, 110, 130]
+    plans, delay = solver.cycle_delays(cross, lane_volumes(), None, cycles)
+    assert [plan.cycle for plan in plans] == cycles
+    flow = solver.phase_flows(cross, lane_volumes(), plans[0].rings)
+    evaluation = solver.evaluate(cross, lane_volumes(), plans)
+    assert np.allclose(delay, (evaluation.delay * flow).sum(axis=1))
+
+    best = solver.solve(cross, lane_volumes(), cycle=cycles)
+    assert best.cycle == cycles[int(np.argmin(delay))] == 90
+
+    webster = solver.solve(cross, lane_volumes())
+    refined = WebsterSolver(cycle_factors=(0.75, 1.0, 1.25, 1.5)).solve(cross, lane_volumes())
+    candidates = [int(round(webster.cycle * f)) for f in (0.75, 1.0, 1.25, 1.5)]
+    _, delay = solver.cycle_delays(cross, lane_volumes(), None, candidates)
+    assert refined.cycle == candidates[int(np.argmin(delay))] != webster.cycle
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Project : aitbox
+# @File : test_timeline.py
+# @Author : run
+# @Date : 2026/10/19 10:00
+import numpy as np
+import pytest
+
+from aitbox.models.signal.isolated.cycler.timeline import SignalState, compile_timeline, phase_windows
+from aitbox.models.signal.isolated.movement import phase_lane_mask
+from aitbox.schemas.singal import CyclerPhase, CyclerSignalSchema, PhaseType, Ring, SignalSchemaType
+from aitbox.testing.synthetic import make_cross, make_rings
+
+G, F, Y, R = SignalState.GREEN, SignalState.GREEN_FLASH, SignalState.YELLOW, SignalState.RED
+
+
+def make_schema(rings, cycle=0, offset=0, running_phase=None, running_time=None):
+    return CyclerSignalSchema(SignalSchemaType.CYCLER, rings, running_phase or [0] * len(rings),
+                              running_time or [0] * len(rings), cycle, 0, 0, offset)
+
+
+def phase(i, green, barrier, flash=3, yellow=3, all_red=2):
+    return CyclerPhase(i, PhaseType.NORMAL, green, 10, 60, flash, yellow, all_red, 3, barrier)
+
+
+def test_single_ring_states():
+    """四相位单环：绿 20（末 3 秒绿闪）、黄 3、全红 2，周期 100"""
+    timeline = compile_timeline(make_schema(make_rings(4), cycle=100))
+    assert timeline.cycle == 100
+    assert list(timeline.state_at(0)) == [G, R, R, R]
+    assert list(timeline.state_at(17)) == [F, R, R, R]
+    assert list(timeline.state_at(20)) == [Y, R, R, R]
+    assert list(timeline.state_at(23)) == [R, R, R, R]
+    assert list(timeline.state_at(25)) == [R, G, R, R]
+    assert list(timeline.state_at(99.9)) == [R, R, R, R]
+    assert list(timeline.state_at(100)) == [G, R, R, R]
+
+
+def test_dual_ring_barrier_alignment():
+    """屏障区取两环较长者，较短环的差值补给该区最后一个相位"""
+    rings = [Ring([phase(0, 20, 0), phase(1, 10, 0), phase(2, 30, 1)]),
+             Ring([phase(4, 15, 0), phase(5, 25, 1), phase(6, 10, 1)])]
+    cycle, windows = phase_windows(make_schema(rings))
+    # 屏障 0: 环一 25 + 15 = 40 秒，环二 20 秒 -> 相位 4 绿灯延长 20 秒
+    # 屏障 1: 环一 35 秒，环二 30 + 15 = 45 秒 -> 相位 2 绿灯延长 10 秒
+    assert cycle == 85
+    assert windows.start[3] == 0 and windows.yellow[3] == 35
+    assert windows.start[2] == windows.start[4] == 40
+    assert windows.yellow[2] == 80
+    assert windows.end[2] == windows.end[-1] == cycle
+
+    with pytest.raises(ValueError):
+        phase_windows(make_schema([Ring([phase(0, 20, 0), phase(1, 20, 1)]), Ring([phase(2, 20, 1)])]))
+
+
+def test_offset_and_running_alignment():
+    schema = make_schema(make_rings(4), cycle=100, offset=30)
+    timeline = compile_timeline(schema)
+    assert list(timeline.state_at(30)) == [G, R, R, R]
+    assert list(timeline.state_at(29)) == [R, R, R, R]
+
+    # now = 1000 时第 2 个相位已运行 5 秒 -> 其绿灯开始于 995，周期起点为 945
+    schema = make_schema(make_rings(4), cycle=100, running_phase=[2], running_time=[5])
+    timeline = compile_timeline(schema, now=1000)
+    assert timeline.origin == 45
+    assert list(timeline.state_at(1000)) == [R, R, G, R]
+
+
+def test_arrivals_vectorized():
+    timeline = compile_timeline(make_schema(make_rings(4), cycle=100, offset=10))
+    rng = np.random.default_rng(0)
+    times = rng.uniform(0, 10_000, 100_000)
+    movements = rng.integers(0, 4, len(times))
+    result = timeline.arrivals(times, movements)
+
+    local = np.mod(times - 10, 100)
+    start = movements * 25.0
+    expected_state = np.select(
+        [local < start, local < start + 17, local < start + 20, local < start + 23], [R, G, F, Y], R)
+    expected_wait = np.where((local >= start) & (local < start + 20), 0.0, np.mod(start - local, 100))
+    np.testing.assert_array_equal(result.state, expected_state)
+    np.testing.assert_allclose(result.wait, expected_wait)
+    np.testing.assert_array_equal(timeline.state(times, movements), expected_state)
+
+
+def test_empty_phase_never_green():
+    rings = [Ring([phase(0, 20, 0), CyclerPhase(1, PhaseType.EMPTY, 10, 0, 0, 0, 0, 0, 0, 0)])]
+    result = compile_timeline(make_schema(rings)).arrivals(np.array([5.0, 25.0]), np.array([1, 1]))
+    assert list(result.state) == [R, R]
+    assert np.isinf(result.wait).all()
+
+
+def test_lane_timeline():
+    """车道灯色为放行相位灯色的最大值，等待时间为各放行相位的最小值"""
+    cross = make_cross()
+    mask = phase_lane_mask(cross, 4)
+    phases = compile_timeline(make_schema(make_rings(4), cycle=100))
+    lanes = phases.movements(mask)
+    assert lanes.states.shape[1] == mask.shape[1]
+    assert len(lanes.breaks) <= len(phases.breaks)
+
+    times = np.arange(0, 200, 0.5)
+    for lane in range(mask.shape[1]):
+        served = np.flatnonzero(mask[:, lane])
+        expected = phases.state(times[:, None], served[None]).max(axis=1)
+        np.testing.assert_array_equal(lanes.state(times, lane), expected)
+        wait = lanes.arrivals(times, lane).wait
+        np.testing.assert_allclose(wait, phases.arrivals(times[:, None], served[None]).wait.min(axis=1))
+
+    with pytest.raises(ValueError):
+        phases.movements(mask[:3])
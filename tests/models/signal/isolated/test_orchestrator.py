@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_orchestrator
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+
+import pytest
+
+from aitbox.models.signal.isolated.base import IsolatedSolver
+from aitbox.models.signal.isolated.cycler.webster_solver import WebsterSolver
+from aitbox.models.signal.isolated.orchestrator import SolveOrchestrator
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.road_network import CrossType, RoadNetwork
+from aitbox.testing.synthetic import make_cross
+
+
+class FailingSolver(IsolatedSolver):
+    """ """
+
+    def solve(self, cross, indicators, schema=None, *args, **kwargs):
+        if cross.id == "c3":
+            raise ValueError("bad cross")
+        return len(indicators)
+
+
+class BatchSolver(IsolatedSolver):
+    """ """
+
+    def __init__(self):
+        self.calls = 0
+
+    def solve(self, cross, indicators, schema=None, *args, **kwargs):
+        raise AssertionError("batch path expected")
+
+    def solve_batch(self, crosses, indicators, schemas=None):
+        self.calls += 1
+        return [cross.id for cross in crosses]
+
+
+@pytest.fixture
+def network():
+    crosses = [make_cross(f"c{i}", x=i * 300.0) for i in range(8)]
+    crosses.append(make_cross("n0", cross_type=CrossType.NORMAL))
+    return RoadNetwork(crosses, [])
+
+
+def volumes(network):
+    return [
+        Indicator(IndicatorType.VOLUME, lane.id, 100 + 40 * i + 10 * lane.seq_num, "15min")
+        for i, cross in enumerate(network.cross)
+        for branch in cross.branch
+        for lane in branch.lane
+    ]
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_orchestrator_deterministic(network, executor):
+    indicators = volumes(network)
+    expected = [WebsterSolver().solve(cross, indicators) for cross in network.cross[:8]]
+    with SolveOrchestrator(network, executor=executor, max_workers=2, chunk_size=3) as orchestrator:
+        result = orchestrator.run(WebsterSolver(), indicators)
+        assert result.cross_ids == [f"c{i}" for i in range(8)]
+        assert result.schemas == expected and not result.errors
+        assert len(result.latency) == 8
+
+        orchestrator.run(WebsterSolver(), orchestrator.group_indicators(indicators))
+        report = orchestrator.latency_percentiles()
+    assert list(report) == ["WebsterSolver"]
+    assert report["WebsterSolver"]["p50"] <= report["WebsterSolver"]["p99"]
+
+
+def test_orchestrator_errors_and_batch(network):
+    orchestrator = SolveOrchestrator(network, executor="thread", chunk_size=2)
+    indicators = volumes(network)
+    result = orchestrator.run(FailingSolver(), indicators)
+    assert result.schemas[3] is None and list(result.errors) == ["c3"]
+    assert result.schemas[0] == 12
+
+    solver = BatchSolver()
+    result = orchestrator.run(solver, indicators)
+    assert solver.calls == 1 and result.schemas == result.cross_ids
+    assert set(orchestrator.latency_percentiles((50,))) == {"FailingSolver", "BatchSolver"}
+    orchestrator.close()
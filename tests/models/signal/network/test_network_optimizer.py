@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_network_optimizer
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+
+import numpy as np
+import pytest
+from shapely.geometry import LineString
+
+from aitbox.models.signal.network.decomposition import circular_distance, decompose, reconcile
+from aitbox.models.signal.network.optimizer import NetworkOptimizer
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.road_network import CrossType, RoadNetwork, RoadSegment
+from aitbox.testing.synthetic import make_cross
+
+
+def make_grid(rows=3, cols=4, spacing=400.0):
+    """Grid of signalized crosses plus one unsignalized cross hanging off the corner"""
+    crosses = [make_cross(f"c{r}{c}", x=c * spacing, y=r * spacing) for r in range(rows) for c in range(cols)]
+    crosses.append(make_cross("n0", x=-spacing, cross_type=CrossType.NORMAL))
+    segments = [RoadSegment("s_n0", "", LineString([(0, 0), (-spacing, 0)]), spacing, "", "", "c00", "n0")]
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0)):
+                if r + dr < rows and c + dc < cols:
+                    a, b = f"c{r}{c}", f"c{r + dr}{c + dc}"
+                    geom = LineString([(c * spacing, r * spacing), ((c + dc) * spacing, (r + dr) * spacing)])
+                    segments.append(RoadSegment(f"{a}-{b}", "", geom, spacing + 30 * ((r + c) % 3), "", "", a, b))
+    return RoadNetwork(crosses, segments)
+
+
+def volumes(network, value=150.0):
+    return [
+        Indicator(IndicatorType.VOLUME, lane.id, value, "15min")
+        for cross in network.cross for branch in cross.branch for lane in branch.lane
+    ]
+
+
+def test_decompose():
+    network = make_grid()
+    subgraphs, boundary = decompose(network, coordination_distance=800.0, max_size=5)
+    ids = [cross.id for subgraph in subgraphs for cross in subgraph.crosses]
+    assert sorted(ids) == sorted(f"c{r}{c}" for r in range(3) for c in range(4))
+    assert max(len(subgraph.crosses) for subgraph in subgraphs) <= 5
+    for subgraph in subgraphs:
+        assert sorted(i for chain in subgraph.chains for i in chain) == list(range(len(subgraph.crosses)))
+    # 17 grid links are either inside a chain, an extra link of a subgraph or cut at the boundary
+    inside = sum(len(s.links) + sum(len(chain) - 1 for chain in s.chains) for s in subgraphs)
+    assert inside + len(boundary) == 17
+
+    subgraphs, boundary = decompose(network, coordination_distance=300.0)
+    assert len(subgraphs) == 12 and not boundary
+
+
+def test_reconcile():
+    offsets = [np.array([0.0, 10.0]), np.array([0.0])]
+    shifts, sweeps = reconcile(offsets, [(0, 1, 1, 0, 20.0)], cycle=60)
+    diff = shifts[1] - 10
+    assert shifts[0] == 0 and min(circular_distance(diff - 20, 60), circular_distance(diff + 20, 60)) == 0
+    assert sweeps <= 2
+
+    # anchored to previous offsets, the shift follows them
+    shifts, _ = reconcile(offsets, [], cycle=60, previous=[np.array([5.0, 15.0]), None])
+    assert shifts[0] == 5
+
+
+@pytest.mark.parametrize("executor", ["serial", "process"])
+def test_network_optimizer_warm_start(executor):
+    network = make_grid()
+    with NetworkOptimizer(network, max_subgraph_size=5, executor=executor, max_workers=2) as optimizer:
+        cold = optimizer.optimize(volumes(network))
+        assert len(cold.schemas) == 12 and "n0" not in cold.schemas
+        assert len(set(cold.cycles)) == 1
+        for ids, cycle in zip(cold.subgraphs, cold.cycles):
+            for cross_id in ids:
+                schema = cold.schemas[cross_id]
+                assert schema.cycle == cycle and 0 <= schema.phase_offset < cycle
+                assert sum(p.green + p.yellow + p.all_red for p in schema.rings[0].phases) == cycle
+
+        warm = optimizer.optimize(volumes(network, 155.0), cold)
+        assert warm.iterations == 1 and warm.cycles == cold.cycles
+        assert {k: s.phase_offset for k, s in warm.schemas.items()} == \
+            {k: s.phase_offset for k, s in cold.schemas.items()}
+
+
+def test_network_optimizer_ranks_candidate_cycles():
+    network = make_grid()
+    indicators = volumes(network, 300.0)
+    with NetworkOptimizer(network, max_subgraph_size=5, executor="serial", cycle_candidates=1) as optimizer:
+        required = optimizer.optimize(indicators).cycles
+    with NetworkOptimizer(network, max_subgraph_size=5, executor="serial") as optimizer:
+        plan = optimizer.optimize(indicators)
+        for subgraph, needed, cycle in zip(optimizer.subgraphs, required, plan.cycles):
+            candidates = [needed, needed + 5, needed + 10]
+            delay = sum(
+                optimizer.cycler.cycle_delays(cross, [i for i in indicators if i.source_id.startswith(f"{cross.id}_")],
+                                              None, candidates)[1]
+                for cross in subgraph.crosses
+            )
+            assert cycle == candidates[int(np.argmin(delay))]
+    assert plan.cycles != required
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_dataset.py
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+
+import numpy as np
+import torch
+
+from aitbox.models.timeseries.dataset import SlidingWindowDataset
+
+
+def _dataset(tmp_path, **kwargs):
+    """ """
+    data = np.arange(100 * 3 * 2, dtype=np.float32).reshape(100, 3, 2)
+    path = str(tmp_path / "sensor.npy")
+    SlidingWindowDataset.save(path, data, chunk_size=16)
+    return data, SlidingWindowDataset(path, history=12, horizon=3, **kwargs)
+
+
+def test_sliding_window(tmp_path):
+    """ """
+    data, dataset = _dataset(tmp_path, stride=2)
+
+    assert isinstance(dataset.data, np.memmap)
+    assert len(dataset) == (100 - 15) // 2 + 1
+    assert np.shares_memory(dataset.windows, dataset.data)
+
+    x, y = dataset[5]
+    assert torch.equal(x, torch.from_numpy(data[10:22]))
+    assert torch.equal(y, torch.from_numpy(data[22:25]))
+
+    x, y = dataset[[0, 5, len(dataset) - 1]]
+    assert x.shape == (3, 12, 3, 2) and y.shape == (3, 3, 3, 2)
+    assert x.is_contiguous() and y.is_contiguous()
+    assert torch.equal(y[2], torch.from_numpy(data[96:99]))
+    np.testing.assert_array_equal(dataset.windows[5], data[10:25])
+
+
+def test_sliding_window_loader(tmp_path):
+    """ """
+    _, dataset = _dataset(tmp_path, target_features=[0])
+    loader = dataset.loader(batch_size=16, shuffle=True)
+
+    batches = list(loader)
+    assert len(batches) == len(loader) == 6
+    x, y = batches[0]
+    assert x.shape == (16, 12, 3, 2)
+    assert y.shape == (16, 3, 3, 1)
+    assert sum(len(x) for x, _ in batches) == len(dataset)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_stream
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+import numpy as np
+import pytest
+
+from aitbox.preprocessing.indicator.stream import IndicatorEngine
+from aitbox.schemas.indicator import IndicatorType
+from aitbox.schemas.road_network import RoadNetwork
+from aitbox.testing.synthetic import make_cross
+
+
+def _network():
+    return RoadNetwork([make_cross("a", 0, 0)], [])
+
+
+def test_tumbling_window_values():
+    """ """
+    engine = IndicatorEngine(_network(), window=300)
+    engine.on("a_north_0", 10)
+    engine.off("a_north_0", 40)
+    engine.on("a_north_1", 290)  # occupied across the boundary
+    engine.traversal("a_north_0", 100, 160, free_flow_time=20)
+    engine.traversal("a_north_1", 100, 120, free_flow_time=20)
+    batches = engine.off("a_north_1", 320)
+    assert len(batches) == 1 and batches[0].timestamp[0] == 300
+
+    store = engine.store
+    lanes = ["a_north_0", "a_north_1", "a_north_2", "a_north_in"]
+    # a_north_2 has seen no event, so nothing is emitted for it
+    expected = {
+        IndicatorType.VOLUME: [12, 12, np.nan, 24],
+        IndicatorType.OCCUPANCY: [0.1, 10 / 300, np.nan, 40 / 300 / 3],
+        IndicatorType.DELAY: [40, 0, np.nan, 20],
+        IndicatorType.QUEUE_LENGTH: [40 / 300, 0, np.nan, 40 / 300],
+    }
+    for indicator_type, values in expected.items():
+        assert np.allclose(store.latest(indicator_type, lanes), values, equal_nan=True)
+
+    engine.flush(600)
+    assert np.allclose(store.latest(IndicatorType.OCCUPANCY, ["a_north_1"]), [20 / 300])
+    assert store.latest(IndicatorType.VOLUME, ["a_north_1"])[0] == 0
+
+
+def test_bulk_matches_single_events():
+    """ """
+    rng = np.random.default_rng(0)
+    lanes = [f"a_{d}_{i}" for d in ("north", "east", "south", "west") for i in range(3)]
+    n = 400
+    lane_ids = [lanes[i] for i in rng.integers(0, len(lanes), n)]
+    on = np.sort(rng.uniform(0, 1800, n))
+    off = on + rng.uniform(0.2, 2.0, n)
+    enter = rng.uniform(0, 1800, n)
+    exit_ = np.sort(enter + rng.uniform(10, 90, n))
+
+    single = IndicatorEngine(_network(), window=300, step=60)
+    events = sorted(
+        [(t, 0, lane, True) for t, lane in zip(on, lane_ids)]
+        + [(t, 0, lane, False) for t, lane in zip(off, lane_ids)]
+    )
+    for t, _, lane, state in events:
+        (single.on if state else single.off)(lane, t)
+    for lane, a, b in zip(lane_ids, exit_ - 30, exit_):
+        single.traversal(lane, a, b, free_flow_time=5)
+    single.flush(2400)
+
+    bulk = IndicatorEngine(_network(), window=300, step=60)
+    bulk.detections(lane_ids, on, off)
+    bulk.traversals(lane_ids, exit_ - 30, exit_, free_flow_time=5)
+    bulk.flush(2400)
+
+    a, b = single.store.columns, bulk.store.columns
+    assert len(a.value) == len(b.value) > 0
+    for x, y in zip(a, b):
+        assert np.allclose(x, y)
+
+
+def test_window_must_be_multiple_of_step():
+    """ """
+    with pytest.raises(ValueError):
+        IndicatorEngine(_network(), window=300, step=70)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_indicator
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+import numpy as np
+import pytest
+
+from aitbox.schemas.indicator import Indicator, IndicatorType, parse_freq
+
+
+def test_indicator_slots_and_offset():
+    """ """
+    indicator = Indicator(IndicatorType.VOLUME, "lane", 120.0, "5min")
+    assert not hasattr(indicator, "__dict__")
+    assert indicator.offset.nanos == 300 * 10 ** 9
+    assert Indicator(IndicatorType.VOLUME, "lane", 1, "not a freq").offset is None
+    assert parse_freq("5min") is parse_freq("5min")
+
+
+def test_from_arrays():
+    """ """
+    indicators = Indicator.from_arrays(
+        ["volume", IndicatorType.SPEED], ["a", "b"], np.array([1.0, 2.0]), "15min", np.array([0, 900])
+    )
+    assert indicators == [
+        Indicator(IndicatorType.VOLUME, "a", 1.0, "15min", 0),
+        Indicator(IndicatorType.SPEED, "b", 2.0, "15min", 900),
+    ]
+    assert type(indicators[1].timestamp) is int
+
+    with pytest.raises(ValueError):
+        Indicator.from_arrays("volume", ["a"], [1.0, 2.0], "15min")
+    with pytest.raises(ValueError):
+        Indicator.from_arrays("flux", ["a"], [1.0], "15min")
+    with pytest.raises(ValueError):
+        Indicator.from_arrays("volume", ["a"], [1.0], "not a freq")
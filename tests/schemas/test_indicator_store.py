@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_indicator_store
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+import numpy as np
+
+from aitbox.models.signal.isolated.cycler.webster_solver import WebsterSolver
+from aitbox.models.signal.isolated.orchestrator import SolveOrchestrator
+from aitbox.schemas.indicator import Indicator, IndicatorType
+from aitbox.schemas.indicator_store import IndicatorStore
+from aitbox.schemas.road_network import RoadNetwork
+from aitbox.testing.synthetic import make_cross
+
+
+def _network():
+    return RoadNetwork([make_cross("a", 0, 0), make_cross("b", 500, 0)], [])
+
+
+def _indicators(network):
+    rng = np.random.default_rng(0)
+    indicators = []
+    for cross in network.cross:
+        for branch in cross.branch:
+            for lane in branch.lane:
+                for t in (0, 300, 600):
+                    indicators.append(Indicator(IndicatorType.VOLUME, lane.id, float(rng.uniform(50, 300)), "5min", t))
+            indicators.append(Indicator(IndicatorType.SATURATION, branch.id, 0.3, "5min", 600))
+    return indicators
+
+
+def test_select_by_source_type_and_time():
+    """ """
+    network = _network()
+    indicators = _indicators(network)
+    store = IndicatorStore.from_indicators(indicators, network)
+    assert len(store) == len(indicators)
+
+    rows = store.select(IndicatorType.VOLUME, lane="a_north_0", start=300)
+    columns = store.take(rows)
+    assert columns.timestamp.tolist() == [300, 600]
+    expected = [i.value for i in indicators if i.source_id == "a_north_0" and i.timestamp >= 300]
+    assert np.allclose(columns.value, expected)
+
+    rows = store.select(cross="b")
+    assert len(rows) == sum(i.source_id.startswith("b_") for i in indicators)
+    rows = store.select(IndicatorType.SATURATION, branch="a_east_in")
+    assert [store.source_ids[s] for s in store.take(rows).source_code] == ["a_east_in"]
+
+    rows = store.select(start=300, end=600)
+    assert len(rows) == sum(i.timestamp == 300 for i in indicators)
+
+
+def test_latest_and_append_invalidate_index():
+    """ """
+    store = IndicatorStore()
+    store.append(IndicatorType.VOLUME, ["x", "x", "y"], [0, 300, 0], [1.0, 2.0, 3.0])
+    assert np.allclose(store.latest(IndicatorType.VOLUME, ["x", "y", "z"]), [2.0, 3.0, np.nan], equal_nan=True)
+    assert np.allclose(store.latest(IndicatorType.VOLUME, ["x"], before=300), [1.0])
+
+    store.append(IndicatorType.VOLUME, ["y"], ["1970-01-01T00:10:00"], [4.0])
+    assert store.latest(IndicatorType.VOLUME, ["y"])[0] == 4.0
+    assert [i.value for i in store] == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_split_reencodes_sources():
+    """ """
+    network = _network()
+    indicators = _indicators(network)
+    store = IndicatorStore.from_indicators(indicators, network)
+    groups = store.split({s: s.split("_")[0] for s in store.source_ids})
+
+    for cross_id, part in groups.items():
+        assert all(s.startswith(f"{cross_id}_") for s in part.source_ids)
+        assert len(part.source_ids) == len(set(part.source_ids)) < len(store.source_ids)
+        assert [i.source_id for i in part] == [i.source_id for i in store.to_indicators(store.select(cross=cross_id))]
+        rows = part.select(IndicatorType.SATURATION, branch=f"{cross_id}_east_in")
+        assert [part.source_ids[s] for s in part.take(rows).source_code] == [f"{cross_id}_east_in"]
+        assert len(part.select(cross="a" if cross_id == "b" else "b")) == 0
+
+    # sources registered after a branch query are found by the next one
+    store = IndicatorStore(network)
+    store.append(IndicatorType.SATURATION, ["a_west_in"], [0], [0.3])
+    assert len(store.select(branch="a_west_in")) == 1
+    store.append(IndicatorType.VOLUME, ["a_west_0", "b_west_0"], [0, 0], [1.0, 2.0])
+    assert len(store.select(branch="a_west_in")) == 2
+
+
+def test_solvers_accept_store():
+    """ """
+    network = _network()
+    indicators = _indicators(network)
+    store = IndicatorStore.from_indicators(indicators, network)
+    latest = [i for i in indicators if i.timestamp == 600]
+
+    with SolveOrchestrator(network, executor="serial") as orchestrator:
+        expected = orchestrator.run(WebsterSolver(), latest)
+        result = orchestrator.run(WebsterSolver(), store)
+    assert not result.errors
+    assert result.schemas == expected.schemas
+
+    grouped = orchestrator.group_indicators(store)
+    assert set(grouped) == {"a", "b"}
+    assert len(grouped["a"]) == sum(i.source_id.startswith("a_") for i in indicators)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_road_network
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+import pickle
+
+from shapely.geometry import LineString, Point
+
+from aitbox.schemas.road_network import RoadNetwork, RoadSegment
+from aitbox.testing.synthetic import make_cross
+
+
+def _network():
+    crosses = [make_cross("a", 0, 0), make_cross("b", 500, 0), make_cross("c", 500, 500)]
+    segments = [
+        RoadSegment("ab", "", LineString([(0, 0), (500, 0)]), 500, "a_east_out", "b_west_in", "a", "b"),
+        RoadSegment("bc", "", LineString([(500, 0), (500, 500)]), 500, "b_north_out", "c_south_in", "b", "c"),
+    ]
+    return RoadNetwork(crosses, segments)
+
+
+def test_index_lookups():
+    """ """
+    index = _network().index
+    assert index.cross["b"].location.equals(Point(500, 0))
+    assert index.lane_cross("c_west_2") == "c"
+    assert index.source_cross("b_east_in") == "b" and index.source_cross("x") is None
+    assert [s.id for s in index.cross_segments["b"]] == ["ab", "bc"]
+    assert [b.id for b in index.segment_branches("ab")] == ["a_east_out", "b_west_in"]
+    assert index.neighbours("b") == ["a", "c"]
+
+
+def test_spatial_queries():
+    """ """
+    index = _network().index
+    assert [c.id for c in index.crosses_near(Point(450, 50), 100)] == ["b"]
+    assert index.nearest_cross(Point(400, 480)).id == "c"
+    assert {b.id for b in index.branches_near(Point(-50, 0))} == {"a_west_in", "a_west_out"}
+
+
+def test_index_invalidated_on_mutation():
+    """ """
+    network = _network()
+    index = network.index
+    assert network.index is index
+
+    network.cross.append(make_cross("d", 1000, 0))
+    assert network.index is not index and "d" in network.index.cross
+    network.road_segment = network.road_segment[:1]
+    assert network.index.neighbours("b") == ["a"]
+    network.road_segment += network.road_segment[:1]
+    assert len(network.index.cross_segments["a"]) == 2
+
+    clone = pickle.loads(pickle.dumps(network))
+    assert clone == network and clone.index.neighbours("b") == ["a"]
+
+
+def test_match_network():
+    """ """
+    network = _network()
+    match_network = network.match_network
+    assert match_network is network.match_network
+    assert match_network["nodes"][1] == {"id": "b", "name": "b", "x": 500.0, "y": 0.0}
+    assert match_network["edges"][1] == {
+        "id": "bc", "name": "", "length": 500.0, "start_node_id": "b", "end_node_id": "c",
+        "geom": [[500.0, 0.0], [500.0, 500.0]],
+    }
+    network.road_segment.pop()
+    assert [e["id"] for e in network.match_network["edges"]] == ["ab"]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_road_network_loader
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+import json
+import pickle
+
+import polars as pl
+import pytest
+import shapely
+from shapely.geometry import LineString, mapping
+
+from aitbox.schemas.road_network import RoadNetwork, RoadSegment
+from aitbox.schemas.road_network_loader import LazyList, read_geojson, read_geoparquet
+from aitbox.testing.synthetic import make_cross
+
+
+def _network():
+    crosses = [make_cross("a", 0, 0), make_cross("b", 500, 0)]
+    segments = [RoadSegment("ab", "main", LineString([(0, 0), (500, 0)]), 500.0, "a_east_out", "b_west_in", "a", "b")]
+    return RoadNetwork(crosses, segments)
+
+
+def _layers(network):
+    """Rows per layer, geometry kept under ``geometry``"""
+    crosses = [{"id": c.id, "name": c.name, "type": c.type.value, "geometry": c.location} for c in network.cross]
+    branches = [
+        {"id": b.id, "cross_id": c.id, "name": b.name, "type": b.type.value, "direction": b.direction.value,
+         "geometry": b.geom}
+        for c in network.cross for b in c.branch
+    ]
+    lanes = [
+        {"id": l.id, "branch_id": b.id, "seq_num": l.seq_num, "group": l.group, "broaden": l.broaden,
+         "flow_type": l.flow_type.value, "turn_type": int(l.turn_type), "lane_type": l.lane_type.value,
+         "width": l.width}
+        for c in network.cross for b in c.branch for l in reversed(b.lane)
+    ]
+    segments = [
+        {"id": s.id, "name": s.name, "length": s.length, "start_branch_id": s.start_branch_id,
+         "end_branch_id": s.end_branch_id, "start_cross_id": s.start_cross_id, "end_cross_id": s.end_cross_id,
+         "geometry": s.geom}
+        for s in network.road_segment
+    ]
+    return crosses, branches, lanes, segments
+
+
+def _feature_collection(rows):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature",
+             "geometry": mapping(row["geometry"]) if "geometry" in row else None,
+             "properties": {k: v for k, v in row.items() if k != "geometry"}}
+            for row in rows
+        ],
+    }
+
+
+def _write_geoparquet(rows, path):
+    frame = pl.DataFrame([{k: v for k, v in row.items() if k != "geometry"} for row in rows])
+    metadata = None
+    if "geometry" in rows[0]:
+        frame = frame.with_columns(pl.Series("geometry", shapely.to_wkb([row["geometry"] for row in rows])))
+        metadata = {"geo": json.dumps({"version": "1.0.0", "primary_column": "geometry",
+                                       "columns": {"geometry": {"encoding": "WKB"}}})}
+    frame.write_parquet(path, metadata=metadata)
+    return path
+
+
+def test_read_geojson_is_lazy_and_equal():
+    """ """
+    expected = _network()
+    network = read_geojson(*[_feature_collection(rows) for rows in _layers(expected)])
+    assert all(isinstance(c.branch, LazyList) and not c.branch.loaded for c in network.cross)
+
+    branch = network.cross[1].branch[2]
+    assert network.cross[1].branch.loaded and not network.cross[0].branch.loaded
+    assert not branch.lane.loaded
+    assert branch == expected.cross[1].branch[2]
+    assert network == expected
+    assert pickle.loads(pickle.dumps(network)) == expected
+
+
+def test_index_from_tables_stays_lazy():
+    """ """
+    expected = _network()
+    network = read_geojson(*[_feature_collection(rows) for rows in _layers(expected)])
+    index = network.index
+    assert index.lane_cross("b_south_1") == "b" and index.source_cross("a_east_in") == "a"
+    assert [s.id for s in index.branch_segments["b_west_in"]] == ["ab"]
+    assert index.neighbours("a") == ["b"]
+    assert not any(c.branch.loaded for c in network.cross)
+
+    assert index.segment_branches("ab") == expected.index.segment_branches("ab")
+    assert set(index.lane) == set(expected.index.lane)
+    assert index.lane_branch == expected.index.lane_branch and index.branch_cross == expected.index.branch_cross
+
+    # any change to the cross list drops the tables, the next index walks the objects
+    network.cross.append(make_cross("c", 1000, 0))
+    assert network.tables is None and network.index.lane_cross("c_north_0") == "c"
+
+
+def test_read_geoparquet(tmp_path):
+    """ """
+    expected = _network()
+    paths = [_write_geoparquet(rows, tmp_path / f"{name}.parquet")
+             for name, rows in zip(("cross", "branch", "lane", "segment"), _layers(expected))]
+    network = read_geoparquet(*paths)
+    assert network == expected
+    assert network.index.lane_cross("b_south_1") == "b"
+
+
+def test_dangling_reference():
+    """ """
+    crosses, branches, lanes, _ = _layers(_network())
+    branches[0]["cross_id"] = "missing"
+    with pytest.raises(ValueError, match="missing"):
+        read_geojson(*[_feature_collection(rows) for rows in (crosses, branches, lanes)])
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File        : test_singal
+Project     : aitbox
+Author      : gdd
+Created     : 2026/10/19
+Description :
+"""
+import dataclasses
+import pickle
+
+from aitbox.schemas.singal import (
+    ActuatedPhase,
+    ActuatedSignalSchema,
+    CyclerSignalSchema,
+    Phase,
+    SignalSchema,
+    SignalSchemaType,
+)
+from aitbox.testing.synthetic import make_cross, make_rings
+
+
+def test_slotted_schema_hierarchy():
+    """ """
+    schema = CyclerSignalSchema(SignalSchemaType.CYCLER, make_rings(), [0], [0], 120, 60, 180, 10)
+    assert isinstance(schema, SignalSchema) and isinstance(schema.rings[0].phases[0], Phase)
+    for obj in (schema, schema.rings[0], schema.rings[0].phases[0], make_cross(), make_cross().branch[0].lane[0]):
+        assert not hasattr(obj, "__dict__")
+
+    shifted = dataclasses.replace(schema, phase_offset=30)
+    assert shifted.phase_offset == 30 and shifted.rings is schema.rings
+    assert pickle.loads(pickle.dumps(shifted)) == shifted
+
+    actuated = ActuatedSignalSchema(SignalSchemaType.ACTUATED, [], [0], [0], 3.0, 10)
+    assert [f.name for f in dataclasses.fields(actuated)][-2:] == ["max_break_gap", "start_green"]
+    assert ActuatedPhase(1, "normal", 10, 3, 40).max_green == 40